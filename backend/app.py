@@ -1,122 +1,612 @@
 # backend/app.py
+import time
+BOOT_STARTED = time.perf_counter()
+
 import os
 import pickle
-import numpy as np
-import tensorflow as tf
-from flask import Flask, request, jsonify, Response
-from flask_cors import CORS
-import cv2
-import mediapipe as mp
 import logging
 import random
 import datetime
-import firebase_admin
-from firebase_admin import credentials, firestore
+import hashlib
+import hmac
+import itertools
+import json
+import threading
+from collections import namedtuple
+from urllib.parse import quote
+import numpy as np
+from flask import Flask, request, jsonify, Response, stream_with_context, g
+from flask_cors import CORS
+from utils.batcher import MicroBatcher
+from utils.lazy import LazyResource, BootTimer
+from utils.leaderboard_index import LeaderboardIndex
+from utils.capture import FrameBroadcaster
+from utils.frame_governor import FrameGovernor
+from utils.landmark_store import LandmarkStore
+from utils.metrics import TimedProxy, metrics
+from utils.landmark_pool import LandmarkPool
+from utils.landmark_features import LandmarkFeatures, load_config as load_feature_config, normalize_rows
+from utils.prediction_feed import PredictionFeed
+from utils.temporal import SessionSmoothers, TemporalSmoother
+from utils.sequence import SequenceSessions, SequenceTracker
+from utils.played_cache import PlayedTodayCache
+from utils.prediction_cache import PredictionCache
+from utils.storage import connect_firestore, open_store_from_env
+from utils.write_behind import WriteBehindQueue
+from utils.wire import (HEADER, OCTET_STREAM, WIRE_DTYPES, decode_landmarks, is_binary_landmarks,
+                        iter_landmark_chunks, parse_header)
+from model.numpy_engine import ArrayScaler, NumpyDenseModel
+from model.sequence_engine import CausalConvModel
+from model import registry as model_registry
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-# Initialize Firebase Admin (serviceAccountKey.json must be in backend/)
-if not firebase_admin._apps:
-    cred = credentials.Certificate(os.path.join(BASE_DIR, "serviceAccountKey.json"))
-    firebase_admin.initialize_app(cred)
+# Heavy libraries (tensorflow, mediapipe, cv2, firebase_admin) are imported
+# inside the loaders below, so a worker can start serving before they are paid for.
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
-db = firestore.client()
+boot = BootTimer(BOOT_STARTED)
+boot.mark("imports")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 app = Flask(__name__)
 CORS(app)
+boot.mark("flask")
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+# ---- Startup mode ----
+# eager:      load every subsystem before the module finishes importing (old behaviour)
+# background: return immediately and warm WARM_SUBSYSTEMS in background threads
+# lazy:       load each subsystem on first use only
+STARTUP_MODE = os.environ.get("STARTUP_MODE", "background").lower()
+# the camera is left out by default so gunicorn workers don't all fight over /dev/video0
+WARM_SUBSYSTEMS = [s.strip() for s in os.environ.get("WARM_SUBSYSTEMS", "model,hands,storage,leaderboard").split(",") if s.strip()]
+CAMERA_INDEX = int(os.environ.get("CAMERA_INDEX", 0))
+
+# ---- Storage ----
+# STORAGE_BACKEND=firestore (default) or sqlite; see utils/storage.py
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "firestore").lower()
+
+def open_store():
+    store = open_store_from_env(BASE_DIR, firestore_client=db_res.get)
+    return TimedProxy(store, store.name, metrics)  # stages like "firestore.write_batch"
+
+# ---- Leaderboard ----
+# Per-day top-N rankings held in memory. Rebuilt from storage on boot and
+# every LEADERBOARD_REFRESH_S (to pick up other workers' submissions), and
+# updated in place by this worker's /submit_score.
+LEADERBOARD_TOP_N = int(os.environ.get("LEADERBOARD_TOP_N", 100))
+LEADERBOARD_KEEP_DAYS = int(os.environ.get("LEADERBOARD_KEEP_DAYS", 7))
+LEADERBOARD_REFRESH_S = float(os.environ.get("LEADERBOARD_REFRESH_S", 60))
+LEADERBOARD_MAX_PAGE = 100
+
+leaderboard_index = LeaderboardIndex(top_n=LEADERBOARD_TOP_N, keep_days=LEADERBOARD_KEEP_DAYS)
+_leaderboard_refreshing = threading.Event()
+
+def rebuild_leaderboard():
+    store = store_res.get()
+    if store is None:
+        raise RuntimeError("Storage unavailable")
+    cutoff = (datetime.date.today() - datetime.timedelta(days=LEADERBOARD_KEEP_DAYS - 1)).isoformat()
+    leaderboard_index.rebuild(store.scores_since(cutoff))
+    return leaderboard_index
+
+def refresh_leaderboard_if_stale():
+    rebuilt_at = leaderboard_index.rebuilt_at
+    if not LEADERBOARD_REFRESH_S or rebuilt_at is None or time.time() - rebuilt_at < LEADERBOARD_REFRESH_S:
+        return
+    if _leaderboard_refreshing.is_set():
+        return
+    _leaderboard_refreshing.set()
+
+    def run():
+        try:
+            rebuild_leaderboard()
+        except Exception as e:
+            logger.error(f"Leaderboard refresh failed: {e}")
+        finally:
+            _leaderboard_refreshing.clear()
+
+    threading.Thread(target=run, name="leaderboard-refresh", daemon=True).start()
 
 # ---- Model setup ----
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 MODEL_DIR = os.path.join(BASE_DIR, "model")
 MODEL_PATH = os.path.join(MODEL_DIR, "sign_language_model.h5")
 LABELS_PATH = os.path.join(MODEL_DIR, "label_classes.npy")
 SCALER_PATH = os.path.join(MODEL_DIR, "scaler.pkl")  # Add this
+# MODEL_VARIANT=int8|float16 serves a quantised export instead:
+# sign_language_model.<variant>.npz, written by train_model.py with QUANTIZE
+# (or model/export_numpy.py --variants) and promoted into model/ with the
+# rest of the bundle. Its kernels stay int8 / float16 in memory. With the
+# registry, publish the variant's .npz as the version's model instead.
+MODEL_VARIANT = os.environ.get("MODEL_VARIANT", "float32")
+NUMPY_MODEL_PATH = os.path.join(MODEL_DIR, "sign_language_model.npz" if MODEL_VARIANT == "float32"
+                                else f"sign_language_model.{MODEL_VARIANT}.npz")
+
+# When model/registry/ACTIVE names a published version (see model/registry.py)
+# that version is served and hot-swapped when ACTIVE changes. Otherwise the
+# files directly in model/ are used: "numpy" serves the exported .npz (see
+# model/export_numpy.py) without TensorFlow, "keras" loads the .h5 + scaler.pkl.
+# Defaults to numpy when the export exists, or when a MODEL_VARIANT is asked
+# for: a missing variant fails the load instead of quietly serving the .h5.
+MODEL_BACKEND = os.environ.get("MODEL_BACKEND") or (
+    "numpy" if MODEL_VARIANT != "float32" or os.path.exists(NUMPY_MODEL_PATH) else "keras")
 
-try:
-    logger.info("[boot] Loading model...")
+# Feature settings (hand order, wrist normalisation) saved by train_model.py
+# next to the model; serving builds features the same way. See utils/landmark_features.py.
+FEATURE_CONFIG_PATH = os.path.join(MODEL_DIR, "feature_config.json")
+FEATURE_CONFIG = load_feature_config(MODEL_DIR)
+if FEATURE_CONFIG.get("size", 126) != 126:
+    logger.warning(f"[boot] feature_config.json is for {FEATURE_CONFIG['size']} features; serving builds 126")
+capture_features = LandmarkFeatures(126, hand_order=FEATURE_CONFIG.get("hand_order"),
+                                    normalize=FEATURE_CONFIG.get("normalize"))
+
+MODEL_REGISTRY_DIR = model_registry.REGISTRY_DIR
+MODEL_WATCH_S = float(os.environ.get("MODEL_WATCH_S", 5))
+MODEL_ADMIN_TOKEN = os.environ.get("MODEL_ADMIN_TOKEN")  # /model/reload is refused while unset
+
+# version is the registry version, or a short content hash of the files the
+# bundle was loaded from; caches key on it so a model swap never serves stale
+# results. features is the feature config the model was trained with.
+ModelBundle = namedtuple("ModelBundle", ["model", "label_classes", "scaler", "version", "features"])
+
+def files_version(*paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+    return digest.hexdigest()[:12]
+
+def load_keras_model():
+    import tensorflow as tf  # only paid for when the keras backend is selected
     model = tf.keras.models.load_model(MODEL_PATH)
     label_classes = np.load(LABELS_PATH, allow_pickle=True)
-
     with open(SCALER_PATH, 'rb') as f:
         scaler = pickle.load(f)
-    logger.info(f"[boot] Model, scaler and labels loaded OK. Classes: {label_classes}")
-except Exception as e:
-    model = None
-    label_classes = None
-    scaler = None  # Add this
-    logger.error(f"[boot] Failed to load model: {e}")
+    return ModelBundle(model, label_classes, scaler,
+                       files_version(MODEL_PATH, LABELS_PATH, SCALER_PATH, FEATURE_CONFIG_PATH), FEATURE_CONFIG)
 
-# ---- MediaPipe hands setup ----
-mp_hands = mp.solutions.hands
-mp_draw = mp.solutions.drawing_utils
-hands = mp_hands.Hands(
-    static_image_mode=False,
-    max_num_hands=2,  # detect 2 hands
-    min_detection_confidence=0.7,
-    min_tracking_confidence=0.7
+def load_numpy_model():
+    model = NumpyDenseModel.load(NUMPY_MODEL_PATH)
+    label_classes = model.labels if model.labels is not None else np.load(LABELS_PATH, allow_pickle=True)
+    scaler = None
+    if not model.scaler_folded and os.path.exists(SCALER_PATH):
+        with open(SCALER_PATH, 'rb') as f:
+            scaler = pickle.load(f)
+    version = files_version(NUMPY_MODEL_PATH, LABELS_PATH, SCALER_PATH if scaler is not None else None,
+                            FEATURE_CONFIG_PATH)
+    return ModelBundle(model, label_classes, scaler, version, FEATURE_CONFIG)
+
+def load_registry_model(version):
+    """Load a published version after checking every file against its manifest checksum"""
+    version_dir = model_registry.version_dir(version, MODEL_REGISTRY_DIR)
+    manifest = model_registry.verify(version_dir)
+    if manifest["input_size"] != 126:
+        raise ValueError(f"Model {version} takes {manifest['input_size']} features; serving builds 126")
+    files = {role: os.path.join(version_dir, name) for role, name in manifest["files"].items()}
+
+    if manifest["format"] == "numpy":
+        model = NumpyDenseModel.load(files["model"])
+    else:
+        import tensorflow as tf
+        model = tf.keras.models.load_model(files["model"])
+    # versions hold no pickles (see model/registry.py); one that does is refused
+    label_classes = np.load(files["labels"], allow_pickle=False)
+    scaler = ArrayScaler.load(files["scaler"]) if "scaler" in files else None
+    features = {}
+    if "features" in files:
+        with open(files["features"]) as f:
+            features = json.load(f)
+    return ModelBundle(model, label_classes, scaler, manifest["version"], features)
+
+def load_model_bundle(version=None):
+    version = version or model_registry.active_version(MODEL_REGISTRY_DIR)
+    if version:
+        logger.info(f"[boot] Loading model {version} from the registry...")
+        bundle = load_registry_model(version)
+    else:
+        logger.info(f"[boot] Loading model ({MODEL_BACKEND} backend)...")
+        bundle = load_numpy_model() if MODEL_BACKEND == "numpy" else load_keras_model()
+    logger.info(f"[boot] Model, scaler and labels loaded OK. Classes: {bundle.label_classes}")
+    return bundle
+
+def model_ready():
+    """Load the model if needed and report whether it can serve predictions"""
+    bundle = model_res.get()
+    if bundle is None or bundle.label_classes is None:
+        return False
+    # the numpy export may have the scaler folded in, so it needs no separate scaler
+    return bundle.scaler is not None or getattr(bundle.model, "scaler_folded", False)
+
+def predict_probs(x):
+    """Scale an (N, 126) batch and return the (N, num_classes) softmax output"""
+    bundle = model_res.get()
+    with metrics.stage("scale"):
+        if capture_features.normalize:
+            # client-sent rows may be raw; normalising is idempotent for ours
+            x = normalize_rows(np.array(x, dtype=np.float32))
+        x_scaled = bundle.scaler.transform(x) if bundle.scaler is not None else x
+    with metrics.stage("model_predict"):
+        return bundle.model.predict(x_scaled, verbose=0)
+
+CONFIDENCE_THRESHOLD = float(os.environ.get("CONFIDENCE_THRESHOLD", 0.3))
+
+def result_from_probs(probs):
+    """Turn one softmax row into the {predicted, confidence, confirmed, model_version} response shape"""
+    bundle = model_res.get()
+    confidence = float(np.max(probs))
+    idx = int(np.argmax(probs))
+    if confidence >= CONFIDENCE_THRESHOLD:
+        predicted = str(bundle.label_classes[idx])
+        confirmed = True
+    else:
+        predicted = "Unknown"
+        confirmed = False
+    return {"predicted": predicted, "confidence": confidence, "confirmed": confirmed,
+            "model_version": bundle.version}
+
+# ---- Temporal smoothing ----
+# Clients that send a session id (X-Session-Id header, "session_id" field or
+# ?session=) get per-session smoothing: a letter is only confirmed once it has
+# been the stable top class for CONFIRM_HOLD_S seconds.
+SMOOTHING = dict(
+    mode=os.environ.get("SMOOTHING_MODE", "ema"),
+    window=int(os.environ.get("SMOOTHING_WINDOW", 8)),
+    alpha=float(os.environ.get("SMOOTHING_ALPHA", 0.4)),
+    threshold=CONFIDENCE_THRESHOLD,
+    hold_s=float(os.environ.get("CONFIRM_HOLD_S", 1.0)),
 )
+session_smoothers = SessionSmoothers(**SMOOTHING)
+stream_smoother = TemporalSmoother(**SMOOTHING)  # the server camera is a single session
 
-# ---- Video capture ----
-cap = cv2.VideoCapture(0)
-if not cap.isOpened():
-    logger.error("Failed to open camera")
+def smoothed_result(smoothed):
+    """Response shape for a (idx, confidence, stable_for, confirmed) tuple from a TemporalSmoother"""
+    idx, confidence, stable_for, confirmed = smoothed
+    bundle = model_res.get()
+    predicted = str(bundle.label_classes[idx]) if idx is not None else "Unknown"
+    return {
+        "predicted": predicted,
+        "confidence": confidence,
+        "confirmed": confirmed,
+        "stable_for": round(stable_for, 3),
+        "model_version": bundle.version
+    }
+
+def request_session_id(data=None):
+    session_id = request.headers.get("X-Session-Id") or request.args.get("session")
+    if not session_id and isinstance(data, dict):
+        session_id = data.get("session_id")
+    return session_id
+
+# ---- Micro-batching ----
+# Concurrent /predict_frame calls are coalesced into one scaler+model pass.
+# A batch is flushed once it holds PREDICT_BATCH_SIZE rows or its oldest row
+# has waited PREDICT_BATCH_WINDOW_MS.
+PREDICT_BATCH_SIZE = int(os.environ.get("PREDICT_BATCH_SIZE", 32))
+PREDICT_BATCH_WINDOW_MS = float(os.environ.get("PREDICT_BATCH_WINDOW_MS", 3))
+
+batcher = MicroBatcher(predict_probs,
+                       max_batch_size=PREDICT_BATCH_SIZE,
+                       max_wait_ms=PREDICT_BATCH_WINDOW_MS,
+                       name="predict_frame")
+
+# ---- Prediction cache ----
+# Held poses give near-identical vectors; rounding to PREDICTION_CACHE_PRECISION
+# decimals lets repeats skip the model entirely. PREDICTION_CACHE_SIZE=0 disables it.
+prediction_cache = PredictionCache(
+    max_entries=int(os.environ.get("PREDICTION_CACHE_SIZE", 4096)),
+    ttl_s=float(os.environ.get("PREDICTION_CACHE_TTL_S", 5.0)),
+    precision=int(os.environ.get("PREDICTION_CACHE_PRECISION", 3)),
+)
+
+def predict_one(x, batched=True):
+    """Softmax row for a single 126-vector, via the cache, then the batcher (or a direct pass)"""
+    version = model_res.get().version
+    if batched:
+        return prediction_cache.get_or_compute(x, version, batcher.predict)
+    return prediction_cache.get_or_compute(x, version, lambda row: predict_probs(row.reshape(1, -1))[0])
 
-latest_landmarks = None  # store latest 63 landmarks
-frame_count = 0
+# ---- Sequence model (dynamic signs) ----
+# Optional causal Conv1D over recent frames (train_model.py with
+# TRAIN_MODE=sequence). Each session keeps a ring of its last frames and the
+# model's incremental state, so a frame costs one O(1) step however long the
+# window is. The server camera feeds stream_sequence from the capture thread;
+# /predict_frame clients with a session id get their own tracker.
+SEQUENCE_MODEL_PATH = os.environ.get("SEQUENCE_MODEL_PATH", os.path.join(MODEL_DIR, "sequence_model.npz"))
+SEQUENCE_RING_SIZE = int(os.environ.get("SEQUENCE_RING_SIZE", 64))  # frames; >= the model's receptive field
+SEQUENCE_MAX_GAP = int(os.environ.get("SEQUENCE_MAX_GAP", 3))  # hand-less frames before a sign is over
 
-def generate_frames():
-    global latest_landmarks, frame_count
+def load_sequence_model():
+    if not os.path.exists(SEQUENCE_MODEL_PATH):
+        logger.info(f"[boot] No sequence model at {SEQUENCE_MODEL_PATH}; dynamic signs disabled")
+        return None
+    model = CausalConvModel.load(SEQUENCE_MODEL_PATH)
+    if model.input_size != 126:
+        raise ValueError(f"Sequence model takes {model.input_size} features; serving builds 126")
+    trained = {k: model.features.get(k) for k in ("hand_order", "normalize") if k in model.features}
+    serving = {k: capture_features.config()[k] for k in trained}
+    if trained != serving:
+        logger.warning(f"[boot] Sequence model was trained with features {trained}, serving builds {serving}")
+    if model.receptive_field > SEQUENCE_RING_SIZE:
+        logger.warning(f"[boot] SEQUENCE_RING_SIZE {SEQUENCE_RING_SIZE} < receptive field {model.receptive_field}")
+    return model
+
+sequence_sessions = SequenceSessions(size=126, capacity=SEQUENCE_RING_SIZE, max_gap=SEQUENCE_MAX_GAP)
+stream_sequence = SequenceTracker(size=126, capacity=SEQUENCE_RING_SIZE, max_gap=SEQUENCE_MAX_GAP)
+
+def sequence_result(model, tracked):
+    """Response shape for a (idx, confidence, ready) tuple from a SequenceTracker"""
+    idx, confidence, ready = tracked
+    predicted = "Unknown"
+    if idx is not None and ready and confidence >= CONFIDENCE_THRESHOLD:
+        predicted = str(model.labels[idx])
+    return {"predicted": predicted, "confidence": confidence, "ready": ready}
+
+# ---- Model hot-swap ----
+# A new bundle is loaded and warmed off to the side, then swapped in with one
+# reference assignment: in-flight requests finish on the bundle they started
+# with, and the version-keyed prediction cache never serves the old model.
+# Every worker polls model/registry/ACTIVE every MODEL_WATCH_S, so activating
+# a version on one worker (or from the CLI) rolls it out to all of them.
+_model_swap_lock = threading.Lock()
+_reload_request_lock = threading.Lock()  # makes /model/reload's busy check and start one step
+model_swap = {"state": "idle", "version": None, "error": None, "at": None}
+
+def warm_bundle(bundle):
+    """Run the new model once per batch shape we serve before it takes traffic"""
+    for rows in sorted({1, PREDICT_BATCH_SIZE}):
+        x = np.zeros((rows, 126), dtype=np.float32)
+        x = bundle.scaler.transform(x) if bundle.scaler is not None else x
+        bundle.model.predict(x, verbose=0)
+
+def apply_bundle_features(bundle):
+    """Build capture features the way `bundle` was trained (hand order, normalisation)"""
+    global capture_features
+    features = bundle.features or {}
+    hand_order = features.get("hand_order", capture_features.hand_order)
+    normalize = bool(features.get("normalize", capture_features.normalize))
+    if hand_order != capture_features.hand_order or normalize != capture_features.normalize:
+        capture_features = LandmarkFeatures(126, hand_order=hand_order, normalize=normalize)
+
+def load_serving_model():
+    bundle = load_model_bundle()
+    apply_bundle_features(bundle)
+    return bundle
+
+def swap_model(version=None):
+    """Load, verify and warm `version` (default: ACTIVE), then make it the live bundle"""
+    with _model_swap_lock:
+        model_swap.update(state="loading", version=version, error=None, at=time.time())
+        try:
+            bundle = load_model_bundle(version)
+            warm_bundle(bundle)
+        except Exception as e:
+            logger.exception(f"[model] Swap to {version or 'active version'} failed")
+            model_swap.update(state="failed", error=str(e), at=time.time())
+            return None
+
+        old = model_res.peek()
+        apply_bundle_features(bundle)
+        model_res.replace(bundle)
+        prediction_cache.clear(version=bundle.version)
+        if old is None or list(old.label_classes) != list(bundle.label_classes):
+            # smoothed class indices mean something else now
+            session_smoothers.clear()
+            stream_smoother.reset()
+        model_swap.update(state="ready", version=bundle.version, at=time.time())
+        logger.info(f"[model] Now serving {bundle.version} (was {old.version if old else None})")
+        return bundle
+
+def watch_model_registry():
+    failed = None
     while True:
-        success, img = cap.read()
-        if not success:
-            logger.warning("Failed to read frame from camera")
-            break
+        time.sleep(MODEL_WATCH_S)
+        try:
+            active = model_registry.active_version(MODEL_REGISTRY_DIR)
+            current = model_res.peek()
+            if not active or active == failed or (current is not None and current.version == active):
+                continue
+            if model_res.state == model_res.LOADING:
+                continue  # first load still running; it will pick up ACTIVE itself
+            if swap_model(active) is None:
+                failed = active  # don't retry a broken version every tick
+        except Exception:
+            logger.exception("[model] registry watcher error")
 
-        frame_count += 1
-        
-        # mirror the frame
-        img = cv2.flip(img, 1)
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        results = hands.process(img_rgb)
+# ---- MediaPipe hands setup ----
+HandTracker = namedtuple("HandTracker", ["hands", "mp_hands", "mp_draw"])
 
-        # In the generate_frames() function, update the landmark extraction:
-        if results.multi_hand_landmarks:
-            # Extract landmarks for both hands (up to 2 hands)
-            all_landmarks = []
+def create_hand_tracker():
+    import mediapipe as mp
+    mp_hands = mp.solutions.hands
+    hands = mp_hands.Hands(
+        static_image_mode=False,
+        max_num_hands=2,  # detect 2 hands
+        min_detection_confidence=0.7,
+        min_tracking_confidence=0.7
+    )
+    return HandTracker(hands, mp_hands, mp.solutions.drawing_utils)
+
+# ---- Video capture ----
+def open_camera():
+    import cv2
+    cap = cv2.VideoCapture(CAMERA_INDEX)
+    if not cap.isOpened():
+        cap.release()
+        # a failure, not a READY resource holding a dead handle; camera_res retries later
+        raise RuntimeError(f"Failed to open camera {CAMERA_INDEX}")
+    return cap
 
-            # Process up to 2 hands
-            for i in range(min(2, len(results.multi_hand_landmarks))):
-                hand = results.multi_hand_landmarks[i]
-                hand_landmarks = [coord for lm in hand.landmark for coord in (lm.x, lm.y, lm.z)]  # All 3 coordinates
-                all_landmarks.extend(hand_landmarks)
+def camera_available():
+    cap = camera_res.peek()
+    return cap is not None and cap.isOpened()
 
-            # If we have less than 2 hands, pad with zeros
-            while len(all_landmarks) < 126:  # 2 hands × 21 landmarks × 3 coords = 126
-                all_landmarks.append(0.0)
+# ---- Landmark extraction pool ----
+# /extract_landmarks runs MediaPipe in worker processes, each with its own
+# warmed Hands graph. 0 workers means cpu_count - 1. Not warmed by default.
+LANDMARK_POOL_WORKERS = int(os.environ.get("LANDMARK_POOL_WORKERS", 0))
+LANDMARK_POOL_MIN_CONFIDENCE = float(os.environ.get("LANDMARK_POOL_MIN_CONFIDENCE", 0.7))
+EXTRACT_MAX_FRAMES = int(os.environ.get("EXTRACT_MAX_FRAMES", 16))
 
-            # If we have more than expected, truncate
-            latest_landmarks = all_landmarks[:126]
+# ---- Subsystems ----
+model_res = LazyResource("model", load_serving_model)
+hands_res = LazyResource("hands", create_hand_tracker)
+camera_res = LazyResource("camera", open_camera)
+db_res = LazyResource("firestore", lambda: connect_firestore(BASE_DIR))
+store_res = LazyResource("storage", open_store)
+leaderboard_res = LazyResource("leaderboard", rebuild_leaderboard)
+sequence_res = LazyResource("sequence", load_sequence_model)
+landmark_pool_res = LazyResource("landmark_pool", lambda: LandmarkPool(
+    workers=LANDMARK_POOL_WORKERS or None,
+    min_detection_confidence=LANDMARK_POOL_MIN_CONFIDENCE,
+    feature_config=capture_features.config()).warm())
+SUBSYSTEMS = {r.name: r for r in (model_res, hands_res, camera_res, db_res, store_res, leaderboard_res, landmark_pool_res, sequence_res)}
+
+# ---- Capture pipeline ----
+JPEG_QUALITY = int(os.environ.get("JPEG_QUALITY", 80))
+
+# longest a /latest_landmarks long-poll may hold a request thread
+LANDMARK_MAX_WAIT_MS = int(os.environ.get("LANDMARK_MAX_WAIT_MS", 5000))
+
+# latest 126 landmarks (2 hands × 21 × xyz), versioned for pollers
+landmark_store = LandmarkStore(126)
+
+# How much MediaPipe work each camera frame gets (see utils/frame_governor.py):
+# landmark a downscaled copy, reuse the last result while the picture is
+# still, and with GOVERNOR_TARGET_FPS cap landmark passes to
+# GOVERNOR_CPU_BUDGET of the frame time. Cropping around the hands is left to
+# MediaPipe's own tracking. FRAME_GOVERNOR=0 landmarks every full frame.
+frame_governor = FrameGovernor(
+    enabled=os.environ.get("FRAME_GOVERNOR", "1") != "0",
+    landmark_width=int(os.environ.get("GOVERNOR_LANDMARK_WIDTH", 320)),
+    motion_threshold=float(os.environ.get("GOVERNOR_MOTION_THRESHOLD", 1.5)),
+    max_skip=int(os.environ.get("GOVERNOR_MAX_SKIP", 2)),
+    idle_max_skip=int(os.environ.get("GOVERNOR_IDLE_MAX_SKIP", 5)),
+    target_fps=float(os.environ.get("GOVERNOR_TARGET_FPS", 0)),
+    cpu_budget=float(os.environ.get("GOVERNOR_CPU_BUDGET", 0.5)),
+)
+
+def process_camera_frame(img):
+    """Mirror, landmark, annotate and JPEG-encode one camera frame (runs on the capture thread)"""
+    import cv2
+    hands, mp_hands, mp_draw = hands_res.get()
+    frame_count = broadcaster.frames_captured + 1
+    landmarks = None
+
+    with metrics.stage("mirror"):
+        img = cv2.flip(img, 1)
+    # downscale, colour convert and MediaPipe, or the decision to skip, all
+    # happen inside; a skipped frame gets the previous result with fresh=False
+    with metrics.stage("hands_process"):
+        results, fresh = frame_governor.landmark(img, hands.process)
+
+    # A reused result describes an earlier frame. Its hands are still drawn
+    # (the overlay would flicker otherwise), but it isn't republished or fed
+    # to the sequence model as another frame of the sign; the next fresh
+    # frame makes up the skipped steps instead (see SequenceTracker.update).
+    if fresh:
+        if results.multi_hand_landmarks:
+            # 2 hands × 21 landmarks × xyz = 126, written into a reused buffer
+            # (landmark_store.publish copies it)
+            with metrics.stage("landmark_flatten"):
+                landmarks = capture_features.extract(results)
 
             # Log occasionally for debugging
             if frame_count % 100 == 0:
-                logger.info(f"Hands detected: {len(results.multi_hand_landmarks)}, landmarks count: {len(latest_landmarks)}")
+                logger.info(f"Hands detected: {len(results.multi_hand_landmarks)}, landmarks count: {len(landmarks)}")
 
-            # draw all hands
+        # every landmarked frame, hand or not: a sign ends when the hands drop out of view
+        sequence_model = sequence_res.get()
+        if sequence_model is not None:
+            with metrics.stage("sequence_step"):
+                stream_sequence.update(landmarks, sequence_model, frames=frame_governor.covers)
+
+        landmark_store.publish(landmarks)
+
+    if results.multi_hand_landmarks:
+        with metrics.stage("draw"):
             for hand_lms in results.multi_hand_landmarks:
                 mp_draw.draw_landmarks(img, hand_lms, mp_hands.HAND_CONNECTIONS)
-        else:
-            latest_landmarks = None  
-        ret, buffer = cv2.imencode('.jpg', img)
-        if not ret:
-            logger.warning("Failed to encode frame")
-            continue
-            
-        frame = buffer.tobytes()
+
+    with metrics.stage("jpeg_encode"):
+        ret, buffer = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+    if not ret:
+        logger.warning("Failed to encode frame")
+        return None
+    return buffer.tobytes()
+
+def open_frame_source():
+    # make sure the tracker is up before the first frame arrives
+    if hands_res.get() is None:
+        logger.error("Hand tracker unavailable")
+        return None
+    cap = camera_res.get()
+    if cap is None or not cap.isOpened():
+        return None
+    return cap
+
+# One capture thread feeds every /video_feed viewer; it stops after
+# CAPTURE_IDLE_TIMEOUT_S with no viewers or landmark polls.
+broadcaster = FrameBroadcaster(
+    open_frame_source,
+    process_camera_frame,
+    ring_size=int(os.environ.get("CAPTURE_RING_SIZE", 4)),
+    max_frame_age_s=float(os.environ.get("CAPTURE_MAX_FRAME_AGE_S", 1.0)),
+    idle_timeout_s=float(os.environ.get("CAPTURE_IDLE_TIMEOUT_S", 10.0)),
+)
+
+def stream_sequence_result():
+    """The camera stream's latest dynamic-sign result (None without a sequence model)"""
+    model = sequence_res.peek()
+    return sequence_result(model, stream_sequence.latest) if model is not None else None
+
+def classify_landmarks(landmarks):
+    """Classifier used by the prediction stream; landmarks is None when no hand is visible"""
+    if landmarks is None or not model_ready():
+        stream_smoother.reset()
+        bundle = model_res.peek()
+        return {"predicted": "None", "confidence": 0.0, "confirmed": False, "stable_for": 0.0,
+                "model_version": bundle.version if bundle is not None else None,
+                "sequence": stream_sequence_result()}
+    probs = predict_one(landmarks, batched=False)
+    result = smoothed_result(stream_smoother.update(probs))
+    result["sequence"] = stream_sequence_result()
+    return result
+
+# Classifies every new landmark snapshot once and pushes changes to
+# /prediction_stream subscribers, replacing the poll-then-predict round trip.
+prediction_feed = PredictionFeed(landmark_store, classify_landmarks, keepalive=lambda: broadcaster.touch())
+
+def generate_frames(max_fps=None):
+    for frame in broadcaster.subscribe(max_fps=max_fps):
         yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+               b'Content-Type: image/jpeg\r\n\r\n' + frame.jpeg + b'\r\n')
+
+# ---- Metrics ----
+# Sampled request latency per endpoint; stage timers live next to the code
+# they time. /metrics also exports every *_stats route as gauges.
+@app.before_request
+def _start_request_timer():
+    if metrics.sampled():
+        g.metrics_started = time.perf_counter()
+
+@app.after_request
+def _stop_request_timer(response):
+    started = g.pop("metrics_started", None)
+    if started is not None:
+        # streaming responses are timed to their first byte only
+        metrics.observe("request", request.endpoint or "unmatched", time.perf_counter() - started)
+    return response
+
+@app.route("/metrics", methods=["GET"])
+def metrics_route():
+    """Prometheus text exposition; ?format=json gives per-stage p50/p99 instead."""
+    if request.args.get("format") == "json":
+        return jsonify(metrics.summary())
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
 
 # ---- Routes ----
 @app.route("/", methods=["GET"])
@@ -133,41 +623,109 @@ def root():
     return jsonify({
         "ok": True,
         "service": "isl-backend",
-        "routes": ["/health", "/predict_frame", "/video_feed", "/latest_landmarks", "/test_prediction"],
-        "model_loaded": model is not None,
-        "camera_available": cap.isOpened(),
+        "routes": ["/health", "/predict_frame", "/predict_batch", "/leaderboard", "/video_feed", "/latest_landmarks", "/test_prediction", "/prediction_stream", "/batch_stats", "/cache_stats", "/capture_stats", "/stream_stats", "/score_queue_stats", "/score_status", "/extract_landmarks", "/extract_stats", "/metrics", "/model", "/model/reload", "/sequence_prediction"],
+        "model_loaded": model_res.ready,
+        "model_backend": MODEL_BACKEND,
+        "camera_available": camera_available(),
         "registered_routes": routes
     })
 
 @app.route("/health", methods=["GET"])
 def health():
+    # reports readiness only; never triggers a load
     return jsonify({
-        "ok": model is not None,
-        "model_loaded": model is not None,
-        "camera_available": cap.isOpened(),
-        "landmarks_available": latest_landmarks is not None
+        "ok": model_res.ready,
+        "model_loaded": model_res.ready,
+        "model_backend": MODEL_BACKEND,
+        "model_variant": getattr(getattr(model_res.peek(), "model", None), "weight_dtype", None),
+        "camera_available": camera_available(),
+        "landmarks_available": landmark_store.snapshot().landmarks is not None,
+        "landmarks_version": landmark_store.version,
+        "startup_mode": STARTUP_MODE,
+        "storage_backend": STORAGE_BACKEND,
+        "score_queue_depth": score_queue.stats()["queue_depth"] if score_queue is not None else None,
+        "sequence_sessions": len(sequence_sessions),
+        "subsystems": {name: r.status() for name, r in SUBSYSTEMS.items()},
+        "boot": boot.summary()
     })
 
+@app.route("/batch_stats", methods=["GET"])
+def batch_stats():
+    return jsonify(batcher.stats())
+
+@app.route("/cache_stats", methods=["GET"])
+def cache_stats():
+    return jsonify(prediction_cache.stats())
+
+@app.route("/score_queue_stats", methods=["GET"])
+def score_queue_stats():
+    if score_queue is None:
+        return jsonify({"enabled": False})
+    return jsonify(dict(score_queue.stats(), enabled=True))
+
+@app.route("/capture_stats", methods=["GET"])
+def capture_stats():
+    return jsonify(dict(broadcaster.stats(), governor=frame_governor.stats()))
+
 @app.route("/video_feed")
 def video_feed():
     logger.info("Video feed requested")
-    return Response(generate_frames(),
+    # optional per-viewer frame cap, e.g. /video_feed?fps=10 for slow links
+    max_fps = request.args.get("fps", type=float)
+    return Response(generate_frames(max_fps=max_fps),
                     mimetype='multipart/x-mixed-replace; boundary=frame')
 
+@app.route("/prediction_stream", methods=["GET"])
+def prediction_stream():
+    """Server-Sent Events: one `prediction` event per change of {predicted, confirmed}"""
+    logger.info("Prediction stream requested")
+    return Response(prediction_feed.sse(),
+                    mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.route("/sequence_prediction", methods=["GET"])
+def sequence_prediction():
+    """Latest dynamic-sign result for the server camera (the capture thread updates it)"""
+    broadcaster.touch()
+    if sequence_res.get() is None:
+        return jsonify({"error": "No sequence model loaded", "status": sequence_res.status()}), 503
+    return jsonify(dict(stream_sequence_result(), frames=stream_sequence.ring.count))
+
+@app.route("/stream_stats", methods=["GET"])
+def stream_stats():
+    return jsonify(prediction_feed.stats())
+
 @app.route("/latest_landmarks", methods=["GET"])
 def latest_landmarks_route():
-    global latest_landmarks
-    if latest_landmarks:
-        logger.debug(f"Returning {len(latest_landmarks)} landmarks")
-        return jsonify({"landmarks": latest_landmarks})
+    """
+    Latest landmarks with their version and capture timestamp.
+    ?since=N&wait_ms=T holds the request until a snapshot newer than N
+    arrives (or T ms pass), so pollers stop receiving the same vector twice.
+    """
+    broadcaster.touch()  # keep the capture thread alive while clients poll
+    since = request.args.get("since", type=int)
+    wait_ms = min(request.args.get("wait_ms", default=0, type=int), LANDMARK_MAX_WAIT_MS)
+
+    # a client holding a version from before a restart gets the current snapshot right away
+    if since is None or since > landmark_store.version:
+        snap = landmark_store.snapshot()
     else:
-        logger.debug("No landmarks available")
-        return jsonify({"landmarks": []})
+        snap = landmark_store.wait_newer(since, wait_ms / 1000.0)
+
+    changed = since is None or snap.version != since
+    landmarks = snap.landmarks.tolist() if snap.landmarks is not None else []
+    logger.debug("Returning %d landmarks (version %d)", len(landmarks), snap.version)
+    return jsonify({
+        "landmarks": landmarks,
+        "version": snap.version,
+        "timestamp": snap.timestamp,
+        "changed": changed
+    })
 
 @app.route("/test_prediction", methods=["GET"])
 def test_prediction():
     """Test endpoint to verify prediction works with dummy data"""
-    if model is None or label_classes is None or scaler is None:  # Check scaler
+    if not model_ready():
         return jsonify({"error": "Model not loaded"}), 500
     
     # Create dummy landmarks (126 values for 2 hands)
@@ -175,11 +733,11 @@ def test_prediction():
     
     try:
         x = np.array(dummy_landmarks, dtype=np.float32).reshape(1, -1)
-        x_scaled = scaler.transform(x)  # Apply scaling
-        preds = model.predict(x_scaled, verbose=0)
+        preds = predict_probs(x)  # scaling happens inside predict_probs
         confidence = float(np.max(preds))
         idx = int(np.argmax(preds, axis=1)[0])
-        predicted = str(label_classes[idx])
+        bundle = model_res.get()
+        predicted = str(bundle.label_classes[idx])
         
         logger.info(f"Test prediction: {predicted} (confidence: {confidence:.3f})")
         
@@ -187,6 +745,7 @@ def test_prediction():
             "predicted": predicted,
             "confidence": confidence,
             "test": "dummy_landmarks",
+            "model_version": bundle.version,
             "model_input_shape": list(x.shape),
             "expected_input_size": 126,
             "all_predictions": preds.tolist()[0]
@@ -197,92 +756,315 @@ def test_prediction():
     
 @app.route("/predict_frame", methods=["POST"])
 def predict_frame():
-    if model is None or label_classes is None or scaler is None:
+    if not model_ready():
         logger.error("Model or scaler not loaded")
         return jsonify({"error": "Model or scaler not loaded"}), 500
 
     try:
-        data = request.get_json(force=True)
-        arr = data.get("landmarks")
+        data = None
+        if is_binary_landmarks(request.mimetype):
+            # compact body (see utils/wire.py), decoded without JSON parsing
+            try:
+                x = decode_landmarks(request.get_data(cache=False), request.mimetype, 126,
+                                     scale=request.headers.get("X-Landmark-Scale", type=float))
+            except ValueError as e:
+                logger.warning(f"Invalid binary landmarks: {e}")
+                return jsonify({"error": str(e)}), 400
+            if x.shape[0] != 1:
+                return jsonify({"error": f"Expected 1 row of 126 values, got {x.shape[0]}"}), 400
+        else:
+            data = request.get_json(force=True)
+            arr = data.get("landmarks")
 
-        if not arr or not isinstance(arr, list):
-            logger.warning("Invalid or missing landmarks in request")
-            return jsonify({"error": "Landmarks must be a non-empty list"}), 400
+            if not arr or not isinstance(arr, list):
+                logger.warning("Invalid or missing landmarks in request")
+                return jsonify({"error": "Landmarks must be a non-empty list"}), 400
 
-        logger.info(f"Received landmarks array of length: {len(arr)}")
+            logger.debug("Received landmarks array of length: %d", len(arr))
 
-        # reshape into 1x126 array
-        x = np.array(arr, dtype=np.float32).reshape(1, -1)
-        if x.shape[1] != 126:
-            logger.warning(f"Expected 126 values, got {x.shape[1]}")
-            return jsonify({"error": f"Expected 126 values, got {x.shape[1]}"}), 400
+            # reshape into 1x126 array
+            x = np.array(arr, dtype=np.float32).reshape(1, -1)
+            if x.shape[1] != 126:
+                logger.warning(f"Expected 126 values, got {x.shape[1]}")
+                return jsonify({"error": f"Expected 126 values, got {x.shape[1]}"}), 400
 
-        # scale input before prediction
-        x_scaled = scaler.transform(x)
+        # cache first, then scaling + prediction in the shared batcher
+        preds = predict_one(x[0])
 
-        preds = model.predict(x_scaled, verbose=0)
-        confidence = float(np.max(preds))
-        idx = int(np.argmax(preds, axis=1)[0])
+        session_id = request_session_id(data)
+        if session_id:
+            result = smoothed_result(session_smoothers.update(session_id, preds))
+            sequence_model = sequence_res.get()
+            if sequence_model is not None:
+                with metrics.stage("sequence_step"):
+                    tracked = sequence_sessions.update(session_id, x[0], sequence_model)
+                result["sequence"] = sequence_result(sequence_model, tracked)
+        else:
+            result = result_from_probs(preds)
+        with metrics.stage("json_serialize"):
+            return jsonify(result)
+    except Exception as e:
+        logger.exception("predict_frame error")
+        return jsonify({"error": str(e)}), 500
 
-        if confidence >= 0.3:   # same threshold here
-            predicted = str(label_classes[idx])
-            confirmed = True
+    
+# Rows per scaler+model pass in /predict_batch; inputs larger than one chunk
+# are answered as NDJSON, one line per chunk, so memory stays bounded.
+PREDICT_BATCH_CHUNK_ROWS = int(os.environ.get("PREDICT_BATCH_CHUNK_ROWS", 1024))
+
+def batch_rows_result(probs, top_k=0):
+    """Per-row labels, confidences and optional top-k for an (N, num_classes) array"""
+    bundle = model_res.get()
+    label_classes = np.asarray(bundle.label_classes).astype(str)
+    idx = np.argmax(probs, axis=1)
+    result = {
+        "model_version": bundle.version,
+        "predicted": label_classes[idx].tolist(),
+        "confidence": probs[np.arange(len(probs)), idx].astype(float).tolist()
+    }
+    if top_k:
+        top = np.argsort(-probs, axis=1)[:, :top_k]
+        result["top_k"] = [
+            [{"label": label_classes[j], "confidence": float(row[j])} for j in order]
+            for row, order in zip(probs, top)
+        ]
+    return result
+
+@app.route("/predict_batch", methods=["POST"])
+def predict_batch():
+    """
+    Classify many landmark vectors in one request.
+    Body: {"landmarks": [[126 floats], ...], "top_k": k} or a binary N x 126
+    array (see utils/wire.py) with ?top_k=k, 1 <= k <= num_classes (0 or
+    absent: no top-k). Add ?stream=1 to force NDJSON.
+    """
+    if not model_ready():
+        return jsonify({"error": "Model or scaler not loaded"}), 500
+
+    top_k = request.args.get("top_k", default=0, type=int)
+    force_stream = request.args.get("stream", default=0, type=int)
+    chunk_rows = PREDICT_BATCH_CHUNK_ROWS
+
+    try:
+        if is_binary_landmarks(request.mimetype):
+            mimetype, content_length = request.mimetype, request.content_length
+            if mimetype == OCTET_STREAM:
+                # any binary upload says octet-stream; only take it with the landmark header
+                mimetype = parse_header(request.stream.read(HEADER.size), 126)
+                if content_length is not None:
+                    content_length -= HEADER.size
+            row_bytes = WIRE_DTYPES[mimetype].itemsize * 126
+            if content_length is not None and (content_length <= 0 or content_length % row_bytes):
+                return jsonify({"error": f"Body of {content_length} bytes is not a whole number of 126-value rows"}), 400
+            rows = content_length // row_bytes if content_length is not None else None
+            chunks = iter_landmark_chunks(request.stream, mimetype, 126, chunk_rows,
+                                          content_length=content_length,
+                                          scale=request.headers.get("X-Landmark-Scale", type=float))
+            if rows is None:
+                # chunked upload: read the first rows now, so an empty body is a 400, not an empty 200
+                first = next(chunks, None)
+                if first is None:
+                    return jsonify({"error": "Empty body: expected at least one 126-value row"}), 400
+                chunks = itertools.chain([first], chunks)
+        elif not request.is_json:
+            return jsonify({"error": f"Unsupported Content-Type {request.mimetype or 'none'!r}; send JSON "
+                                     f"or a binary landmark array (see utils/wire.py)"}), 415
         else:
-            predicted = "Unknown"
-            confirmed = False
+            data = request.get_json()
+            arr = data.get("landmarks")
+            top_k = int(data.get("top_k", top_k) or 0)
+            if not arr or not isinstance(arr, list):
+                return jsonify({"error": "Landmarks must be a non-empty list of lists"}), 400
+            x = np.array(arr, dtype=np.float32)
+            if x.ndim != 2 or x.shape[1] != 126:
+                return jsonify({"error": f"Expected an N x 126 matrix, got shape {list(x.shape)}"}), 400
+            rows = len(x)
+            chunks = (x[i:i + chunk_rows] for i in range(0, rows, chunk_rows))
+    except ValueError as e:
+        logger.warning(f"Invalid predict_batch body: {e}")
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.exception("predict_batch error")
+        return jsonify({"error": str(e)}), 400
 
-        return jsonify({
-            "predicted": predicted,
-            "confidence": confidence,
-            "confirmed": confirmed
-        })
+    num_classes = len(model_res.get().label_classes)
+    if top_k and not 1 <= top_k <= num_classes:
+        return jsonify({"error": f"top_k must be between 1 and {num_classes}, got {top_k}"}), 400
+
+    if rows is not None and rows <= chunk_rows and not force_stream:
+        try:
+            x = np.concatenate(list(chunks))
+            probs = predict_probs(x)
+            result = {"rows": len(x), **batch_rows_result(probs, top_k)}
+            with metrics.stage("json_serialize"):
+                return jsonify(result)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception as e:
+            logger.exception("predict_batch error")
+            return jsonify({"error": str(e)}), 500
+
+    def generate():
+        offset = 0
+        try:
+            for x in chunks:
+                probs = predict_probs(x)
+                result = {"offset": offset, "rows": len(x), **batch_rows_result(probs, top_k)}
+                with metrics.stage("json_serialize"):
+                    line = json.dumps(result) + "\n"
+                yield line
+                offset += len(x)
+        except Exception as e:
+            logger.exception("predict_batch stream error")
+            yield json.dumps({"offset": offset, "error": str(e)}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
 
+@app.route("/extract_landmarks", methods=["POST"])
+def extract_landmarks():
+    """
+    Landmark uploaded JPEG/PNG frames server-side, for clients that can't run
+    MediaPipe. Send one image as the raw body (image/jpeg, image/png) or a
+    burst as multipart files. ?mirror=0 skips the horizontal flip the capture
+    pipeline applies; ?predict=1 also classifies every frame with hands.
+    """
+    if request.files:
+        frames = [f.read() for key in request.files for f in request.files.getlist(key)]
+    elif request.mimetype.startswith("image/"):
+        frames = [request.get_data(cache=False)]
+    else:
+        return jsonify({"error": "Send an image body or multipart image files"}), 415
+    frames = [f for f in frames if f]
+    if not frames:
+        return jsonify({"error": "No frames received"}), 400
+    if len(frames) > EXTRACT_MAX_FRAMES:
+        return jsonify({"error": f"At most {EXTRACT_MAX_FRAMES} frames per request"}), 413
+
+    pool = landmark_pool_res.get()
+    if pool is None:
+        return jsonify({"error": "Landmark extraction unavailable"}), 503
 
+    try:
+        results = pool.extract(frames, mirror=request.args.get("mirror", "1") != "0")
 
+        if request.args.get("predict") == "1":
+            if not model_ready():
+                return jsonify({"error": "Model or scaler not loaded"}), 500
+            rows = [i for i, r in enumerate(results) if r.get("landmarks") is not None]
+            if rows:
+                x = np.asarray([results[i]["landmarks"] for i in rows], dtype=np.float32)
+                probs = predict_probs(x)
+                for i, row in zip(rows, probs):
+                    results[i].update(result_from_probs(row))
 
+        return jsonify({"frames": results, "count": len(results)})
     except Exception as e:
-        logger.exception("predict_frame error")
+        logger.exception("extract_landmarks error")
         return jsonify({"error": str(e)}), 500
 
-    
+@app.route("/extract_stats", methods=["GET"])
+def extract_stats():
+    pool = landmark_pool_res.peek()
+    return jsonify(pool.stats() if pool is not None else landmark_pool_res.status())
+
 @app.route("/predict_current", methods=["GET"])
 def predict_current():
-    global latest_landmarks
-    if model is None or label_classes is None or scaler is None:  # Check scaler
+    broadcaster.touch()
+    if not model_ready():
         return jsonify({"error": "Model not loaded"}), 500
-    if latest_landmarks is None:
-        return jsonify({"predicted": "None", "confirmed": False})
+    snap = landmark_store.snapshot()
+    if snap.landmarks is None:
+        return jsonify({"predicted": "None", "confirmed": False, "version": snap.version,
+                        "model_version": model_res.get().version})
 
     try:
-        x = np.array(latest_landmarks, dtype=np.float32).reshape(1, -1)
-        if x.shape[1] != 126:
-            return jsonify({"error": f"Expected 126 values, got {x.shape[1]}"}), 400
-        
-        # APPLY SCALING (NEW)
-        x_scaled = scaler.transform(x)
-        
-        preds = model.predict(x_scaled, verbose=0)  # Use x_scaled
+        preds = predict_one(snap.landmarks)
         confidence = float(np.max(preds))
-        idx = int(np.argmax(preds, axis=1)[0])
-        predicted = str(label_classes[idx])
+        idx = int(np.argmax(preds))
+        bundle = model_res.get()
+        predicted = str(bundle.label_classes[idx])
 
         return jsonify({
             "predicted": predicted,
             "confidence": confidence,
-            "confirmed": True
+            "confirmed": True,
+            "version": snap.version,
+            "model_version": bundle.version
         })
     except Exception as e:
         logger.exception("predict_current error")
         return jsonify({"error": str(e)}), 500
    
+DAILY_LETTER_POOL = list("ABCD")
+DAILY_LETTER_COUNT = 3
+
 @app.route("/get_daily_letters", methods=["GET"])
 def get_daily_letters():
-    # pick a fixed set per day so all users see same
-    random.seed(datetime.date.today().toordinal())
-    all_letters = list("ABCD")
-    letters = random.sample(all_letters, 3)  # 5 random letters for the day
+    # pick a fixed set per day so all users see same; the first pick is stored
+    today = datetime.date.today()
+    store = store_res.get()
+    letters = store.get_daily_letters(today.isoformat()) if store is not None else None
+    if letters is None:
+        rng = random.Random(today.toordinal())
+        letters = rng.sample(DAILY_LETTER_POOL, DAILY_LETTER_COUNT)
+        if store is not None:
+            letters = store.set_daily_letters_if_absent(today.isoformat(), letters)
     return jsonify({"letters": letters})
 
+ALREADY_PLAYED_MESSAGE = "⚠️ You already attempted today's test. Try again tomorrow."
+
+# uids known to have played today; cleared at day rollover
+played_today = PlayedTodayCache()
+
+# Write-behind for /submit_score: accepted records are spilled to a local
+# JSONL file, acknowledged with 202, and written to the store in batches by
+# a background thread. Each worker spills to its own file derived from
+# SCORE_SPILL_PATH (pending_scores.<pid>.jsonl) and claims the files of dead
+# workers at startup. SCORE_WRITE_BEHIND=0 writes synchronously instead.
+SCORE_WRITE_BEHIND = os.environ.get("SCORE_WRITE_BEHIND", "1") != "0"
+SCORE_SPILL_PATH = os.environ.get("SCORE_SPILL_PATH", os.path.join(BASE_DIR, "data", "pending_scores.jsonl"))
+SCORE_FLUSH_BATCH = int(os.environ.get("SCORE_FLUSH_BATCH", 50))
+SCORE_FLUSH_INTERVAL_MS = float(os.environ.get("SCORE_FLUSH_INTERVAL_MS", 250))
+
+score_queue = WriteBehindQueue(
+    store_res.get,
+    SCORE_SPILL_PATH,
+    batch_size=SCORE_FLUSH_BATCH,
+    flush_interval_s=SCORE_FLUSH_INTERVAL_MS / 1000.0,
+    on_written=leaderboard_index.add,
+) if SCORE_WRITE_BEHIND else None
+
+@app.route("/leaderboard", methods=["GET"])
+def leaderboard():
+    """
+    Ranked page of one day's top scores: ?date=YYYY-MM-DD&limit=N&cursor=C.
+    Sends an ETag; a matching If-None-Match gets an empty 304.
+    """
+    date = request.args.get("date") or datetime.date.today().isoformat()
+    limit = max(1, min(request.args.get("limit", default=20, type=int), LEADERBOARD_MAX_PAGE))
+    cursor = max(0, request.args.get("cursor", default=0, type=int))
+
+    if leaderboard_res.get() is None:
+        return jsonify({"error": "Leaderboard unavailable"}), 503
+    refresh_leaderboard_if_stale()
+
+    etag = f"{leaderboard_index.etag(date)}-{cursor}-{limit}"
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
+        resp.set_etag(etag)
+        return resp
+
+    entries, next_cursor, total = leaderboard_index.page(date, limit, cursor)
+    resp = jsonify({
+        "date": date,
+        "entries": entries,
+        "next_cursor": next_cursor,
+        "total": total
+    })
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
 @app.route("/submit_score", methods=["POST"])
 def submit_score():
     """Submit score once per day per user"""
@@ -297,33 +1079,69 @@ def submit_score():
             return jsonify({"success": False, "error": "Missing uid or score"}), 400
 
         today = datetime.date.today().isoformat()
+        if played_today.has_played(uid):
+            return jsonify({"success": False, "message": ALREADY_PLAYED_MESSAGE}), 403
 
-        # check if already submitted today
-        existing = db.collection("leaderboard") \
-            .where("uid", "==", uid) \
-            .where("date", "==", today) \
-            .stream()
-
-        if any(existing):
-            return jsonify({
-                "success": False,
-                "message": "⚠️ You already attempted today's test. Try again tomorrow."
-            }), 403
-
-        # save new record
-        db.collection("leaderboard").add({
-            "uid": uid,
-            "email": email,
-            "score": score,
-            "time": time_taken,
-            "date": today,
-            "timestamp": firestore.SERVER_TIMESTAMP
-        })
+        record = {"uid": uid, "email": email, "score": score, "time": time_taken,
+                  "date": today, "timestamp": time.time()}
+
+        if score_queue is not None:
+            # attempts made through another worker or before a restart are in
+            # the store; if it is down, queue anyway and let the flush decide
+            try:
+                store = store_res.get()
+                if store is not None and store.has_attempt(uid, today):
+                    played_today.mark_played(uid, today)
+                    return jsonify({"success": False, "message": ALREADY_PLAYED_MESSAGE}), 403
+            except Exception as e:
+                logger.warning(f"submit_score: attempt lookup failed, queueing unchecked ({e})")
+            # dedupe against what this worker already accepted; a concurrent
+            # submission on another worker is rejected by the store at flush
+            # time, which /score_status reports
+            if not score_queue.submit(record):
+                played_today.mark_played(uid, today)
+                return jsonify({"success": False, "message": ALREADY_PLAYED_MESSAGE}), 403
+            played_today.mark_played(uid, today)
+            return jsonify({"success": True, "message": "✅ Score submitted!", "queued": True,
+                            "status": "pending", "status_url": f"/score_status?uid={quote(uid)}&date={today}"}), 202
+
+        store = store_res.get()
+        if store is None:
+            return jsonify({"success": False, "error": "Storage unavailable"}), 503
 
+        # one record per (uid, date): the create fails if it already exists,
+        # so the check and the write are a single round trip
+        if not store.create_attempt(record):
+            played_today.mark_played(uid, today)
+            return jsonify({"success": False, "message": ALREADY_PLAYED_MESSAGE}), 403
+
+        played_today.mark_played(uid, today)
+        leaderboard_index.add(record)
         return jsonify({"success": True, "message": "✅ Score submitted!"})
     except Exception as e:
         logger.exception("submit_score error")
         return jsonify({"success": False, "error": str(e)}), 500 
+@app.route("/score_status", methods=["GET"])
+def score_status():
+    """
+    Outcome of a /submit_score: ?uid=U&date=YYYY-MM-DD (default today).
+    "pending" (queued here), "written", "rejected" (another attempt got there
+    first) or "none". Another worker's queue isn't visible, so a record
+    accepted elsewhere reads "none" until it is flushed.
+    """
+    uid = request.args.get("uid")
+    if not uid:
+        return jsonify({"error": "Missing uid"}), 400
+    date = request.args.get("date") or datetime.date.today().isoformat()
+
+    status = score_queue.status(uid, date) if score_queue is not None else None
+    if status is None:
+        store = store_res.get()
+        if store is None:
+            return jsonify({"error": "Storage unavailable"}), 503
+        status = "written" if store.has_attempt(uid, date) else "none"
+    return jsonify({"uid": uid, "date": date, "status": status})
+
 @app.route("/can_play_today", methods=["GET"])
 def can_play_today():
     """Check if user can play today"""
@@ -333,13 +1151,16 @@ def can_play_today():
             return jsonify({"ok": False, "error": "Missing uid"}), 400
 
         today = datetime.date.today().isoformat()
+        if played_today.has_played(uid):
+            return jsonify({"ok": False, "message": "Already played today"})
 
-        existing = db.collection("leaderboard") \
-            .where("uid", "==", uid) \
-            .where("date", "==", today) \
-            .stream()
+        store = store_res.get()
+        if store is None:
+            return jsonify({"ok": False, "error": "Storage unavailable"}), 503
 
-        if any(existing):
+        # point lookup on (uid, date) instead of a where().where() scan
+        if store.has_attempt(uid, today):
+            played_today.mark_played(uid, today)
             return jsonify({"ok": False, "message": "Already played today"})
         else:
             return jsonify({"ok": True, "message": "Can play today"})
@@ -347,6 +1168,83 @@ def can_play_today():
         logger.exception("can_play_today error")
         return jsonify({"ok": False, "error": str(e)}), 500
 
+@app.route("/model", methods=["GET"])
+def model_info():
+    """Served version, last swap attempt and the published versions"""
+    bundle = model_res.peek()
+    return jsonify({
+        "version": bundle.version if bundle is not None else None,
+        "labels": [str(l) for l in bundle.label_classes] if bundle is not None else None,
+        "active": model_registry.active_version(MODEL_REGISTRY_DIR),
+        "available": model_registry.versions(MODEL_REGISTRY_DIR),
+        "swap": model_swap,
+        "status": model_res.status()
+    })
+
+@app.route("/model/reload", methods=["POST"])
+def model_reload():
+    """
+    Load a model version in the background and swap it in. {"version": V}
+    also makes V the ACTIVE version, so the other workers follow within
+    MODEL_WATCH_S; without a version the current ACTIVE one is reloaded.
+    Needs X-Admin-Token matching MODEL_ADMIN_TOKEN; disabled when that is unset.
+    """
+    if not MODEL_ADMIN_TOKEN:
+        return jsonify({"error": "Model reload is disabled (MODEL_ADMIN_TOKEN is not set)"}), 403
+    if not hmac.compare_digest(request.headers.get("X-Admin-Token", "").encode(), MODEL_ADMIN_TOKEN.encode()):
+        return jsonify({"error": "Forbidden"}), 403
+    data = request.get_json(silent=True) or {}
+    version = data.get("version")
+    if version:
+        if not isinstance(version, str) or version not in model_registry.versions(MODEL_REGISTRY_DIR):
+            return jsonify({"error": f"No published version {version}"}), 404
+    with _reload_request_lock:
+        if model_swap["state"] == "loading":
+            return jsonify({"error": "A model swap is already running", "swap": model_swap}), 409
+        # only a reload that will actually run gets to move ACTIVE
+        if version:
+            model_registry.set_active(version, MODEL_REGISTRY_DIR)
+        model_swap.update(state="loading", version=version, error=None, at=time.time())
+        threading.Thread(target=swap_model, args=(version,), name="model-swap", daemon=True).start()
+    return jsonify({"ok": True, "loading": version or model_registry.active_version(MODEL_REGISTRY_DIR)}), 202
+
+# ---- Metrics collectors ----
+# every *_stats dict, exported as gauges on /metrics
+metrics.add_collector("batcher", batcher.stats)
+metrics.add_collector("prediction_cache", prediction_cache.stats)
+metrics.add_collector("capture", broadcaster.stats)
+metrics.add_collector("governor", frame_governor.stats)
+metrics.add_collector("stream", prediction_feed.stats)
+metrics.add_collector("played_today", played_today.stats)
+metrics.add_collector("landmark_pool", lambda: landmark_pool_res.peek().stats() if landmark_pool_res.ready else {})
+if score_queue is not None:
+    metrics.add_collector("score_queue", score_queue.stats)
+
+# ---- Boot ----
+def start_background_work():
+    """Warm subsystems, open the score spill and start the registry watcher"""
+    if score_queue is not None:
+        score_queue.open()  # replays this worker's spill and claims dead workers' ones
+    if STARTUP_MODE == "eager":
+        for name in SUBSYSTEMS:
+            SUBSYSTEMS[name].get()
+    elif STARTUP_MODE == "background":
+        for name in WARM_SUBSYSTEMS:
+            if name in SUBSYSTEMS:
+                SUBSYSTEMS[name].warm_async()
+            else:
+                logger.warning(f"[boot] Unknown subsystem in WARM_SUBSYSTEMS: {name}")
+    if MODEL_WATCH_S > 0:
+        threading.Thread(target=watch_model_registry, name="model-watch", daemon=True).start()
+    boot.mark("subsystems")
+    boot.log(SUBSYSTEMS.values())
+
+# The landmark pool's spawned workers re-import this file as __mp_main__
+# (under `python app.py`); they only need the pool's worker functions, so
+# they must not warm models, claim score spills or start watchers.
+if __name__ != "__mp_main__":
+    start_background_work()
+
 # ---- Main ----
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
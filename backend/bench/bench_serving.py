@@ -0,0 +1,459 @@
+# backend/bench/bench_serving.py
+"""
+Benchmark the inference and streaming paths without a camera or Firebase.
+
+Measures:
+  predict_frame    throughput and p50/p99 latency at several concurrency levels,
+                   replaying landmark rows from model/dataset/data.csv
+  predict_batch    rows/s for a few batch sizes
+  generate_frames  frames/s out of the MJPEG generator, fed by synthetic frames
+                   or a video file instead of the webcam
+  governor         landmark CPU per frame and accuracy of the adaptive frame governor
+                   (utils/frame_governor.py) against full-rate landmarking, on a
+                   --video with hands in view
+  stages           per-stage cost from utils/metrics.py (sampling forced to 1)
+  memory           RSS after import, after model load and at the end
+
+Results are written as JSON so runs can be diffed across model or serving
+changes; --compare prints the deltas against an earlier run.
+
+Usage (from backend/):
+    python bench/bench_serving.py [--requests 2000] [--concurrency 1,4,16]
+                                  [--video clip.mp4] [--out bench/results/run.json]
+                                  [--compare bench/results/old.json]
+"""
+import argparse
+import csv
+import datetime
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BASE_DIR)
+
+# must be set before app is imported: nothing warms in the background, no
+# Firestore, and every stage timer is sampled
+os.environ.setdefault("STARTUP_MODE", "lazy")
+os.environ.setdefault("STORAGE_BACKEND", "sqlite")
+os.environ.setdefault("SQLITE_PATH", os.path.join(BENCH_DIR, "results", "bench.db"))
+os.environ.setdefault("SCORE_SPILL_PATH", os.path.join(BENCH_DIR, "results", "pending_scores.jsonl"))
+os.environ["METRICS_SAMPLE_RATE"] = "1"
+
+import numpy as np  # noqa: E402
+
+DATASET_PATH = os.path.join(BASE_DIR, "model", "dataset", "data.csv")
+
+
+def rss_mb():
+    """Current resident set size (Linux), falling back to peak RSS."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def latency_summary(latencies_s, elapsed_s):
+    ms = [v * 1000.0 for v in latencies_s]
+    return {
+        "requests": len(ms),
+        "throughput_rps": round(len(ms) / elapsed_s, 1) if elapsed_s else 0.0,
+        "p50_ms": round(percentile(ms, 0.50), 3),
+        "p99_ms": round(percentile(ms, 0.99), 3),
+        "max_ms": round(max(ms), 3) if ms else 0.0,
+        "mean_ms": round(sum(ms) / len(ms), 3) if ms else 0.0,
+    }
+
+
+# ---- workloads ----
+def load_landmark_rows(path=DATASET_PATH, size=126):
+    """
+    Recorded rows from data.csv, in file order (consecutive rows of one label
+    are a held sign). The CSV stores x, y for two hands; z is filled with 0
+    to match the served 126-value layout.
+    """
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        next(reader)
+        rows = [[float(v) for v in row[1:]] for row in reader if row]
+    x = np.asarray(rows, dtype=np.float32)
+    if x.shape[1] == size:
+        return x
+    if x.shape[1] * 3 == size * 2:  # xy -> xyz
+        xy = x.reshape(len(x), -1, 2)
+        return np.concatenate([xy, np.zeros(xy.shape[:2] + (1,), np.float32)], axis=2).reshape(len(x), size)
+    raise ValueError(f"Can't map {x.shape[1]} columns onto {size} features")
+
+
+class SyntheticSource:
+    """Camera stand-in: moving-gradient BGR frames at a fixed size, or a looped video file."""
+
+    def __init__(self, width=640, height=480, video=None):
+        self.video = video
+        self._cap = None
+        if video:
+            import cv2
+            self._cap = cv2.VideoCapture(video)
+            if not self._cap.isOpened():
+                raise RuntimeError(f"Could not open video {video}")
+        yy, xx = np.mgrid[0:height, 0:width]
+        self._base = ((xx + yy) % 256).astype(np.uint8)
+        self._t = 0
+
+    def read(self):
+        if self._cap is not None:
+            ok, frame = self._cap.read()
+            if not ok:  # loop
+                self._cap.set(1, 0)  # CAP_PROP_POS_FRAMES
+                ok, frame = self._cap.read()
+            return ok, frame
+        self._t = (self._t + 7) % 256
+        frame = np.stack([self._base + self._t, self._base, 255 - self._base], axis=2)
+        return True, frame
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        if self._cap is not None:
+            self._cap.release()
+
+
+# ---- benchmarks ----
+def bench_predict_frame(app_module, rows, total, concurrency, binary=False):
+    """Closed-loop clients posting one row each; returns the latency summary."""
+    from utils.wire import encode_landmarks
+    mimetype = "application/x-landmarks-f32"
+    per_thread = max(1, total // concurrency)
+    latencies = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    barrier = threading.Barrier(concurrency + 1)
+
+    def client(i):
+        c = app_module.app.test_client()
+        barrier.wait()
+        for n in range(per_thread):
+            row = rows[(i * per_thread + n) % len(rows)]
+            started = time.perf_counter()
+            if binary:
+                r = c.post("/predict_frame", data=encode_landmarks(row[None], mimetype),
+                           content_type=mimetype)
+            else:
+                r = c.post("/predict_frame", json={"landmarks": row.tolist()})
+            latencies[i].append(time.perf_counter() - started)
+            if r.status_code != 200:
+                errors[i] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    result = latency_summary([v for lat in latencies for v in lat], elapsed)
+    result.update(concurrency=concurrency, errors=sum(errors))
+    return result
+
+
+def bench_predict_batch(app_module, rows, sizes, repeats=20):
+    c = app_module.app.test_client()
+    out = []
+    for size in sizes:
+        idx = np.arange(size) % len(rows)
+        body = {"landmarks": rows[idx].tolist()}
+        c.post("/predict_batch", json=body)  # warm
+        started = time.perf_counter()
+        for _ in range(repeats):
+            c.post("/predict_batch", json=body)
+        elapsed = time.perf_counter() - started
+        out.append({"batch_size": size, "rows_per_s": round(size * repeats / elapsed, 1),
+                    "ms_per_request": round(elapsed / repeats * 1000.0, 3)})
+    return out
+
+
+def bench_generate_frames(app_module, seconds, video=None):
+    """
+    Drain app.generate_frames() for `seconds`. Uses the real capture pipeline
+    (flip, MediaPipe, draw, JPEG) when cv2 and mediapipe are installed;
+    otherwise frames are passed through as a fixed JPEG, which measures only
+    the broadcaster and generator overhead.
+    """
+    try:
+        import cv2  # noqa: F401
+        import mediapipe  # noqa: F401
+        pipeline = "full"
+    except ImportError:
+        pipeline = "passthrough"
+        if video:
+            return {"pipeline": pipeline, "skipped": "--video needs opencv-python installed"}
+
+    source = SyntheticSource(video=video)
+    broadcaster = app_module.broadcaster
+    broadcaster.open_source = lambda: source
+    if pipeline == "passthrough":
+        with open(os.path.join(BASE_DIR, "placeholder.jpg"), "rb") as f:
+            jpeg = f.read()
+        broadcaster.process = lambda img: jpeg
+
+    frames = 0
+    nbytes = 0
+    gen = app_module.generate_frames()
+    started = time.perf_counter()
+    deadline = started + seconds
+    for chunk in gen:
+        frames += 1
+        nbytes += len(chunk)
+        if time.perf_counter() >= deadline:
+            break
+    elapsed = time.perf_counter() - started
+    gen.close()
+    return {
+        "pipeline": pipeline,
+        "source": video or "synthetic 640x480",
+        "seconds": round(elapsed, 2),
+        "frames": frames,
+        "fps": round(frames / elapsed, 1) if elapsed else 0.0,
+        "avg_frame_kb": round(nbytes / frames / 1024.0, 1) if frames else 0.0,
+        "capture": broadcaster.stats(),
+    }
+
+
+def bench_governor(app_module, video, max_frames=300):
+    """
+    Landmark the same clip twice with fresh trackers: every full-resolution
+    frame (the baseline), then through a governor configured like the app's.
+    Reports CPU per frame for both and how far the governed landmarks (reused
+    ones included) are from the baseline's. With a sequence model, also how
+    often the dynamic-sign prediction agrees, the governed run stepping the
+    model the way the capture pipeline does (fresh frames only, skipped ones
+    interpolated).
+    """
+    try:
+        import cv2
+        import mediapipe  # noqa: F401
+    except ImportError:
+        return {"skipped": "needs opencv-python and mediapipe installed"}
+    if not video:
+        return {"skipped": "needs --video with hands in view (synthetic frames have none)"}
+    from utils.frame_governor import FrameGovernor
+    from utils.landmark_features import LandmarkFeatures, normalize_rows
+    from utils.sequence import SequenceTracker
+
+    cap = cv2.VideoCapture(video)
+    frames = []
+    while len(frames) < max_frames:
+        ok, img = cap.read()
+        if not ok:
+            break
+        frames.append(cv2.flip(img, 1))  # like the capture pipeline
+    cap.release()
+    if not frames:
+        return {"skipped": f"no frames read from {video}"}
+
+    # raw image coordinates, so the error can be reported in pixels
+    capture = app_module.capture_features
+    features = LandmarkFeatures(126, hand_order=capture.hand_order, normalize=False)
+
+    def run(governor):
+        hands = app_module.create_hand_tracker().hands
+        out = np.zeros((len(frames), 126), dtype=np.float32)
+        present = np.zeros(len(frames), dtype=bool)
+        covers = np.zeros(len(frames), dtype=np.int64)  # 0: reused result
+        cpu, wall = time.process_time(), time.perf_counter()
+        for i, img in enumerate(frames):
+            results, fresh = governor.landmark(img, hands.process)
+            covers[i] = governor.covers if fresh else 0
+            vector = features.extract(results)
+            if vector is not None:
+                out[i] = vector
+                present[i] = True
+        cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+        hands.close()
+        return out, present, covers, cpu, wall, governor.stats()
+
+    base, base_present, base_covers, base_cpu, base_wall, _ = run(FrameGovernor(enabled=False))
+    config = dict(app_module.frame_governor.config(), enabled=True)
+    gov, gov_present, gov_covers, gov_cpu, gov_wall, gov_stats = run(FrameGovernor(**config))
+
+    width = frames[0].shape[1]
+    both = base_present & gov_present
+    result = {
+        "source": video,
+        "frames": len(frames),
+        "config": config,
+        "baseline": {"cpu_ms_per_frame": round(base_cpu / len(frames) * 1000.0, 3),
+                     "fps": round(len(frames) / base_wall, 1), "frames_with_hands": int(base_present.sum())},
+        "governed": {"cpu_ms_per_frame": round(gov_cpu / len(frames) * 1000.0, 3),
+                     "fps": round(len(frames) / gov_wall, 1), "frames_with_hands": int(gov_present.sum()),
+                     "stats": gov_stats},
+        "cpu_speedup": round(base_cpu / gov_cpu, 2) if gov_cpu else None,
+        "detection_agreement": round(float(np.mean(base_present == gov_present)), 4),
+    }
+    if both.any():
+        xy = lambda v: v[both].reshape(-1, 2, 21, 3)[..., :2]  # noqa: E731
+        # compare hand slots that both runs filled
+        filled = (np.abs(xy(base)).sum(axis=(2, 3)) > 0) & (np.abs(xy(gov)).sum(axis=(2, 3)) > 0)
+        err_px = np.linalg.norm(xy(base) - xy(gov), axis=-1)[filled] * width
+        result["landmark_error_px"] = {"mean": round(float(err_px.mean()), 2),
+                                       "p95": round(float(np.percentile(err_px, 95)), 2)}
+        if app_module.model_ready():
+            prep = (lambda x: normalize_rows(x.copy())) if capture.normalize else (lambda x: x)
+            agree = (app_module.predict_probs(prep(base[both])).argmax(axis=1) ==
+                     app_module.predict_probs(prep(gov[both])).argmax(axis=1))
+            result["prediction_agreement"] = round(float(agree.mean()), 4)
+
+    sequence_model = app_module.sequence_res.get()
+    if sequence_model is not None:
+        prep = (lambda x: normalize_rows(x.copy())) if capture.normalize else (lambda x: x)
+
+        def track(vectors, present, covers):
+            tracker = SequenceTracker(size=126, capacity=app_module.SEQUENCE_RING_SIZE,
+                                      max_gap=app_module.SEQUENCE_MAX_GAP)
+            predicted = np.full(len(vectors), -1)
+            for i in range(len(vectors)):
+                if covers[i]:
+                    tracker.update(prep(vectors[i]) if present[i] else None, sequence_model, frames=covers[i])
+                idx, _, ready = tracker.latest
+                predicted[i] = idx if ready else -1
+            return predicted
+
+        base_seq = track(base, base_present, base_covers)
+        gov_seq = track(gov, gov_present, gov_covers)
+        ready = (base_seq >= 0) | (gov_seq >= 0)
+        result["sequence_agreement"] = round(float(np.mean(base_seq[ready] == gov_seq[ready])), 4) \
+            if ready.any() else None
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, previous):
+    """Print throughput/latency deltas for matching predict_frame levels."""
+    old = {(r["concurrency"], r.get("binary", False)): r for r in previous["results"].get("predict_frame", [])}
+    print("\npredict_frame vs", previous["meta"].get("git"), previous["meta"].get("started"))
+    for r in current["results"]["predict_frame"]:
+        before = old.get((r["concurrency"], r.get("binary", False)))
+        if not before:
+            continue
+
+        def delta(key):
+            return (r[key] - before[key]) / before[key] * 100.0 if before[key] else 0.0
+        print(f"  c={r['concurrency']:<3} {'bin ' if r.get('binary') else 'json'} "
+              f"rps {before['throughput_rps']:>9} -> {r['throughput_rps']:>9} ({delta('throughput_rps'):+.1f}%)  "
+              f"p99 {before['p99_ms']:>8} -> {r['p99_ms']:>8} ms ({delta('p99_ms'):+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per concurrency level")
+    parser.add_argument("--concurrency", default="1,2,4,8,16")
+    parser.add_argument("--batch-sizes", default="1,32,256,1024")
+    parser.add_argument("--stream-seconds", type=float, default=5.0)
+    parser.add_argument("--video", help="video file to use instead of synthetic frames")
+    parser.add_argument("--governor-frames", type=int, default=300, help="frames of --video for the governor run")
+    parser.add_argument("--dataset", default=DATASET_PATH)
+    parser.add_argument("--out", help="results path (default bench/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier results file to diff against")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.join(BENCH_DIR, "results"), exist_ok=True)
+    started = datetime.datetime.now().isoformat(timespec="seconds")
+    memory = {"start_mb": round(rss_mb(), 1)}
+
+    import app as app_module
+    memory["after_import_mb"] = round(rss_mb(), 1)
+    if not app_module.model_ready():
+        sys.exit("Model failed to load; see the log above")
+    memory["after_model_mb"] = round(rss_mb(), 1)
+
+    rows = load_landmark_rows(args.dataset)
+    levels = [int(v) for v in args.concurrency.split(",") if v]
+    results = {"predict_frame": []}
+    for binary in (False, True):
+        for level in levels:
+            app_module.prediction_cache.clear()
+            r = bench_predict_frame(app_module, rows, args.requests, level, binary=binary)
+            r["binary"] = binary
+            results["predict_frame"].append(r)
+            print(f"predict_frame c={level:<3} {'bin ' if binary else 'json'} "
+                  f"{r['throughput_rps']:>9} rps  p50 {r['p50_ms']:.2f} ms  p99 {r['p99_ms']:.2f} ms")
+
+    results["predict_batch"] = bench_predict_batch(
+        app_module, rows, [int(v) for v in args.batch_sizes.split(",") if v])
+    for r in results["predict_batch"]:
+        print(f"predict_batch n={r['batch_size']:<5} {r['rows_per_s']:>10} rows/s")
+
+    results["generate_frames"] = bench_generate_frames(app_module, args.stream_seconds, args.video)
+    print(f"generate_frames {results['generate_frames'].get('fps')} fps "
+          f"({results['generate_frames']['pipeline']})")
+
+    results["governor"] = bench_governor(app_module, args.video, args.governor_frames)
+    g = results["governor"]
+    if "skipped" in g:
+        print(f"governor skipped: {g['skipped']}")
+    else:
+        print(f"governor {g['baseline']['cpu_ms_per_frame']} -> {g['governed']['cpu_ms_per_frame']} CPU ms/frame "
+              f"(x{g['cpu_speedup']}), landmark error {g.get('landmark_error_px')} px, "
+              f"detection agreement {g['detection_agreement']}, "
+              f"sequence agreement {g.get('sequence_agreement', 'n/a')}")
+
+    results["stages"] = app_module.metrics.summary()["histograms"]
+    results["cache"] = app_module.prediction_cache.stats()
+    results["batcher"] = app_module.batcher.stats()
+    memory["end_mb"] = round(rss_mb(), 1)
+    results["memory"] = memory
+
+    report = {
+        "meta": {
+            "started": started,
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+            "model_backend": app_module.MODEL_BACKEND,
+            "model_version": app_module.model_res.get().version,
+            "dataset_rows": len(rows),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    out = args.out or os.path.join(BENCH_DIR, "results", started.replace(":", "") + ".json")
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"\nResults written to {out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
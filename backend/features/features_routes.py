@@ -4,6 +4,7 @@ import numpy as np
 import mediapipe as mp
 import tensorflow as tf
 from utils.frame_handler import get_latest_frame
+from utils.landmark_features import LandmarkFeatures
 
 
 features_bp = Blueprint('features', __name__)
@@ -13,6 +14,7 @@ MODEL_PATH = "model/sign_language_model.h5"
 LABELS_PATH = "model/label_classes.npy"
 model = tf.keras.models.load_model(MODEL_PATH)
 label_classes = np.load(LABELS_PATH, allow_pickle=True)
+features = LandmarkFeatures.for_model(model, "model")
 
 mp_hands = mp.solutions.hands
 hands = mp_hands.Hands()
@@ -35,21 +37,13 @@ def predict_current():
             print("⚠️ No hand landmarks detected")
             return jsonify({"predicted": "None", "confirmed": False})  # <-- changed key
 
-        for hand_landmarks in results.multi_hand_landmarks:
-            data = []
-            for lm in hand_landmarks.landmark:
-                data.extend([lm.x, lm.y])
-            while len(data) < 84:
-                data.append(0.0)
+        x = features.extract(results)
+        prediction = model.predict(x.reshape(1, -1))
+        predicted_label = label_classes[np.argmax(prediction)]
 
-            features = np.array(data).reshape(1, -1)
+        print("✅ Prediction:", predicted_label)
 
-            prediction = model.predict(features)
-            predicted_label = label_classes[np.argmax(prediction)]
-
-            print("✅ Prediction:", predicted_label)
-
-            return jsonify({"predicted": predicted_label, "confirmed": True})  # <-- changed key
+        return jsonify({"predicted": predicted_label, "confirmed": True})  # <-- changed key
 
         return jsonify({"predicted": "None", "confirmed": False})  # <-- changed key
     except Exception as e:
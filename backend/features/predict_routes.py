@@ -1,36 +1,41 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 import numpy as np
 import cv2
 import tensorflow as tf
 import mediapipe as mp
 
 import os
-import json
 import datetime
 import random
 
+from utils.landmark_features import LandmarkFeatures
+from utils.storage import open_store_from_env
+from utils.temporal import SessionSmoothers
+
 predict_bp = Blueprint('predict', __name__)
 
 MODEL_PATH = "model/sign_language_model.h5"
 LABELS_PATH = "model/label_classes.npy"
 model = tf.keras.models.load_model(MODEL_PATH)
 labels = np.load(LABELS_PATH, allow_pickle=True)
+features = LandmarkFeatures.for_model(model, "model")
 
 AVAILABLE_LETTERS = ['A', 'B', 'C']
-DAILY_FILE = "backend/data/daily_letters.json"
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+store = open_store_from_env(BASE_DIR)
 
 cap = cv2.VideoCapture(0)
 mp_hands = mp.solutions.hands
 hands = mp_hands.Hands(min_detection_confidence=0.5,
                        min_tracking_confidence=0.5)
 
-last_prediction = ""
-correct_start_time = None
+# per-session debounce: a letter is confirmed after being held for 5 seconds
+smoothers = SessionSmoothers(mode="vote", window=5, threshold=0.0, hold_s=5.0)
 
 
 @predict_bp.route('/predict_current', methods=['GET'])
 def predict_current():
-    global last_prediction, correct_start_time
+    session_id = request.args.get("session", "default")
 
     success, frame = cap.read()
     if not success:
@@ -39,48 +44,22 @@ def predict_current():
     img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
     results = hands.process(img_rgb)
 
-    prediction = "None"
-    if results.multi_hand_landmarks:
-        for hand_landmarks in results.multi_hand_landmarks:
-            points = []
-            for lm in hand_landmarks.landmark:
-                points.extend([lm.x, lm.y])
-            while len(points) < 42:
-                points.append(0.0)
-            pred = model.predict(np.array([points], dtype=np.float32))
-            prediction = labels[np.argmax(pred)]
-
-    if prediction == last_prediction and prediction != "None":
-        if correct_start_time is None:
-            correct_start_time = cv2.getTickCount()
-        else:
-            elapsed = (cv2.getTickCount() - correct_start_time) / cv2.getTickFrequency()
-            if elapsed >= 5:
-                return jsonify({"prediction": prediction, "confirmed": True})
-    else:
-        last_prediction = prediction
-        correct_start_time = None
+    pred = None
+    x = features.extract(results)
+    if x is not None:
+        pred = model.predict(x.reshape(1, -1))[0]
 
-    return jsonify({"prediction": prediction, "confirmed": False})
+    idx, _, _, confirmed = smoothers.update(session_id, pred)
+    prediction = str(labels[idx]) if idx is not None else "None"
+    return jsonify({"prediction": prediction, "confirmed": confirmed})
 
 
 @predict_bp.route('/get_daily_letters', methods=['GET'])
 def get_daily_letters():
-    if not os.path.exists(DAILY_FILE):
-        with open(DAILY_FILE, "w") as f:
-            json.dump({}, f)
-
-    with open(DAILY_FILE, "r+") as f:
-        data = json.load(f)
-        today = datetime.date.today().isoformat()
-        if today not in data:
-            shuffled = AVAILABLE_LETTERS.copy()
-            random.shuffle(shuffled)
-            data[today] = shuffled
-            f.seek(0)
-            json.dump(data, f)
-            f.truncate()
-        return jsonify({"letters": data[today]})
-
-
-
+    today = datetime.date.today().isoformat()
+    letters = store.get_daily_letters(today)
+    if letters is None:
+        shuffled = AVAILABLE_LETTERS.copy()
+        random.shuffle(shuffled)
+        letters = store.set_daily_letters_if_absent(today, shuffled)
+    return jsonify({"letters": letters})
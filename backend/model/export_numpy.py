@@ -0,0 +1,268 @@
+# backend/model/export_numpy.py
+"""
+Export sign_language_model.h5 (+ scaler.pkl) into a compact .npz that
+model/numpy_engine.py can serve without TensorFlow.
+
+Usage (from backend/):
+    python model/export_numpy.py [--model PATH] [--scaler PATH] [--labels PATH] [--out PATH]
+                                 [--variants int8,float16 --eval-csv model/dataset/data.csv]
+
+--variants also writes sign_language_model.<dtype>.npz next to --out, and a
+quantization_report.json comparing each variant against the float32 export.
+
+save_bundle() / promote() are the export path shared by train_model.py and
+sweep.py: a freshly trained model is written as a complete serving bundle in
+its own directory, then copied into model/ file by file.
+"""
+import argparse
+import json
+import os
+import pickle
+import shutil
+import sys
+import time
+
+import numpy as np
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(MODEL_DIR))
+
+from model.numpy_engine import ACTIVATIONS, WEIGHT_DTYPES, NumpyDenseModel  # noqa: E402
+from utils.landmark_features import widen_index  # noqa: E402
+
+SERVE_SIZE = 126  # what app.py builds and every served model takes
+
+BUNDLE_FILES = ("sign_language_model.h5", "sign_language_model.npz", "label_classes.npy",
+                "scaler.pkl", "feature_config.json")
+# optional: quantised copies of the .npz (export_variants), served with MODEL_VARIANT
+VARIANT_FILES = tuple(f"sign_language_model.{d}.npz" for d in WEIGHT_DTYPES[1:]) + ("quantization_report.json",)
+
+
+def fold_scaler(kernel, bias, scaler):
+    """
+    Fold StandardScaler into the first Dense layer:
+        ((x - mean) / scale) @ W + b  ==  x @ (W / scale) + (b - (mean / scale) @ W)
+    """
+    mean = getattr(scaler, "mean_", None)
+    scale = getattr(scaler, "scale_", None)
+    mean = np.zeros(kernel.shape[0]) if mean is None else np.asarray(mean, dtype=np.float64)
+    scale = np.ones(kernel.shape[0]) if scale is None else np.asarray(scale, dtype=np.float64)
+
+    kernel = np.asarray(kernel, dtype=np.float64)
+    folded_kernel = kernel / scale[:, None]
+    folded_bias = np.asarray(bias, dtype=np.float64) - (mean / scale) @ kernel
+    return folded_kernel.astype(np.float32), folded_bias.astype(np.float32)
+
+
+def layers_from_keras(keras_model):
+    layers = []
+    for layer in keras_model.layers:
+        weights = layer.get_weights()
+        if not weights:
+            continue
+        activation = getattr(layer.activation, "__name__", "linear")
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Unsupported activation '{activation}' in layer {layer.name}")
+        kernel, bias = weights
+        layers.append([kernel, bias, activation])
+    return layers
+
+
+def export(model_path, labels_path, scaler_path, out_path):
+    import tensorflow as tf
+
+    keras_model = tf.keras.models.load_model(model_path)
+    layers = layers_from_keras(keras_model)
+    labels = np.load(labels_path, allow_pickle=True)
+
+    scaler_folded = False
+    if scaler_path and os.path.exists(scaler_path):
+        with open(scaler_path, "rb") as f:
+            scaler = pickle.load(f)
+        layers[0][0], layers[0][1] = fold_scaler(layers[0][0], layers[0][1], scaler)
+        scaler_folded = True
+    else:
+        print(f"⚠️ No scaler at {scaler_path}, exporting without folding")
+
+    engine = NumpyDenseModel([tuple(l) for l in layers], labels=labels, scaler_folded=scaler_folded)
+    engine.save(out_path)
+
+    # sanity check: the NumPy engine must agree with Keras on a few random inputs
+    x = np.random.default_rng(0).random((16, engine.input_size), dtype=np.float32)
+    x_keras = scaler.transform(x) if scaler_folded else x
+    expected = keras_model.predict(x_keras, verbose=0)
+    got = NumpyDenseModel.load(out_path).predict(x)
+    max_diff = float(np.max(np.abs(expected - got)))
+    print(f"✅ Exported {len(layers)} layers to {out_path} "
+          f"(input={engine.input_size}, classes={engine.num_classes}, max diff vs keras={max_diff:.2e})")
+    return engine
+
+
+def save_scaler(path, mean, scale):
+    """scaler.pkl for the keras backend; False without scikit-learn (the .npz doesn't need it)."""
+    try:
+        from sklearn.preprocessing import StandardScaler
+    except ImportError:
+        return False
+    scaler = StandardScaler()
+    scaler.mean_, scaler.scale_, scaler.var_ = mean, scale, scale ** 2
+    scaler.n_features_in_ = len(mean)
+    scaler.n_samples_seen_ = 0
+    with open(path, "wb") as f:
+        pickle.dump(scaler, f)
+    return True
+
+
+def save_bundle(out_dir, layers, mean, scale, labels, feature_config, serve_size=SERVE_SIZE):
+    """
+    Write a serving bundle for Dense `layers` trained on standardised
+    ((x - mean) / scale) rows of feature_config["size"] values: a keras .h5
+    plus scaler.pkl, and a .npz with the scaler folded in, all taking
+    `serve_size` inputs. Columns the model never saw (z for x,y data) get
+    zero weights. feature_config.json records the served size and the hand
+    order / normalisation the data really has. Returns (engine, has_scaler).
+    """
+    from tensorflow.keras import Sequential
+    from tensorflow.keras.layers import Dense, Input
+
+    os.makedirs(out_dir, exist_ok=True)
+    cols = widen_index(feature_config["size"], serve_size)
+    layers = [list(l) for l in layers]
+    kernel = np.zeros((serve_size, layers[0][0].shape[1]), dtype=np.float32)
+    kernel[cols] = layers[0][0]
+    layers[0][0] = kernel
+    serve_mean = np.zeros(serve_size)
+    serve_scale = np.ones(serve_size)
+    serve_mean[cols], serve_scale[cols] = mean, scale
+    labels = np.asarray(labels)
+
+    keras_model = Sequential([Input(shape=(serve_size,))] +
+                             [Dense(w.shape[1], activation=act) for w, _, act in layers])
+    keras_model.set_weights([a for w, b, _ in layers for a in (w, b)])
+    keras_model.save(os.path.join(out_dir, "sign_language_model.h5"))
+    has_scaler = save_scaler(os.path.join(out_dir, "scaler.pkl"), serve_mean, serve_scale)
+    stale = os.path.join(out_dir, "scaler.pkl")
+    if not has_scaler and os.path.exists(stale):
+        os.remove(stale)
+
+    class _Scaler:
+        mean_, scale_ = serve_mean, serve_scale
+
+    folded = [list(l) for l in layers]
+    folded[0][0], folded[0][1] = fold_scaler(layers[0][0], layers[0][1], _Scaler)
+    engine = NumpyDenseModel([tuple(l) for l in folded], labels=labels, scaler_folded=True)
+    engine.save(os.path.join(out_dir, "sign_language_model.npz"))
+    np.save(os.path.join(out_dir, "label_classes.npy"), labels)
+    with open(os.path.join(out_dir, "feature_config.json"), "w") as f:
+        json.dump(dict(feature_config, size=serve_size), f, indent=2)
+    return engine, has_scaler
+
+
+def promote(bundle_dir, model_dir=MODEL_DIR):
+    """Copy a bundle's files, and any quantised variants of it, over the ones served from model/."""
+    copied = []
+    for name in BUNDLE_FILES + VARIANT_FILES:
+        src = os.path.join(bundle_dir, name)
+        if os.path.exists(src):
+            tmp = os.path.join(model_dir, f".{name}.tmp")
+            shutil.copy2(src, tmp)
+            os.replace(tmp, os.path.join(model_dir, name))  # never a half-written file in model/
+            copied.append(name)
+    # belonged to the previous model: its scaler.pkl (the new .npz has its
+    # scaler folded in) and variants MODEL_VARIANT would serve with the new labels
+    for name in ("scaler.pkl",) + VARIANT_FILES:
+        stale = os.path.join(model_dir, name)
+        if name not in copied and os.path.exists(stale):
+            os.remove(stale)
+    return copied
+
+
+def variant_path(out_path, weight_dtype):
+    """model/sign_language_model.npz -> model/sign_language_model.int8.npz"""
+    root, ext = os.path.splitext(out_path)
+    return out_path if weight_dtype == "float32" else f"{root}.{weight_dtype}{ext}"
+
+
+def _bench_ms(model, x, repeats=200):
+    model.predict(x)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        model.predict(x)
+    return (time.perf_counter() - started) / repeats * 1000.0
+
+
+def export_variants(engine, out_path, variants, x_eval=None, y_eval=None, report_path=None):
+    """
+    Save quantised copies of `engine` next to `out_path` (which already holds
+    the float32 export and is not rewritten) and report size, accuracy on the
+    held-out (x_eval, y_eval) rows, argmax agreement with float32 and predict
+    latency. y_eval holds class indices.
+    """
+    rows = {}
+    float_probs = engine.predict(x_eval) if x_eval is not None else None
+    batch = x_eval[:32] if x_eval is not None else np.zeros((32, engine.input_size), np.float32)
+    candidates = [("float32", engine)] + [(v, engine.quantized(v)) for v in variants if v != "float32"]
+    for weight_dtype, model in candidates:
+        path = variant_path(out_path, weight_dtype)
+        if weight_dtype != "float32":
+            model.save(path)
+        loaded = NumpyDenseModel.load(path)
+        row = {"path": os.path.basename(path), "bytes": os.path.getsize(path),
+               "weight_bytes_in_memory": loaded.weight_bytes(),
+               "predict_ms_batch32": round(_bench_ms(loaded, batch), 4)}
+        if x_eval is not None:
+            probs = loaded.predict(x_eval)
+            row["accuracy"] = float(np.mean(probs.argmax(axis=1) == y_eval)) if y_eval is not None else None
+            row["agreement_with_float32"] = float(np.mean(probs.argmax(axis=1) == float_probs.argmax(axis=1)))
+            row["max_prob_diff"] = float(np.max(np.abs(probs - float_probs)))
+        rows[weight_dtype] = row
+        print(f"  {weight_dtype:<8} {row['bytes']:>8} B  " +
+              (f"acc={row['accuracy']:.4f} agree={row['agreement_with_float32']:.4f}  " if x_eval is not None else "") +
+              f"{row['predict_ms_batch32']:.3f} ms/batch32")
+
+    report = {
+        "eval_rows": 0 if x_eval is None else int(len(x_eval)),
+        # kernels stay in their stored dtype, so a variant also saves memory;
+        # compute is float32 either way (NumPy has no int8 GEMM)
+        "runtime": "kernels kept in the stored dtype; float32 products, int8 scaled per column after",
+        "variants": rows,
+    }
+    if report_path:
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+def load_eval_csv(path, labels, input_size):
+    """Rows of a data.csv-style file as (x, class indices), widened from xy to xyz if needed."""
+    import csv
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        next(reader)
+        data = [row for row in reader if row]
+    index = {str(label): i for i, label in enumerate(labels)}
+    data = [row for row in data if row[0] in index]
+    x = np.asarray([[float(v) for v in row[1:]] for row in data], dtype=np.float32)
+    if x.shape[1] * 3 == input_size * 2:
+        xy = x.reshape(len(x), -1, 2)
+        x = np.concatenate([xy, np.zeros(xy.shape[:2] + (1,), np.float32)], axis=2).reshape(len(x), -1)
+    return x, np.asarray([index[row[0]] for row in data])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=os.path.join(MODEL_DIR, "sign_language_model.h5"))
+    parser.add_argument("--labels", default=os.path.join(MODEL_DIR, "label_classes.npy"))
+    parser.add_argument("--scaler", default=os.path.join(MODEL_DIR, "scaler.pkl"))
+    parser.add_argument("--out", default=os.path.join(MODEL_DIR, "sign_language_model.npz"))
+    parser.add_argument("--variants", default="", help=f"comma-separated, from {WEIGHT_DTYPES[1:]}")
+    parser.add_argument("--eval-csv", help="labelled rows to evaluate the variants on")
+    args = parser.parse_args()
+    engine = export(args.model, args.labels, args.scaler, args.out)  # variants read the float32 file at args.out
+    variants = [v for v in args.variants.split(",") if v]
+    if variants:
+        x_eval = y_eval = None
+        if args.eval_csv:
+            x_eval, y_eval = load_eval_csv(args.eval_csv, engine.labels, engine.input_size)
+        export_variants(engine, args.out, variants, x_eval, y_eval,
+                        report_path=os.path.join(os.path.dirname(args.out), "quantization_report.json"))
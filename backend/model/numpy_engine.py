@@ -0,0 +1,150 @@
+# backend/model/numpy_engine.py
+import numpy as np
+
+NUMPY_MODEL_FORMAT = 1
+
+
+def _relu(x):
+    return np.maximum(x, 0.0, out=x)
+
+
+def _softmax(x):
+    x -= x.max(axis=1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=1, keepdims=True)
+    return x
+
+
+def _linear(x):
+    return x
+
+
+ACTIVATIONS = {
+    "relu": _relu,
+    "softmax": _softmax,
+    "linear": _linear,
+}
+
+# How kernels are stored, in the .npz and in memory. float16 kernels are
+# widened for each product; int8 kernels are multiplied as int8 values and
+# the per-output-column scale is applied to the product, since
+# x @ (q * scale) == (x @ q) * scale.
+WEIGHT_DTYPES = ("float32", "float16", "int8")
+
+
+def quantize_int8(w):
+    """Symmetric per-output-column int8: w ~= q * scale."""
+    scale = np.abs(w).max(axis=0) / 127.0
+    scale[scale == 0] = 1.0
+    q = np.clip(np.rint(w / scale), -127, 127).astype(np.int8)
+    return q, scale.astype(np.float32)
+
+
+class NumpyDenseModel:
+    """
+    Pure-NumPy forward pass for the Dense(128)-Dense(64)-softmax classifier.
+
+    The weights come from model/export_numpy.py. When the export folded the
+    StandardScaler into the first layer, predict() takes raw landmark vectors
+    and no separate scaler.transform() is needed.
+    """
+
+    def __init__(self, layers, labels=None, scaler_folded=False, weight_dtype="float32"):
+        # layers: list of (kernel, bias, activation_name[, int8 column scales]);
+        # float kernels are converted to weight_dtype, int8 ones with scales kept as they are
+        if weight_dtype not in WEIGHT_DTYPES:
+            raise ValueError(f"Unknown weight dtype {weight_dtype!r}; expected one of {WEIGHT_DTYPES}")
+        self.weight_dtype = weight_dtype
+        self.layers = [self._layer(*layer) for layer in layers]
+        self.labels = labels
+        self.scaler_folded = bool(scaler_folded)
+        self.input_size = self.layers[0][0].shape[0]
+        self.num_classes = self.layers[-1][0].shape[1]
+
+    def _layer(self, w, b, act, scale=None):
+        if self.weight_dtype == "int8" and scale is None:
+            w, scale = quantize_int8(np.asarray(w, dtype=np.float32))
+        w = np.ascontiguousarray(w, dtype=self.weight_dtype)
+        if scale is not None:
+            scale = np.ascontiguousarray(scale, dtype=np.float32)
+        return w, np.ascontiguousarray(b, dtype=np.float32), ACTIVATIONS[act], act, scale
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            activations = [str(a) for a in data["activations"]]
+            weight_dtype = str(data["weight_dtype"]) if "weight_dtype" in data.files else "float32"
+            layers = [(data[f"W{i}"], data[f"b{i}"], act, data[f"Ws{i}"] if weight_dtype == "int8" else None)
+                      for i, act in enumerate(activations)]
+            labels = data["labels"] if "labels" in data.files else None
+            scaler_folded = bool(data["scaler_folded"]) if "scaler_folded" in data.files else False
+        return cls(layers, labels=labels, scaler_folded=scaler_folded, weight_dtype=weight_dtype)
+
+    def kernels(self):
+        """The kernels as float32, whatever they are stored as."""
+        return [w.astype(np.float32) * scale if scale is not None else w.astype(np.float32)
+                for w, _, _, _, scale in self.layers]
+
+    def quantized(self, weight_dtype):
+        """Copy storing its kernels as `weight_dtype`."""
+        layers = [(w, b, act) for w, (_, b, _, act, _) in zip(self.kernels(), self.layers)]
+        return NumpyDenseModel(layers, labels=self.labels, scaler_folded=self.scaler_folded,
+                               weight_dtype=weight_dtype)
+
+    def weight_bytes(self):
+        """Memory held by the kernels (and int8 scales)."""
+        return sum(w.nbytes + (scale.nbytes if scale is not None else 0) for w, _, _, _, scale in self.layers)
+
+    def save(self, path):
+        arrays = {
+            "format": np.array(NUMPY_MODEL_FORMAT),
+            "activations": np.array([act for _, _, _, act, _ in self.layers]),
+            "scaler_folded": np.array(self.scaler_folded),
+            "weight_dtype": np.array(self.weight_dtype),
+        }
+        for i, (w, b, _, _, scale) in enumerate(self.layers):
+            arrays[f"W{i}"] = w
+            if scale is not None:
+                arrays[f"Ws{i}"] = scale
+            arrays[f"b{i}"] = b
+        if self.labels is not None:
+            arrays["labels"] = np.asarray(self.labels).astype(str)
+        np.savez_compressed(path, **arrays)
+
+    def predict(self, x, verbose=0):
+        """Return class probabilities for an (N, input_size) batch."""
+        h = np.asarray(x, dtype=np.float32)
+        if h.ndim == 1:
+            h = h.reshape(1, -1)
+        for w, b, act, _, scale in self.layers:
+            h = h @ w  # float32 result; the narrow kernel is widened inside the product
+            if scale is not None:
+                h *= scale
+            h = act(h + b)
+        return h
+
+
+class ArrayScaler:
+    """
+    StandardScaler's transform() from plain mean / scale arrays, saved as an
+    .npz so a model bundle can carry its scaler without pickle.
+    """
+
+    def __init__(self, mean, scale):
+        self.mean_ = np.asarray(mean, dtype=np.float32)
+        self.scale_ = np.asarray(scale, dtype=np.float32)
+
+    @classmethod
+    def from_sklearn(cls, scaler):
+        return cls(scaler.mean_, scaler.scale_)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["mean"], data["scale"])
+
+    def save(self, path):
+        np.savez(path, mean=self.mean_, scale=self.scale_)
+
+    def transform(self, x):
+        return (np.asarray(x, dtype=np.float32) - self.mean_) / self.scale_
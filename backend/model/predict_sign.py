@@ -3,14 +3,17 @@ import mediapipe as mp
 import numpy as np
 import tensorflow as tf
 
+from utils.landmark_features import LandmarkFeatures
+
 # Load model once at startup
 model = tf.keras.models.load_model("model/sign_language_model.h5")
+features = LandmarkFeatures.for_model(model, "model")
 
 # Mediapipe Hands
 mp_hands = mp.solutions.hands
 hands = mp_hands.Hands(
     static_image_mode=False,
-    max_num_hands=1,
+    max_num_hands=features.max_hands,
     min_detection_confidence=0.5,
     min_tracking_confidence=0.5
 )
@@ -23,18 +26,11 @@ labels = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
 def extract_keypoints(image):
     """
     Extract hand landmarks from a frame using MediaPipe.
-    Returns a numpy array of 42 values (x,y for 21 points).
+    Returns the model's feature vector (a reused float32 buffer), or None.
     """
     image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
     results = hands.process(image_rgb)
-
-    if results.multi_hand_landmarks:
-        landmarks = []
-        for lm in results.multi_hand_landmarks[0].landmark:
-            landmarks.extend([lm.x, lm.y])
-        return np.array(landmarks)
-    else:
-        return None
+    return features.extract(results)
 
 
 def predict_sign(frame):
@@ -45,7 +41,7 @@ def predict_sign(frame):
     if keypoints is None:
         return None
 
-    # Reshape for model: (1, 42)
+    # Reshape for model: (1, features.size)
     keypoints = keypoints.reshape(1, -1)
 
     # Predict
@@ -0,0 +1,243 @@
+# backend/model/registry.py
+"""
+Versioned model registry.
+
+    model/registry/
+        ACTIVE                      name of the version being served
+        20261018-142501-3f2a9c/
+            manifest.json           files, format, input size, labels, checksums
+            sign_language_model.npz (or .h5)
+            label_classes.npy       plain string array
+            scaler.npz              optional mean / scale (not needed when folded into the .npz)
+            feature_config.json     optional (see utils/landmark_features.py)
+
+Versions are never modified after publishing; switching models means
+rewriting ACTIVE, which is atomic (os.replace). Serving workers watch it and
+swap bundles without restarting.
+
+A version holds no pickles: publish() converts labels to a string array and
+a scaler.pkl to scaler.npz, so a server loads them with allow_pickle=False.
+Only names listed by versions() can be activated or loaded.
+
+Usage (from backend/):
+    python model/registry.py publish --model model/sign_language_model.npz [--labels ...] [--scaler ...] [--activate]
+    python model/registry.py list
+    python model/registry.py activate <version>
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+import numpy as np
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(MODEL_DIR))
+REGISTRY_DIR = os.environ.get("MODEL_REGISTRY_DIR", os.path.join(MODEL_DIR, "registry"))
+MANIFEST = "manifest.json"
+ACTIVE = "ACTIVE"
+
+# file name of each role inside a version, so two inputs can't collide
+LABELS_FILE = "label_classes.npy"
+SCALER_FILE = "scaler.npz"
+FEATURES_FILE = "feature_config.json"
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_atomic(path, text):
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _describe_model(path):
+    """(format, input_size, num_classes) for an .npz export or a Keras .h5."""
+    if path.endswith(".npz"):
+        from model.numpy_engine import NumpyDenseModel
+        model = NumpyDenseModel.load(path)
+        return "numpy", model.input_size, model.num_classes
+    import tensorflow as tf
+    model = tf.keras.models.load_model(path)
+    return "keras", int(model.input_shape[-1]), int(model.output_shape[-1])
+
+
+def _check_name(version):
+    if not version or os.path.basename(version) != version or version in (".", "..") or version.endswith(".partial"):
+        raise ValueError(f"Invalid version name {version!r}")
+
+
+def _load_scaler(path):
+    """ArrayScaler from a scaler.npz, or from the publisher's own scaler.pkl."""
+    from model.numpy_engine import ArrayScaler
+    if path.endswith(".npz"):
+        return ArrayScaler.load(path)
+    import pickle
+    with open(path, "rb") as f:
+        return ArrayScaler.from_sklearn(pickle.load(f))
+
+
+def publish(model_path, labels_path, scaler_path=None, feature_config_path=None,
+            registry_dir=REGISTRY_DIR, version=None, notes=None):
+    """Copy a trained bundle into a new immutable version directory; returns the version."""
+    files = {"model": model_path, "labels": labels_path,
+             "scaler": scaler_path, "features": feature_config_path}
+    files = {role: path for role, path in files.items() if path}
+    for path in files.values():
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+
+    if version is None:
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        version = f"{stamp}-{sha256_file(model_path)[:6]}"
+    _check_name(version)
+    target = os.path.join(registry_dir, version)
+    if os.path.exists(target):
+        raise FileExistsError(f"Version {version} already exists")
+
+    fmt, input_size, num_classes = _describe_model(model_path)
+    # the publisher's own files may be pickled (legacy object-array labels)
+    labels = [str(label) for label in np.load(labels_path, allow_pickle=True)]
+    if len(labels) != num_classes:
+        raise ValueError(f"{len(labels)} labels for a model with {num_classes} outputs")
+
+    # stage in a temp dir and rename, so a half-copied version is never visible
+    staging = f"{target}.partial"
+    os.makedirs(staging)
+    try:
+        names = {"model": "sign_language_model" + os.path.splitext(model_path)[1], "labels": LABELS_FILE}
+        shutil.copy2(model_path, os.path.join(staging, names["model"]))
+        np.save(os.path.join(staging, LABELS_FILE), np.array(labels, dtype=str))
+        if "scaler" in files:
+            names["scaler"] = SCALER_FILE
+            _load_scaler(files["scaler"]).save(os.path.join(staging, SCALER_FILE))
+        if "features" in files:
+            names["features"] = FEATURES_FILE
+            shutil.copy2(files["features"], os.path.join(staging, FEATURES_FILE))
+        manifest = {
+            "version": version,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "format": fmt,
+            "files": names,
+            # keyed by path relative to the version directory
+            "sha256": {name: sha256_file(os.path.join(staging, name)) for name in names.values()},
+            "input_size": input_size,
+            "num_classes": num_classes,
+            "labels": labels,
+            "notes": notes,
+        }
+        with open(os.path.join(staging, MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(staging, target)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return version
+
+
+def read_manifest(version_dir):
+    with open(os.path.join(version_dir, MANIFEST)) as f:
+        return json.load(f)
+
+
+def verify(version_dir, manifest=None):
+    """
+    Raise ValueError unless every file the manifest lists is inside the
+    version directory, has a checksum, and still matches it.
+    """
+    manifest = manifest or read_manifest(version_dir)
+    root = os.path.realpath(version_dir)
+    for name in manifest["files"].values():
+        path = os.path.realpath(os.path.join(root, name))
+        if os.path.isabs(name) or os.path.commonpath([root, path]) != root:
+            raise ValueError(f"{manifest['version']}: {name} is outside the version directory")
+        expected = manifest["sha256"].get(name)
+        if expected is None:
+            raise ValueError(f"{manifest['version']}: no checksum for {name}")
+        if sha256_file(path) != expected:
+            raise ValueError(f"Checksum mismatch for {manifest['version']}/{name}")
+    return manifest
+
+
+def version_dir(version, registry_dir=REGISTRY_DIR):
+    """Directory of a published version; FileNotFoundError for any other name."""
+    if version not in versions(registry_dir):
+        raise FileNotFoundError(f"No published version {version}")
+    return os.path.join(registry_dir, version)
+
+
+def active_version(registry_dir=REGISTRY_DIR):
+    try:
+        with open(os.path.join(registry_dir, ACTIVE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def set_active(version, registry_dir=REGISTRY_DIR):
+    version_dir(version, registry_dir)
+    _write_atomic(os.path.join(registry_dir, ACTIVE), version + "\n")
+
+
+def versions(registry_dir=REGISTRY_DIR):
+    if not os.path.isdir(registry_dir):
+        return []
+    return sorted(name for name in os.listdir(registry_dir)
+                  if not name.endswith(".partial") and os.path.exists(os.path.join(registry_dir, name, MANIFEST)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish and activate model versions")
+    parser.add_argument("--registry", default=REGISTRY_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    pub = sub.add_parser("publish")
+    pub.add_argument("--model", default=os.path.join(MODEL_DIR, "sign_language_model.npz"))
+    pub.add_argument("--labels", default=os.path.join(MODEL_DIR, "label_classes.npy"))
+    pub.add_argument("--scaler", help="scaler.pkl or scaler.npz (omit when folded into the .npz)")
+    pub.add_argument("--features", help="feature_config.json (default: the one next to --model, if any)")
+    pub.add_argument("--version")
+    pub.add_argument("--notes")
+    pub.add_argument("--activate", action="store_true")
+
+    sub.add_parser("list")
+    act = sub.add_parser("activate")
+    act.add_argument("version")
+    args = parser.parse_args()
+
+    if args.command == "publish":
+        features = args.features
+        if features is None:
+            candidate = os.path.join(os.path.dirname(args.model), "feature_config.json")
+            features = candidate if os.path.exists(candidate) else None
+        version = publish(args.model, args.labels, args.scaler, features,
+                          registry_dir=args.registry, version=args.version, notes=args.notes)
+        print(f"Published {version}")
+        if args.activate:
+            set_active(version, args.registry)
+            print(f"Activated {version}")
+    elif args.command == "list":
+        current = active_version(args.registry)
+        for version in versions(args.registry):
+            m = read_manifest(os.path.join(args.registry, version))
+            mark = "*" if version == current else " "
+            print(f"{mark} {version}  {m['format']:<6} in={m['input_size']} labels={','.join(m['labels'])}")
+    elif args.command == "activate":
+        set_active(args.version, args.registry)
+        print(f"Activated {args.version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+# backend/model/sequence_engine.py
+import json
+
+import numpy as np
+
+from model.numpy_engine import ACTIVATIONS
+
+SEQUENCE_MODEL_FORMAT = 1
+
+
+class CausalConvModel:
+    """
+    Pure-NumPy causal (dilated) Conv1D stack + softmax head for dynamic signs,
+    exported from the Keras model trained by train_model.py (TRAIN_MODE=sequence).
+
+    The output for frame t only depends on the last `receptive_field` frames,
+    so a stream() can be updated one frame at a time: each layer keeps a ring
+    of the few inputs its kernel still needs, and a new frame costs one
+    kernel-sized product per layer instead of re-running the whole window.
+    """
+
+    def __init__(self, convs, head, labels=None, window=None, features=None):
+        # convs: list of (kernel (k, in, out), bias, dilation, activation_name)
+        self.convs = [(np.ascontiguousarray(k, dtype=np.float32), np.ascontiguousarray(b, dtype=np.float32),
+                       int(d), ACTIVATIONS[act], act) for k, b, d, act in convs]
+        w, b, act = head
+        self.head = (np.ascontiguousarray(w, dtype=np.float32), np.ascontiguousarray(b, dtype=np.float32),
+                     ACTIVATIONS[act], act)
+        self.labels = labels
+        self.features = features or {}  # feature_config the model was trained with
+        self.input_size = self.convs[0][0].shape[1]
+        self.num_classes = self.head[0].shape[1]
+        self.receptive_field = 1 + sum((k.shape[0] - 1) * d for k, _, d, _, _ in self.convs)
+        self.window = int(window or self.receptive_field)
+
+    @classmethod
+    def from_keras(cls, keras_model, labels=None, window=None, features=None):
+        """Conv1D(padding="causal") layers, then a final Dense; shape-only layers are skipped."""
+        convs, dense = [], []
+        for layer in keras_model.layers:
+            weights = layer.get_weights()
+            if not weights:
+                continue
+            activation = getattr(layer.activation, "__name__", "linear")
+            if hasattr(layer, "dilation_rate"):
+                if getattr(layer, "padding", "causal") != "causal":
+                    raise ValueError(f"Layer {layer.name} is not causal; it can't be streamed")
+                convs.append((weights[0], weights[1], layer.dilation_rate[0], activation))
+            else:
+                dense.append((weights[0], weights[1], activation))
+        if not convs or len(dense) != 1:
+            raise ValueError("Expected Conv1D layers followed by one Dense head")
+        return cls(convs, dense[0], labels=labels, window=window, features=features)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            activations = [str(a) for a in data["activations"]]
+            convs = [(data[f"K{i}"], data[f"b{i}"], int(data["dilations"][i]), act)
+                     for i, act in enumerate(activations)]
+            head = (data["head_W"], data["head_b"], str(data["head_activation"]))
+            labels = data["labels"] if "labels" in data.files else None
+            window = int(data["window"])
+            features = json.loads(str(data["feature_config"])) if "feature_config" in data.files else None
+        return cls(convs, head, labels=labels, window=window, features=features)
+
+    def save(self, path):
+        arrays = {
+            "format": np.array(SEQUENCE_MODEL_FORMAT),
+            "activations": np.array([act for _, _, _, _, act in self.convs]),
+            "dilations": np.array([d for _, _, d, _, _ in self.convs]),
+            "head_W": self.head[0],
+            "head_b": self.head[1],
+            "head_activation": np.array(self.head[3]),
+            "window": np.array(self.window),
+        }
+        for i, (k, b, _, _, _) in enumerate(self.convs):
+            arrays[f"K{i}"] = k
+            arrays[f"b{i}"] = b
+        if self.labels is not None:
+            arrays["labels"] = np.asarray(self.labels).astype(str)
+        if self.features:
+            arrays["feature_config"] = np.array(json.dumps(self.features))
+        np.savez_compressed(path, **arrays)
+
+    def widened(self, cols, size):
+        """Copy taking `size`-wide frames, reading this model's inputs from columns `cols`."""
+        convs = []
+        for i, (k, b, d, _, act) in enumerate(self.convs):
+            if i == 0:
+                wide = np.zeros((k.shape[0], size, k.shape[2]), dtype=np.float32)
+                wide[:, cols] = k  # other inputs get zero weights
+                k = wide
+            convs.append((k, b, d, act))
+        return CausalConvModel(convs, (self.head[0], self.head[1], self.head[3]),
+                               labels=self.labels, window=self.window,
+                               features=dict(self.features, size=size) if self.features else None)
+
+    def predict(self, windows):
+        """Class probabilities for the last frame of each (N, T, input_size) window."""
+        h = np.asarray(windows, dtype=np.float32)
+        if h.ndim == 2:
+            h = h[None]
+        for k, b, d, act, _ in self.convs:
+            span = (k.shape[0] - 1) * d
+            padded = np.concatenate([np.zeros((h.shape[0], span, h.shape[2]), np.float32), h], axis=1)
+            out = np.empty((h.shape[0], h.shape[1], k.shape[2]), dtype=np.float32)
+            out[:] = b
+            for j in range(k.shape[0]):
+                out += padded[:, j * d:j * d + h.shape[1]] @ k[j]
+            h = act(out)
+        w, b, act, _ = self.head
+        return act(h[:, -1] @ w + b)
+
+    def stream(self):
+        return CausalConvStream(self)
+
+
+class CausalConvStream:
+    """Incremental state of one CausalConvModel over one frame sequence."""
+
+    def __init__(self, model):
+        self.model = model
+        self._rings = []
+        for k, _, d, _, _ in model.convs:
+            span = (k.shape[0] - 1) * d + 1
+            # taps: ring offsets (back from the newest input) for kernel positions 0..k-1
+            taps = np.arange(k.shape[0] - 1, -1, -1) * d
+            self._rings.append((np.zeros((span, k.shape[1]), dtype=np.float32), taps,
+                                k.reshape(-1, k.shape[2])))  # (k*in, out), matches rows.ravel()
+        self.frames = 0
+
+    @property
+    def ready(self):
+        """True once a whole receptive field of real frames has been seen."""
+        return self.frames >= self.model.receptive_field
+
+    def reset(self):
+        for ring, _, _ in self._rings:
+            ring[:] = 0.0
+        self.frames = 0
+
+    def step(self, x):
+        """Push one frame; returns the class probabilities for it (1-D)."""
+        h = np.asarray(x, dtype=np.float32).ravel()
+        for (ring, taps, flat), (_, b, _, act, _) in zip(self._rings, self.model.convs):
+            span = len(ring)
+            slot = self.frames % span
+            ring[slot] = h
+            rows = ring[(slot - taps) % span]  # (k, in): the inputs kernel positions 0..k-1 see
+            h = act((rows.ravel() @ flat + b)[None])[0]
+        self.frames += 1
+        w, b, act, _ = self.model.head
+        return act((h @ w + b)[None])[0]
@@ -0,0 +1,252 @@
+# backend/model/sweep.py
+"""
+Parallel hyperparameter sweep over the dataset store, promoting the best run.
+
+The dataset is read, split (train / validation / test, stratified),
+normalised and standardised once, then cached as .npy files in the
+sweep directory. Worker processes memory-map those files, so every run
+trains on the same page-cache copy, not a pickled copy per worker. Each
+run trains with early stopping on the validation split and is exported
+like a serving bundle:
+
+    model/sweeps/<id>/
+        data_x.npy data_y.npy scaler.npz     cached, encoded dataset
+        results.json                         every run, best first
+        run-00/  sign_language_model.h5 sign_language_model.npz label_classes.npy
+                 scaler.pkl (if scikit-learn is installed) feature_config.json
+
+Runs are ranked by validation accuracy, with latency per prediction
+breaking ties. The test split is only reported. Only the winning bundle
+is copied into model/ (and optionally published to model/registry).
+
+Models are exported at the serving input size (126). Datasets recorded as
+x,y (84 values) are widened with zero weights for z, so the served model
+ignores z exactly as in training.
+
+Usage (from backend/):
+    python model/sweep.py [--grid grid.json] [--workers 4] [--max-epochs 200] [--patience 10]
+                          [--no-promote] [--publish [--activate]]
+"""
+import argparse
+import datetime
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(MODEL_DIR))
+
+from model.export_numpy import SERVE_SIZE, layers_from_keras, promote, save_bundle  # noqa: E402
+from utils.dataset_store import DEFAULT_STORE, DatasetStore  # noqa: E402
+from utils.landmark_features import LandmarkFeatures, normalize_rows, widen_index  # noqa: E402
+
+SWEEPS_DIR = os.path.join(MODEL_DIR, "sweeps")
+
+# every combination is one run
+DEFAULT_GRID = {
+    "hidden": [[128, 64], [256, 128], [64, 32], [128]],
+    "dropout": [0.0, 0.2],
+    "learning_rate": [0.001],
+    "batch_size": [32],
+}
+
+
+def expand_grid(grid):
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+# ---- dataset cache (parent) ----
+def encode_dataset(store_dir, sweep_dir, val_size=0.1, test_size=0.2, seed=42):
+    """Split, normalise and standardise once; write the arrays every worker maps."""
+    store = DatasetStore(store_dir)
+    features = LandmarkFeatures(store.feature_size, hand_order=store.hand_order)
+    train_ids, test_ids = store.split(test_size, seed)
+    fit_ids, val_ids = store.split(val_size, seed, ids=train_ids)
+
+    parts = [store.take(ids) for ids in (fit_ids, val_ids, test_ids)]
+    x = np.concatenate([p[0] for p in parts])
+    y = np.concatenate([p[1] for p in parts]).astype(np.int64)
+    if features.normalize:
+        normalize_rows(x)
+    n_fit, n_val = len(fit_ids), len(val_ids)
+    mean = x[:n_fit].mean(axis=0)
+    scale = x[:n_fit].std(axis=0)
+    scale[scale == 0] = 1.0
+    x -= mean
+    x /= scale
+
+    np.save(os.path.join(sweep_dir, "data_x.npy"), x.astype(np.float32))
+    np.save(os.path.join(sweep_dir, "data_y.npy"), y)
+    np.savez(os.path.join(sweep_dir, "scaler.npz"), mean=mean, scale=scale)
+    return {
+        "labels": list(store.labels),
+        "feature_size": store.feature_size,
+        "feature_config": features.config(),
+        "bounds": [n_fit, n_fit + n_val, len(y)],
+    }
+
+
+# ---- one run (worker) ----
+def _init_worker(threads):
+    # set before TensorFlow is imported, so runs share the cores instead of fighting over them
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["TF_NUM_INTRAOP_THREADS"] = str(threads)
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+
+
+def _latency_ms(engine, x, repeats=500):
+    """Mean single-row predict time, which is what a live frame costs."""
+    row = x[:1]
+    engine.predict(row)
+    started = time.perf_counter()
+    for i in range(repeats):
+        engine.predict(x[i % len(x):i % len(x) + 1])
+    return (time.perf_counter() - started) / repeats * 1000.0
+
+
+def train_run(run_dir, sweep_dir, info, config, max_epochs, patience, seed):
+    import tensorflow as tf
+    from tensorflow.keras import Sequential
+    from tensorflow.keras.callbacks import EarlyStopping
+    from tensorflow.keras.layers import Dense, Dropout, Input
+
+    os.makedirs(run_dir, exist_ok=True)
+    tf.keras.utils.set_random_seed(seed)
+    x = np.load(os.path.join(sweep_dir, "data_x.npy"), mmap_mode="r")
+    y = np.load(os.path.join(sweep_dir, "data_y.npy"), mmap_mode="r")
+    n_fit, n_val, n_all = info["bounds"]
+    num_classes = len(info["labels"])
+
+    model = Sequential([Input(shape=(info["feature_size"],))])
+    for units in config["hidden"]:
+        model.add(Dense(units, activation="relu"))
+        if config["dropout"]:
+            model.add(Dropout(config["dropout"]))
+    model.add(Dense(num_classes, activation="softmax"))
+    model.compile(optimizer=tf.keras.optimizers.Adam(config["learning_rate"]),
+                  loss="sparse_categorical_crossentropy", metrics=["accuracy"])
+
+    started = time.perf_counter()
+    history = model.fit(x[:n_fit], y[:n_fit], validation_data=(x[n_fit:n_val], y[n_fit:n_val]),
+                        epochs=max_epochs, batch_size=config["batch_size"], verbose=0,
+                        callbacks=[EarlyStopping(monitor="val_loss", patience=patience,
+                                                 restore_best_weights=True)])
+    train_s = time.perf_counter() - started
+    _, val_acc = model.evaluate(x[n_fit:n_val], y[n_fit:n_val], verbose=0)
+    _, test_acc = model.evaluate(x[n_val:n_all], y[n_val:n_all], verbose=0)
+
+    # ---- export at the serving size ----
+    with np.load(os.path.join(sweep_dir, "scaler.npz")) as s:
+        mean, scale = s["mean"], s["scale"]
+    engine, has_scaler = save_bundle(run_dir, layers_from_keras(model), mean, scale,
+                                     info["labels"], info["feature_config"])
+    npz_path = os.path.join(run_dir, "sign_language_model.npz")
+    cols = widen_index(info["feature_size"], SERVE_SIZE)
+
+    # raw (unscaled) test rows at the serving width, as the server would pass them
+    raw_test = np.zeros((min(n_all - n_val, 256), SERVE_SIZE), dtype=np.float32)
+    raw_test[:, cols] = x[n_val:n_val + len(raw_test)] * scale + mean
+    return {
+        "run": os.path.basename(run_dir),
+        "config": config,
+        "val_accuracy": float(val_acc),
+        "test_accuracy": float(test_acc),
+        "epochs": len(history.history["loss"]),
+        "train_s": round(train_s, 2),
+        "latency_ms": round(_latency_ms(engine, raw_test), 4) if len(raw_test) else None,
+        "params": int(model.count_params()),
+        "model_bytes": os.path.getsize(npz_path),
+        "scaler_pkl": has_scaler,
+    }
+
+
+# ---- driver ----
+def main():
+    parser = argparse.ArgumentParser(description="Parallel hyperparameter sweep")
+    parser.add_argument("--store", default=DEFAULT_STORE)
+    parser.add_argument("--grid", help="JSON file: {param: [values]}; default covers layer sizes and dropout")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--max-epochs", type=int, default=200)
+    parser.add_argument("--patience", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-promote", action="store_true")
+    parser.add_argument("--publish", action="store_true", help="also publish the winner to model/registry")
+    parser.add_argument("--activate", action="store_true", help="with --publish: serve it right away")
+    args = parser.parse_args()
+    if args.activate and not args.publish:
+        parser.error("--activate needs --publish (only a published version can be activated)")
+
+    grid = dict(DEFAULT_GRID)
+    if args.grid:
+        with open(args.grid) as f:
+            grid.update(json.load(f))
+    configs = expand_grid(grid)
+
+    sweep_id = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    sweep_dir = os.path.join(SWEEPS_DIR, sweep_id)
+    os.makedirs(sweep_dir)
+    started = time.perf_counter()
+    info = encode_dataset(args.store, sweep_dir, seed=args.seed)
+    print(f"[sweep] {sweep_id}: {len(configs)} runs, {info['bounds'][2]} rows "
+          f"(fit/val/test {info['bounds'][0]}/{info['bounds'][1] - info['bounds'][0]}/"
+          f"{info['bounds'][2] - info['bounds'][1]}), encoded in {time.perf_counter() - started:.1f}s")
+
+    cpus = os.cpu_count() or 2
+    workers = min(args.workers or cpus, len(configs))
+    threads = max(1, cpus // workers)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(threads,)) as pool:
+        futures = {
+            pool.submit(train_run, os.path.join(sweep_dir, f"run-{i:02d}"), sweep_dir, info, config,
+                        args.max_epochs, args.patience, args.seed): config
+            for i, config in enumerate(configs)
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"❌ {futures[future]}: {e}")
+                continue
+            results.append(result)
+            print(f"  {result['run']} {result['config']}: val={result['val_accuracy']:.4f} "
+                  f"test={result['test_accuracy']:.4f} epochs={result['epochs']} "
+                  f"{result['latency_ms']} ms/pred {result['model_bytes']} B")
+
+    results.sort(key=lambda r: (-r["val_accuracy"], r["latency_ms"] or 0.0))
+    with open(os.path.join(sweep_dir, "results.json"), "w") as f:
+        json.dump({"sweep": sweep_id, "grid": grid, "data": info, "runs": results}, f, indent=2)
+    if not results:
+        print("❌ Every run failed")
+        return 1
+
+    best = results[0]
+    best_dir = os.path.join(sweep_dir, best["run"])
+    print(f"\n✅ Best: {best['run']} {best['config']} val={best['val_accuracy']:.4f} "
+          f"test={best['test_accuracy']:.4f} ({time.perf_counter() - started:.0f}s total)")
+    if not args.no_promote:
+        copied = promote(best_dir)
+        print(f"   Promoted to {MODEL_DIR}: {', '.join(copied)}")
+    if args.publish:
+        from model import registry
+        version = registry.publish(os.path.join(best_dir, "sign_language_model.npz"),
+                                   os.path.join(best_dir, "label_classes.npy"),
+                                   feature_config_path=os.path.join(best_dir, "feature_config.json"),
+                                   notes=f"sweep {sweep_id} {best['run']} {json.dumps(best['config'])}")
+        print(f"   Published {version}")
+        if args.activate:
+            registry.set_active(version)
+            print(f"   Activated {version}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,43 +1,184 @@
-import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import Dense
 from tensorflow.keras.utils import to_categorical
 import os
+import sys
+import time
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(MODEL_DIR))
+
+from utils.dataset_store import DEFAULT_CSV, DEFAULT_STORE, DatasetStore, convert_csv  # noqa: E402
+from utils.landmark_features import LandmarkFeatures, normalize_rows  # noqa: E402
+
+# QUANTIZE=int8,float16 also writes NumPy-engine variants of the model and a
+# quantization_report.json comparing them with float32 on the held-out split,
+# into the candidate bundle in TRAIN_OUT; promotion copies them into model/
+# with the rest of the bundle, where app.py's MODEL_VARIANT picks one
+QUANTIZE = [v for v in os.environ.get("QUANTIZE", "").split(",") if v]
+
+# TRAIN_MODE=sequence trains the dynamic-sign model instead: a causal Conv1D
+# over SEQUENCE_WINDOW-frame windows cut from recorded clips (videos run
+# through utils/extract_dataset.py), saved as model/sequence_model.npz
+TRAIN_MODE = os.environ.get("TRAIN_MODE", "static")
+SEQUENCE_WINDOW = int(os.environ.get("SEQUENCE_WINDOW", 24))
+SEQUENCE_STRIDE = int(os.environ.get("SEQUENCE_STRIDE", 2))
+
+# The static model is exported as a complete serving bundle (see
+# export_numpy.save_bundle) into TRAIN_OUT, then copied into model/ unless
+# TRAIN_PROMOTE=0
+TRAIN_OUT = os.environ.get("TRAIN_OUT") or os.path.join(
+    MODEL_DIR, "candidates", time.strftime("train-%Y%m%d-%H%M%S"))
+TRAIN_PROMOTE = os.environ.get("TRAIN_PROMOTE", "1") != "0"
 
 # ===============================
 # Load dataset
 # ===============================
-DATASET_PATH = "backend/model/dataset/data.csv"
+# Sharded float32 store (utils/dataset_store.py); a legacy data.csv is
+# imported once on first use. Rows are streamed from memory-mapped shards,
+# so only the held-out split is ever held in RAM.
+STORE_PATH = os.environ.get("DATASET_STORE", DEFAULT_STORE)
+BATCH_SIZE = 16
+
+if not os.path.exists(os.path.join(STORE_PATH, "meta.json")):
+    if not os.path.exists(DEFAULT_CSV):
+        raise FileNotFoundError("❌ Dataset not found. Please collect data first.")
+    print(f"[INFO] Importing {DEFAULT_CSV} into {STORE_PATH} (one-off)...")
+    convert_csv(DEFAULT_CSV, STORE_PATH)
+
+store = DatasetStore(STORE_PATH)
+print(f"[INFO] {len(store)} samples, {len(store.labels)} labels: {store.label_counts()}")
+
+# The hand order is whatever the store was recorded in; normalisation follows
+# FEATURE_NORMALIZE. Both go into the exported feature_config.json so the
+# server builds identical vectors.
+features = LandmarkFeatures(store.feature_size, hand_order=store.hand_order)
+normalize = normalize_rows if features.normalize else None
+num_classes = len(store.labels)
+print(f"[INFO] {store.feature_size} features per row, hands in {store.hand_order} order")
+
+
+# ===============================
+# Sequence model (TRAIN_MODE=sequence)
+# ===============================
+def train_sequence_model():
+    from tensorflow.keras.layers import Conv1D, Cropping1D, Flatten, Input
+
+    from model.sequence_engine import CausalConvModel
+    from utils.landmark_features import widen_index
+
+    windows, window_labels, runs = store.sequence_windows(SEQUENCE_WINDOW, SEQUENCE_STRIDE)
+    if not len(windows):
+        raise ValueError("❌ No clips in the dataset. Extract some videos with utils/extract_dataset.py first.")
+
+    # split by clip, not by window: overlapping windows of one clip would leak into the test set
+    rng = np.random.default_rng(42)
+    run_ids, first = np.unique(runs, return_index=True)
+    run_labels = window_labels[first]
+    test_runs = []
+    for k in np.unique(run_labels):
+        ids = run_ids[run_labels == k]
+        rng.shuffle(ids)
+        test_runs.extend(ids[:int(round(len(ids) * 0.2))])
+    is_test = np.isin(runs, test_runs)
+    train_w, test_w = windows[~is_test], windows[is_test]
+    train_y, test_y = window_labels[~is_test], window_labels[is_test]
+    print(f"[INFO] {len(windows)} windows of {SEQUENCE_WINDOW} frames from {len(run_ids)} clips "
+          f"({len(train_w)} train / {len(test_w)} test)")
+
+    X_seq_test = store.take_windows(test_w)
+    if normalize:
+        X_seq_test = normalize(X_seq_test)
+    y_seq_test = to_categorical(test_y, num_classes)
+
+    def sequence_batches():
+        while True:
+            order = rng.permutation(len(train_w))
+            for start in range(0, len(order), BATCH_SIZE):
+                batch = order[start:start + BATCH_SIZE]
+                x = store.take_windows(train_w[batch])
+                yield (normalize(x) if normalize else x), to_categorical(train_y[batch], num_classes)
+
+    # dilations 1, 2, 4 with kernel 3: each output sees the last 15 frames
+    model = Sequential([Input(shape=(SEQUENCE_WINDOW, store.feature_size))])
+    for dilation in (1, 2, 4):
+        model.add(Conv1D(64, 3, padding='causal', dilation_rate=dilation, activation='relu'))
+    model.add(Cropping1D((SEQUENCE_WINDOW - 1, 0)))  # the last frame is what serving predicts
+    model.add(Flatten())
+    model.add(Dense(num_classes, activation='softmax'))
+    model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
+
+    print("\n[INFO] Training sequence model...\n")
+    model.fit(sequence_batches(), steps_per_epoch=int(np.ceil(len(train_w) / BATCH_SIZE)), epochs=50,
+              validation_data=(X_seq_test, y_seq_test) if len(test_w) else None, verbose=1)
+    if len(test_w):
+        loss, accuracy = model.evaluate(X_seq_test, y_seq_test)
+        print(f"\n✅ Sequence model trained with accuracy: {accuracy*100:.2f}%")
+
+    # streaming NumPy export at the serving width; z gets zero weights when trained on x,y
+    engine = CausalConvModel.from_keras(model, labels=np.array(store.labels), window=SEQUENCE_WINDOW,
+                                        features=features.config())
+    if len(test_w):
+        max_diff = float(np.max(np.abs(engine.predict(X_seq_test[:64]) - model.predict(X_seq_test[:64], verbose=0))))
+        print(f"   NumPy engine vs keras max diff: {max_diff:.2e} (receptive field {engine.receptive_field} frames)")
+    engine = engine.widened(widen_index(store.feature_size, 126), 126)
+    model.save(os.path.join(MODEL_DIR, "sequence_model.h5"))
+    engine.save(os.path.join(MODEL_DIR, "sequence_model.npz"))
+    print("\n✅ Sequence model saved to model/sequence_model.npz (served when present; see SEQUENCE_MODEL_PATH)")
+
+
+if TRAIN_MODE == "sequence":
+    train_sequence_model()
+    sys.exit(0)
+
+# ===============================
+# Split and standardise
+# ===============================
+# Stratified train-test split over row ids (labels are tiny; features stay on disk)
+train_ids, test_ids = store.split(test_size=0.2, seed=42)
+
 
-if not os.path.exists(DATASET_PATH):
-    raise FileNotFoundError("❌ Dataset file not found. Please collect data first.")
+def fit_scaler(ids, batch_size=4096):
+    """Per-column mean and std of the (normalised) rows, one batch at a time."""
+    total = np.zeros(store.feature_size)
+    squares = np.zeros(store.feature_size)
+    for x, _ in store.iter_batches(ids, batch_size, shuffle=False, transform=normalize):
+        x = x.astype(np.float64)
+        total += x.sum(axis=0)
+        squares += (x * x).sum(axis=0)
+    mean = total / len(ids)
+    scale = np.sqrt(np.maximum(squares / len(ids) - mean ** 2, 0.0))
+    scale[scale < 1e-8] = 1.0  # constant columns (e.g. the normalised wrist)
+    return mean, scale
 
-data = pd.read_csv(DATASET_PATH)
 
-# Separate features and labels
-X = data.drop('label', axis=1).values
-y = data['label'].values
+mean, scale = fit_scaler(train_ids)
 
-# Encode labels (A,B,C -> 0,1,2)
-label_encoder = LabelEncoder()
-y_encoded = label_encoder.fit_transform(y)
-y_categorical = to_categorical(y_encoded)
 
-# Train-test split
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y_categorical, test_size=0.2, random_state=42, stratify=y_categorical
-)
+def transform(x):
+    if normalize:
+        x = normalize(x)
+    return ((x - mean) / scale).astype(np.float32)
+
+
+X_test, y_test_idx = store.take(test_ids)
+X_test = transform(X_test)
+y_test = to_categorical(y_test_idx, num_classes)
+
+
+def train_batches():
+    """Endless one-hot batches for model.fit; reshuffled every epoch."""
+    for x, y in store.iter_batches(train_ids, BATCH_SIZE, seed=42, epochs=None, transform=transform):
+        yield x, to_categorical(y, num_classes)
 
 # ===============================
 # Build the model
 # ===============================
 model = Sequential()
-model.add(Dense(128, input_dim=X.shape[1], activation='relu'))
+model.add(Dense(128, input_dim=store.feature_size, activation='relu'))
 model.add(Dense(64, activation='relu'))
-model.add(Dense(y_categorical.shape[1], activation='softmax'))
+model.add(Dense(num_classes, activation='softmax'))
 
 model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
 
@@ -45,7 +186,9 @@ model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accur
 # Train model
 # ===============================
 print("\n[INFO] Training model...\n")
-history = model.fit(X_train, y_train, epochs=50, batch_size=16, validation_data=(X_test, y_test), verbose=1)
+steps_per_epoch = int(np.ceil(len(train_ids) / BATCH_SIZE))
+history = model.fit(train_batches(), steps_per_epoch=steps_per_epoch, epochs=50,
+                    validation_data=(X_test, y_test), verbose=1)
 
 # ===============================
 # Evaluate model
@@ -54,9 +197,30 @@ loss, accuracy = model.evaluate(X_test, y_test)
 print(f"\n✅ Model trained successfully with accuracy: {accuracy*100:.2f}%")
 
 # ===============================
-# Save model and label encoder
+# Export the serving bundle
 # ===============================
-model.save("model/sign_language_model.h5")
-np.save("model/label_classes.npy", label_encoder.classes_)
+# Widened to the 126 values app.py builds, with the scaler folded into the .npz
+from model.export_numpy import layers_from_keras, promote, save_bundle  # noqa: E402
+
+engine, _ = save_bundle(TRAIN_OUT, layers_from_keras(model), mean, scale, store.labels, features.config())
+print(f"\n✅ Serving bundle written to {TRAIN_OUT}")
+
+if QUANTIZE:
+    from model.export_numpy import SERVE_SIZE, export_variants
+    from utils.landmark_features import widen_index
+
+    # evaluated on raw held-out rows at the serving width, exactly what the
+    # folded .npz receives from app.py
+    print("\n[INFO] Exporting quantised variants (evaluated on the held-out split)...")
+    X_raw = np.zeros((len(X_test), SERVE_SIZE), dtype=np.float32)
+    X_raw[:, widen_index(store.feature_size, SERVE_SIZE)] = X_test * scale + mean
+    export_variants(engine, os.path.join(TRAIN_OUT, "sign_language_model.npz"), QUANTIZE,
+                    X_raw, y_test_idx, report_path=os.path.join(TRAIN_OUT, "quantization_report.json"))
+
+if TRAIN_PROMOTE:
+    copied = promote(TRAIN_OUT)
+    print(f"   Promoted to {MODEL_DIR}: {', '.join(copied)}")
 
-print("\n✅ Model and label classes saved successfully!")
+print("   To serve it without restarting: python model/registry.py publish "
+      f"--model {os.path.join(TRAIN_OUT, 'sign_language_model.npz')} "
+      f"--labels {os.path.join(TRAIN_OUT, 'label_classes.npy')} --activate")
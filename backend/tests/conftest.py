@@ -0,0 +1,8 @@
+# backend/tests/conftest.py
+import os
+import sys
+
+# the backend imports its modules as utils.*, model.*, features.* from backend/
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
@@ -0,0 +1,70 @@
+# backend/tests/test_batcher.py
+import threading
+
+import pytest
+
+from utils.batcher import MicroBatcher
+
+
+class Recorder:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def __call__(self, x):
+        self.batches.append(len(x))
+        if self.fail:
+            raise RuntimeError("model broke")
+        return x * 2
+
+
+def submit_together(batcher, rows):
+    """Submit every row before the worker can take the first one."""
+    with batcher._cond:
+        futures = [batcher.submit(row) for row in rows]
+    return futures
+
+
+def test_full_batch_flushes_without_waiting():
+    predict = Recorder()
+    batcher = MicroBatcher(predict, max_batch_size=4, max_wait_ms=60000)
+    futures = submit_together(batcher, [[i] for i in range(4)])
+    assert [f.result(timeout=2.0).tolist() for f in futures] == [[0], [2], [4], [6]]
+    assert predict.batches == [4]
+
+
+def test_partial_batch_flushes_after_max_wait():
+    predict = Recorder()
+    batcher = MicroBatcher(predict, max_batch_size=64, max_wait_ms=20)
+    futures = submit_together(batcher, [[1], [2]])
+    assert [f.result(timeout=2.0).tolist() for f in futures] == [[2], [4]]
+    assert predict.batches == [2]
+    assert batcher.stats()["queue_wait_ms"]["max"] >= 15
+
+
+def test_errors_reach_every_caller_in_the_batch():
+    batcher = MicroBatcher(Recorder(fail=True), max_batch_size=2, max_wait_ms=60000)
+    futures = submit_together(batcher, [[1], [2]])
+    for future in futures:
+        with pytest.raises(RuntimeError, match="model broke"):
+            future.result(timeout=2.0)
+    assert batcher.stats()["errors"] == 1
+    # the worker survives a failed batch
+    batcher.predict_fn = Recorder()
+    assert [f.result(timeout=2.0).tolist() for f in submit_together(batcher, [[3], [4]])] == [[6], [8]]
+
+
+def test_concurrent_callers_get_their_own_rows():
+    batcher = MicroBatcher(Recorder(), max_batch_size=8, max_wait_ms=5)
+    results = {}
+
+    def call(i):
+        results[i] = batcher.predict([i], timeout=2.0).tolist()
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == {i: [2 * i] for i in range(20)}
+    assert batcher.stats()["items"] == 20
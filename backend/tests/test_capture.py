@@ -0,0 +1,58 @@
+# backend/tests/test_capture.py
+import time
+
+from utils.capture import FrameBroadcaster
+
+
+class Camera:
+    """Frame source that yields `frames` reads, then fails."""
+
+    def __init__(self, frames, interval=0.005):
+        self.frames = frames
+        self.interval = interval
+
+    def read(self):
+        time.sleep(self.interval)
+        if self.frames <= 0:
+            return False, None
+        self.frames -= 1
+        return True, self.frames
+
+
+def process(img):
+    return b"jpeg-%d" % img
+
+
+def broadcaster(frames, **kwargs):
+    return FrameBroadcaster(lambda: Camera(frames), process, max_read_failures=1, **kwargs)
+
+
+def test_subscriber_gets_increasing_frames_until_the_camera_stops():
+    frames = list(broadcaster(20).subscribe())
+    seqs = [f.seq for f in frames]
+    assert seqs and seqs == sorted(set(seqs))
+    assert all(f.jpeg.startswith(b"jpeg-") for f in frames)
+
+
+def test_restarted_producer_keeps_numbering():
+    b = broadcaster(5)
+    first = [f.seq for f in b.subscribe()]
+    b.open_source = lambda: Camera(5)
+    second = [f.seq for f in b.subscribe()]
+    assert first and second and min(second) > max(first)
+    assert b.stats()["frames_captured"] == 10
+
+
+def test_slow_subscriber_skips_to_the_newest_frame():
+    b = broadcaster(30, ring_size=2)
+    received = []
+    for frame in b.subscribe():
+        received.append(frame.seq)
+        time.sleep(0.02)  # four producer frames per delivered one
+    assert len(received) < 30
+    assert b.stats()["frames_dropped_by_subscribers"] == received[-1] - received[0] + 1 - len(received)
+
+
+def test_stale_frames_are_not_sent():
+    b = broadcaster(3, max_frame_age_s=0.0)
+    assert list(b.subscribe()) == []
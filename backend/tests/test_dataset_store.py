@@ -0,0 +1,117 @@
+# backend/tests/test_dataset_store.py
+import json
+
+import numpy as np
+import pytest
+
+from utils.dataset_store import DatasetStore, DatasetWriter, convert_csv
+
+
+def write_rows(store_dir, rows, feature_size=4, hand_order="handedness", **info):
+    writer = DatasetWriter(str(store_dir), feature_size=feature_size, hand_order=hand_order)
+    for label, values in rows:
+        writer.append(values, label, **info)
+    writer.close()
+
+
+def test_new_store_records_hand_order(tmp_path):
+    write_rows(tmp_path, [("A", [1, 2, 3, 4]), ("B", [5, 6, 7, 8])])
+    store = DatasetStore(str(tmp_path))
+    assert store.hand_order == "handedness"
+    assert store.feature_size == 4
+    x, y = store.take([0, 1])
+    assert np.array_equal(x[1], [5, 6, 7, 8])
+    assert [store.labels[i] for i in y] == ["A", "B"]
+
+
+def test_new_store_requires_layout(tmp_path):
+    with pytest.raises(ValueError):
+        DatasetWriter(str(tmp_path), feature_size=4)
+
+
+def test_append_rejects_other_layout(tmp_path):
+    write_rows(tmp_path, [("A", [1, 2, 3, 4])])
+    with pytest.raises(ValueError):
+        DatasetWriter(str(tmp_path), feature_size=6, hand_order="handedness")
+    with pytest.raises(ValueError):
+        DatasetWriter(str(tmp_path), feature_size=4, hand_order="detection")
+    DatasetWriter(str(tmp_path)).close()  # no layout given: append in the store's own
+
+
+def test_store_without_hand_order_is_detection_ordered(tmp_path):
+    write_rows(tmp_path, [("A", [1, 2, 3, 4])])
+    meta_path = tmp_path / "meta.json"
+    meta = json.loads(meta_path.read_text())
+    del meta["hand_order"]  # written before the field existed
+    meta_path.write_text(json.dumps(meta))
+    assert DatasetStore(str(tmp_path)).hand_order == "detection"
+
+
+def test_csv_import_is_detection_ordered(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("label,p0,p1\nA,0.1,0.2\nB,0.3,0.4\n")
+    assert convert_csv(str(csv_path), str(tmp_path / "store")) == 2
+    store = DatasetStore(str(tmp_path / "store"))
+    assert store.hand_order == "detection"
+    assert store.feature_size == 2
+
+
+def test_windows_only_cover_contiguous_clip_frames(tmp_path):
+    writer = DatasetWriter(str(tmp_path), feature_size=1, hand_order="handedness")
+    for frame in (0, 1, 2, 5, 6):  # frames 3-4 had no hands
+        writer.append([frame], "J", session="a.mp4", clip="a.mp4", frame=frame)
+    for _ in range(4):
+        writer.append([9], "J", session="keys")  # single samples from collect_data
+    for frame in range(3):
+        writer.append([frame], "Z", session="b.mp4", clip="b.mp4", frame=frame)
+    writer.close()
+
+    windows, labels, clips = DatasetStore(str(tmp_path)).sequence_windows(window=3, stride=1)
+    assert windows.tolist() == [[0, 1, 2], [-1, 3, 4], [9, 10, 11]]
+    assert clips[0] == clips[1] != clips[2]  # both runs of a.mp4 split together
+
+
+def test_windows_ignore_shards_without_clip_info(tmp_path):
+    write_rows(tmp_path, [("A", [1, 2, 3, 4])] * 3, session="old")
+    info_path = str(tmp_path / "shard-00000.info.npz")
+    with np.load(info_path) as data:
+        old = {field: data[field] for field in ("signer", "session", "timestamp", "source")}
+    np.savez(info_path, **old)  # written before clip / frame existed
+    store = DatasetStore(str(tmp_path))
+    assert store.info(0)["frame"].tolist() == [-1, -1, -1]
+    assert len(store.sequence_windows(window=2)[0]) == 0
+
+
+def test_csv_import_runs_once_per_session(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("label,p0,p1\nA,0.1,0.2\n")
+    store_dir = str(tmp_path / "store")
+    assert convert_csv(str(csv_path), store_dir) == 1
+    assert convert_csv(str(csv_path), store_dir) is None
+    assert convert_csv(str(csv_path), store_dir, session="second") == 1
+    assert len(DatasetStore(store_dir)) == 2
+
+
+def test_batches_mix_labels_across_single_label_shards(tmp_path):
+    # collect_data.py layout: every 25-row shard is one session of one letter
+    writer = DatasetWriter(str(tmp_path), feature_size=1, hand_order="handedness", shard_rows=25)
+    for n, label in enumerate("ABCDEFGH"):
+        for _ in range(25):
+            writer.append([n], label)
+    writer.close()
+    store = DatasetStore(str(tmp_path))
+    assert len(store.offsets) > 8
+
+    batches = list(store.iter_batches(np.arange(len(store)), batch_size=32, seed=0))
+    seen = np.concatenate([x[:, 0] for x, _ in batches])
+    assert sorted(seen.tolist()) == sorted(np.repeat(np.arange(8), 25).tolist())  # every row once
+    distinct = [len(np.unique(y)) for _, y in batches[:-1]]
+    assert min(distinct) >= 5  # a shard-local shuffle gives 1-2 labels per batch
+    assert all(np.array_equal(x[:, 0], y) for x, y in batches)  # rows stay paired with their labels
+
+
+def test_unshuffled_batches_keep_id_order(tmp_path):
+    write_rows(tmp_path, [("A", [i, 0, 0, 0]) for i in range(10)])
+    store = DatasetStore(str(tmp_path))
+    batches = list(store.iter_batches([7, 2, 5], batch_size=2, shuffle=False))
+    assert [x[:, 0].tolist() for x, _ in batches] == [[7, 2], [5]]
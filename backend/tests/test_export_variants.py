@@ -0,0 +1,52 @@
+# backend/tests/test_export_variants.py
+import os
+
+import numpy as np
+
+from model.export_numpy import export_variants, promote, variant_path
+from model.numpy_engine import NumpyDenseModel
+
+
+def test_variants_are_written_next_to_the_float32_export(tmp_path):
+    rng = np.random.default_rng(0)
+    engine = NumpyDenseModel([(rng.random((126, 128)), np.zeros(128), "relu"), (rng.random((128, 3)), np.zeros(3), "softmax")],
+                             labels=np.array(["A", "B", "C"]), scaler_folded=True)
+    out = str(tmp_path / "sign_language_model.npz")
+    engine.save(out)
+    before = os.stat(out).st_mtime_ns
+
+    x = rng.random((20, 126), dtype=np.float32)
+    report = export_variants(engine, out, ["int8", "float16"], x, engine.predict(x).argmax(axis=1),
+                             report_path=str(tmp_path / "quantization_report.json"))
+
+    assert os.stat(out).st_mtime_ns == before  # the float32 export is measured, not rewritten
+    assert sorted(os.listdir(tmp_path)) == ["quantization_report.json", "sign_language_model.float16.npz",
+                                            "sign_language_model.int8.npz", "sign_language_model.npz"]
+    assert report["variants"]["int8"]["weight_bytes_in_memory"] * 3 < report["variants"]["float32"]["weight_bytes_in_memory"]
+    assert report["variants"]["int8"]["bytes"] < report["variants"]["float32"]["bytes"]
+    assert NumpyDenseModel.load(str(tmp_path / "sign_language_model.int8.npz")).weight_dtype == "int8"
+
+
+def test_promoted_variants_are_what_model_variant_loads(tmp_path):
+    # the train_model.py flow: a candidate bundle with QUANTIZE variants, then promote()
+    rng = np.random.default_rng(1)
+    engine = NumpyDenseModel([(rng.random((126, 128)), np.zeros(128), "relu"), (rng.random((128, 3)), np.zeros(3), "softmax")],
+                             labels=np.array(["A", "B", "C"]), scaler_folded=True)
+    bundle, model_dir = tmp_path / "candidates" / "train-1", tmp_path / "model"
+    bundle.mkdir(parents=True)
+    model_dir.mkdir()
+    engine.save(str(bundle / "sign_language_model.npz"))
+    np.save(str(bundle / "label_classes.npy"), engine.labels)
+    export_variants(engine, str(bundle / "sign_language_model.npz"), ["int8"],
+                    report_path=str(bundle / "quantization_report.json"))
+    (model_dir / "sign_language_model.float16.npz").write_bytes(b"previous model")
+
+    copied = promote(str(bundle), str(model_dir))
+    assert "sign_language_model.int8.npz" in copied
+    assert not (model_dir / "sign_language_model.float16.npz").exists()  # would pair old weights with new labels
+
+    # app.py: MODEL_VARIANT=int8 -> model/sign_language_model.int8.npz
+    served = NumpyDenseModel.load(variant_path(str(model_dir / "sign_language_model.npz"), "int8"))
+    assert served.weight_dtype == "int8" and served.labels.tolist() == ["A", "B", "C"]
+    x = rng.random((10, 126), dtype=np.float32)
+    assert (served.predict(x).argmax(axis=1) == engine.predict(x).argmax(axis=1)).mean() >= 0.8
@@ -0,0 +1,78 @@
+# backend/tests/test_frame_governor.py
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from utils.frame_governor import FrameGovernor
+
+
+def decisions(governor, frames, motion=0.0):
+    """Replay landmark()'s skip logic for `frames` frames with a constant motion score."""
+    out = []
+    for _ in range(frames):
+        go, reason = governor._should_landmark(motion)
+        out.append(reason or "pass")
+        governor._since = 0 if go else governor._since + 1
+    return out
+
+
+def test_still_frames_with_a_hand_skip_up_to_max_skip():
+    governor = FrameGovernor(max_skip=2, idle_max_skip=5)
+    governor._last, governor._last_hands = object(), 1
+    assert decisions(governor, 6) == ["motion", "motion", "pass"] * 2
+
+
+def test_still_frames_without_hands_skip_longer():
+    governor = FrameGovernor(max_skip=2, idle_max_skip=5)
+    governor._last, governor._last_hands = object(), 0
+    assert decisions(governor, 6) == ["motion"] * 5 + ["pass"]
+
+
+def test_motion_always_landmarks():
+    governor = FrameGovernor(motion_threshold=1.5)
+    governor._last, governor._last_hands = object(), 1
+    assert decisions(governor, 3, motion=10.0) == ["pass"] * 3
+
+
+def test_budget_stride_tracks_landmark_cost():
+    governor = FrameGovernor(target_fps=30.0, cpu_budget=0.5, max_stride=6)
+    governor._update_stride(0.05)  # 50 ms against 16.7 ms per frame
+    assert governor.stride == 3
+    governor._last, governor._last_hands = object(), 1
+    assert decisions(governor, 6, motion=10.0) == ["budget", "budget", "pass"] * 2
+    for _ in range(50):
+        governor._update_stride(0.5)
+    assert governor.stride == 6
+
+
+def test_reused_results_are_not_fresh():
+    pytest.importorskip("cv2")
+    governor = FrameGovernor(max_skip=2)
+    calls = []
+
+    def process(rgb):
+        calls.append(rgb.shape)
+        return SimpleNamespace(multi_hand_landmarks=[object()])
+
+    img = np.zeros((480, 640, 3), dtype=np.uint8)
+    fresh = [governor.landmark(img, process)[1] for _ in range(4)]
+    assert fresh == [True, False, False, True]
+    assert calls == [(240, 320, 3)] * 2  # downscaled to landmark_width
+    assert governor.stats()["skipped_motion"] == 2
+
+    off = FrameGovernor(enabled=False)
+    assert [off.landmark(img, process)[1] for _ in range(2)] == [True, True]
+    assert calls[-1] == (480, 640, 3)
+
+
+def test_fresh_results_report_the_frames_they_cover():
+    pytest.importorskip("cv2")
+    governor = FrameGovernor(max_skip=2)
+    process = lambda rgb: SimpleNamespace(multi_hand_landmarks=[object()])  # noqa: E731
+    img = np.zeros((240, 320, 3), dtype=np.uint8)
+    covers = []
+    for _ in range(7):
+        _, fresh = governor.landmark(img, process)
+        covers.append(governor.covers if fresh else 0)
+    assert covers == [1, 0, 0, 3, 0, 0, 3]
@@ -0,0 +1,67 @@
+# backend/tests/test_landmark_features.py
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from utils.landmark_features import LandmarkFeatures, normalize_rows, widen_index
+
+
+def hand(offset):
+    return SimpleNamespace(landmark=[SimpleNamespace(x=offset + j, y=offset + j / 2, z=-j) for j in range(21)])
+
+
+def results(*hands):
+    """MediaPipe-like result from (label, offset) pairs in detection order."""
+    return SimpleNamespace(
+        multi_hand_landmarks=[hand(offset) for _, offset in hands] or None,
+        multi_handedness=[SimpleNamespace(classification=[SimpleNamespace(label=label)]) for label, _ in hands] or None,
+    )
+
+
+def test_handedness_order_puts_left_first():
+    x = LandmarkFeatures(126, hand_order="handedness", normalize=False).extract(results(("Right", 100), ("Left", 0)))
+    grid = x.reshape(2, 21, 3)
+    assert grid[0, 0, 0] == 0 and grid[1, 0, 0] == 100
+
+
+def test_detection_order_keeps_mediapipe_order():
+    x = LandmarkFeatures(126, hand_order="detection", normalize=False).extract(results(("Right", 100), ("Left", 0)))
+    assert x.reshape(2, 21, 3)[0, 0, 0] == 100
+
+
+def test_layouts_without_z_or_second_hand():
+    x = LandmarkFeatures(84, normalize=False).extract(results(("Left", 0)))
+    grid = x.reshape(2, 21, 2)
+    assert grid[0, 3].tolist() == [3.0, 1.5]
+    assert not grid[1].any()  # missing second hand is zeros
+    assert LandmarkFeatures(42, normalize=False).extract(results(("Left", 0), ("Right", 100))).shape == (42,)
+
+
+def test_no_hands_returns_none():
+    features = LandmarkFeatures(126)
+    assert features.extract(results()) is None and features.hands == 0
+
+
+def test_unknown_layout_or_order_is_rejected():
+    with pytest.raises(ValueError):
+        LandmarkFeatures(100)
+    with pytest.raises(ValueError):
+        LandmarkFeatures(126, hand_order="size")
+
+
+def test_normalisation_is_wrist_relative_and_idempotent():
+    x = LandmarkFeatures(126, normalize=False).extract(results(("Left", 10))).copy()
+    once = normalize_rows(x.copy())
+    grid = once.reshape(2, 21, 3)
+    assert not grid[0, 0].any()  # wrist at the origin
+    assert np.abs(grid[0, :, :2]).max() == pytest.approx(1.0)
+    assert not grid[1].any()  # absent hand stays zero
+    np.testing.assert_allclose(normalize_rows(once.copy()), once)
+
+
+def test_widen_index_maps_xy_into_xyz():
+    cols = widen_index(84, 126)
+    assert cols[:4].tolist() == [0, 1, 3, 4]
+    with pytest.raises(ValueError):
+        widen_index(63, 84)
@@ -0,0 +1,48 @@
+# backend/tests/test_landmark_store.py
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from utils.landmark_store import LandmarkStore
+
+
+def test_publish_bumps_version_and_snapshots_copy():
+    store = LandmarkStore(size=3)
+    assert store.publish([1, 2, 3], timestamp=5.0) == 1
+    snap = store.snapshot()
+    assert snap.version == 1 and snap.timestamp == 5.0
+    store.publish([4, 5, 6])
+    assert snap.landmarks.tolist() == [1, 2, 3]  # not the live buffer
+
+
+def test_repeated_no_hand_frames_keep_the_version():
+    store = LandmarkStore(size=3)
+    assert store.publish(None) == 0
+    store.publish([1, 2, 3])
+    assert store.publish(None) == 2
+    assert store.publish(None) == 2
+    assert store.snapshot().landmarks is None
+
+
+def test_wrong_size_is_rejected():
+    with pytest.raises(ValueError):
+        LandmarkStore(size=3).publish(np.zeros(4))
+
+
+def test_wait_newer_times_out_with_the_current_snapshot():
+    store = LandmarkStore(size=3)
+    store.publish([1, 2, 3])
+    started = time.monotonic()
+    assert store.wait_newer(1, timeout=0.05).version == 1
+    assert time.monotonic() - started >= 0.04
+
+
+def test_wait_newer_wakes_on_publish():
+    store = LandmarkStore(size=3)
+    timer = threading.Timer(0.02, store.publish, args=([7, 8, 9],))
+    timer.start()
+    snap = store.wait_newer(0, timeout=5.0)
+    timer.join()
+    assert snap.version == 1 and snap.landmarks.tolist() == [7, 8, 9]
@@ -0,0 +1,60 @@
+# backend/tests/test_lazy.py
+from utils.lazy import LazyResource
+
+
+class Flaky:
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise OSError("camera unplugged")
+        return "camera"
+
+
+def test_loads_once_and_status_never_loads():
+    factory = Flaky(0)
+    resource = LazyResource("camera", factory)
+    assert resource.status()["state"] == "pending" and factory.calls == 0
+    assert resource.peek() is None
+    assert resource.get() == "camera" and resource.get() == "camera"
+    assert factory.calls == 1 and resource.ready
+
+
+def test_failed_factory_waits_out_the_backoff():
+    factory = Flaky(2)
+    resource = LazyResource("camera", factory, retry_s=60.0)
+    assert resource.get() is None
+    assert resource.get() is None
+    assert factory.calls == 1  # still inside the backoff
+    assert resource.status()["error"] == "camera unplugged"
+
+    resource._retry_at = 0.0
+    assert resource.get() is None
+    assert resource.failures == 2
+    assert resource._retry_at > 0  # rescheduled
+
+    resource._retry_at = 0.0
+    assert resource.get() == "camera"
+    assert resource.failures == 0 and resource.error is None
+
+
+def test_backoff_doubles_up_to_the_cap(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("utils.lazy.time.monotonic", lambda: now[0])
+    resource = LazyResource("model", Flaky(10), retry_s=5.0, max_retry_s=12.0)
+    delays = []
+    for _ in range(3):
+        resource.get()
+        delays.append(resource._retry_at - now[0])
+        now[0] = resource._retry_at
+    assert delays == [5.0, 10.0, 12.0]
+
+
+def test_replace_swaps_the_value():
+    resource = LazyResource("model", Flaky(10), retry_s=60.0)
+    resource.get()
+    assert resource.replace("reloaded") == "reloaded"
+    assert resource.get() == "reloaded" and resource.status()["state"] == "ready"
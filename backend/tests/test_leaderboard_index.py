@@ -0,0 +1,41 @@
+# backend/tests/test_leaderboard_index.py
+from utils.leaderboard_index import LeaderboardIndex
+
+DATE = "2026-10-18"
+
+
+def record(uid, score, time=10.0, date=DATE):
+    return {"uid": uid, "email": None, "score": score, "time": time, "date": date}
+
+
+def test_rebuild_without_changes_keeps_the_etag():
+    index = LeaderboardIndex()
+    records = [record("a", 3), record("b", 4)]
+    index.rebuild(records)
+    before = index.etag(DATE)
+    index.rebuild(records)
+    assert index.etag(DATE) == before
+
+
+def test_etag_changes_with_the_ranking():
+    index = LeaderboardIndex()
+    index.rebuild([record("a", 3)])
+    before = index.etag(DATE)
+    assert index.add(record("b", 4))
+    assert index.etag(DATE) != before
+
+
+def test_workers_with_the_same_ranking_agree():
+    incremental, rebuilt = LeaderboardIndex(), LeaderboardIndex()
+    incremental.rebuild([record("a", 3)])
+    incremental.add(record("b", 4))
+    rebuilt.rebuild([record("a", 3), record("b", 4)])
+    assert incremental.etag(DATE) == rebuilt.etag(DATE)
+
+
+def test_page_ranks_by_score_then_time():
+    index = LeaderboardIndex()
+    index.rebuild([record("a", 3, 5.0), record("b", 4, 9.0), record("c", 4, 7.0)])
+    entries, next_cursor, total = index.page(DATE, limit=2)
+    assert [(e["uid"], e["rank"]) for e in entries] == [("c", 1), ("b", 2)]
+    assert (next_cursor, total) == (2, 3)
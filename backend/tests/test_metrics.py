@@ -0,0 +1,64 @@
+# backend/tests/test_metrics.py
+import pytest
+
+from utils.metrics import Metrics, TimedProxy
+
+
+class Source:
+    def __init__(self):
+        self.produced = 0
+
+    def rows(self, n):
+        for i in range(n):
+            self.produced += 1
+            yield i
+
+    def count(self):
+        return 3
+
+    def fail(self):
+        raise RuntimeError("boom")
+
+
+def proxy(sample_rate=1.0):
+    metrics = Metrics(sample_rate=sample_rate)
+    source = Source()
+    return source, TimedProxy(source, "src", metrics), metrics
+
+
+def stage_count(metrics, name):
+    return metrics.summary()["histograms"].get("stage", {}).get(name, {}).get("count", 0)
+
+
+def test_generator_results_stay_lazy():
+    source, timed, metrics = proxy()
+    rows = timed.rows(1000)
+    assert source.produced == 0
+    assert next(rows) == 0
+    assert source.produced == 1
+    assert stage_count(metrics, "src.rows") == 0  # recorded when the read ends
+    assert list(rows) == list(range(1, 1000))
+    assert stage_count(metrics, "src.rows") == 1
+
+
+def test_abandoned_generator_is_recorded_on_close():
+    _, timed, metrics = proxy()
+    rows = timed.rows(10)
+    next(rows)
+    rows.close()
+    assert stage_count(metrics, "src.rows") == 1
+
+
+def test_plain_calls_and_errors_are_timed():
+    _, timed, metrics = proxy()
+    assert timed.count() == 3
+    with pytest.raises(RuntimeError):
+        timed.fail()
+    assert stage_count(metrics, "src.count") == 1
+    assert stage_count(metrics, "src.fail") == 1
+
+
+def test_unsampled_calls_pass_through():
+    _, timed, metrics = proxy(sample_rate=0.0)
+    assert list(timed.rows(3)) == [0, 1, 2]
+    assert metrics.summary()["histograms"] == {}
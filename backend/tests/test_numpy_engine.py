@@ -0,0 +1,71 @@
+# backend/tests/test_numpy_engine.py
+import numpy as np
+
+from model.export_numpy import fold_scaler
+from model.numpy_engine import ArrayScaler, NumpyDenseModel
+
+
+def random_layers(rng, sizes=(126, 128, 64, 5)):
+    acts = ["relu"] * (len(sizes) - 2) + ["softmax"]
+    return [(rng.normal(size=(a, b)), rng.normal(size=b), act) for a, b, act in zip(sizes, sizes[1:], acts)]
+
+
+def test_folded_scaler_matches_scaler_then_dense():
+    rng = np.random.default_rng(0)
+    layers = random_layers(rng)
+    scaler = ArrayScaler(rng.normal(size=126), rng.uniform(0.5, 2.0, size=126))
+    x = rng.random((32, 126), dtype=np.float32)
+
+    expected = NumpyDenseModel(layers).predict(scaler.transform(x))
+    w, b = fold_scaler(layers[0][0], layers[0][1], scaler)
+    folded = NumpyDenseModel([(w, b, "relu")] + layers[1:], scaler_folded=True)
+    np.testing.assert_allclose(folded.predict(x), expected, atol=1e-5)
+
+
+def test_fold_without_scaler_is_identity():
+    rng = np.random.default_rng(1)
+    w, b = rng.normal(size=(4, 3)), rng.normal(size=3)
+    folded_w, folded_b = fold_scaler(w, b, None)
+    np.testing.assert_allclose(folded_w, w, rtol=1e-6)
+    np.testing.assert_allclose(folded_b, b, rtol=1e-6)
+
+
+def test_save_load_round_trip(tmp_path):
+    rng = np.random.default_rng(2)
+    model = NumpyDenseModel(random_layers(rng), labels=np.array(list("ABCDE")), scaler_folded=True)
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    loaded = NumpyDenseModel.load(path)
+    x = rng.random((8, 126), dtype=np.float32)
+    np.testing.assert_array_equal(loaded.predict(x), model.predict(x))
+    assert loaded.labels.tolist() == list("ABCDE") and loaded.scaler_folded
+
+
+def test_quantized_variants_stay_close(tmp_path):
+    rng = np.random.default_rng(3)
+    model = NumpyDenseModel(random_layers(rng))
+    x = rng.random((64, 126), dtype=np.float32)
+    for dtype in ("float16", "int8"):
+        path = str(tmp_path / f"model.{dtype}.npz")
+        model.quantized(dtype).save(path)
+        loaded = NumpyDenseModel.load(path)
+        assert loaded.weight_dtype == dtype
+        assert all(w.dtype == dtype for w, *_ in loaded.layers)  # not widened at load
+        np.testing.assert_allclose(loaded.predict(x), model.quantized(dtype).predict(x), atol=1e-5)
+        assert (loaded.predict(x).argmax(axis=1) == model.predict(x).argmax(axis=1)).mean() > 0.9
+
+
+def test_array_scaler_round_trip(tmp_path):
+    scaler = ArrayScaler([1.0, 2.0], [2.0, 4.0])
+    path = str(tmp_path / "scaler.npz")
+    scaler.save(path)
+    np.testing.assert_allclose(ArrayScaler.load(path).transform([[3.0, 6.0]]), [[1.0, 1.0]])
+
+
+def test_int8_product_matches_dequantised_kernels():
+    rng = np.random.default_rng(4)
+    model = NumpyDenseModel(random_layers(rng)).quantized("int8")
+    dequantised = NumpyDenseModel([(w, b, act) for w, (_, b, _, act, _) in zip(model.kernels(), model.layers)])
+    x = rng.random((16, 126), dtype=np.float32)
+    np.testing.assert_allclose(model.predict(x), dequantised.predict(x), atol=1e-5)
+    assert model.weight_bytes() < dequantised.weight_bytes() / 3
@@ -0,0 +1,58 @@
+# backend/tests/test_played_cache.py
+from utils.played_cache import PlayedTodayCache, attempt_id
+
+
+class Clock:
+    def __init__(self, date):
+        self.date = date
+
+    def __call__(self):
+        return self.date
+
+
+def test_attempt_id_is_per_uid_and_date():
+    assert attempt_id("u1", "2026-10-18") == "u1_2026-10-18"
+    assert attempt_id("u1", "2026-10-18") != attempt_id("u1", "2026-10-19")
+
+
+def test_marked_uid_is_a_hit():
+    cache = PlayedTodayCache(today=Clock("2026-10-18"))
+    cache.mark_played("u1")
+    assert cache.has_played("u1")
+    assert cache.stats()["hits"] == 1
+
+
+def test_not_played_is_never_cached():
+    cache = PlayedTodayCache(today=Clock("2026-10-18"))
+    assert not cache.has_played("u1")
+    # another worker accepts u1's score; this worker learns it from the store
+    cache.mark_played("u1")
+    assert cache.has_played("u1")
+    assert cache.stats()["misses"] == 1
+
+
+def test_day_rollover_drops_every_entry():
+    clock = Clock("2026-10-18")
+    cache = PlayedTodayCache(today=clock)
+    cache.mark_played("u1")
+    cache.mark_played("u2")
+    clock.date = "2026-10-19"
+    assert not cache.has_played("u1")
+    assert not cache.has_played("u2")
+    assert cache.stats() == {"date": "2026-10-19", "entries": 0, "hits": 0, "misses": 2}
+
+
+def test_mark_for_another_date_is_ignored():
+    cache = PlayedTodayCache(today=Clock("2026-10-18"))
+    cache.mark_played("u1", date="2026-10-17")
+    assert not cache.has_played("u1")
+    cache.mark_played("u1", date="2026-10-18")
+    assert cache.has_played("u1")
+
+
+def test_size_bound_clears_instead_of_growing():
+    cache = PlayedTodayCache(max_entries=2, today=Clock("2026-10-18"))
+    for uid in ("u1", "u2", "u3"):
+        cache.mark_played(uid)
+    assert cache.stats()["entries"] <= 2
+    assert cache.has_played("u3")
@@ -0,0 +1,70 @@
+# backend/tests/test_prediction_cache.py
+import numpy as np
+
+from utils.prediction_cache import PredictionCache
+
+PROBS = np.array([0.1, 0.9], dtype=np.float32)
+
+
+def test_nearby_vectors_share_an_entry():
+    cache = PredictionCache(precision=2)
+    calls = []
+    compute = lambda x: calls.append(x) or PROBS  # noqa: E731
+    cache.get_or_compute(np.array([0.1001, 0.5]), 1, compute)
+    cache.get_or_compute(np.array([0.1002, 0.5]), 1, compute)
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(max_entries=2)
+    a, b, c = (cache.key([v], 1) for v in (1.0, 2.0, 3.0))
+    cache.put(a, PROBS)
+    cache.put(b, PROBS)
+    cache.get(a)  # a is now the most recent
+    cache.put(c, PROBS)
+    assert cache.get(b) is None
+    assert cache.get(a) is PROBS and cache.get(c) is PROBS
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_misses(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("utils.prediction_cache.time.monotonic", lambda: now[0])
+    cache = PredictionCache(ttl_s=5.0)
+    key = cache.key([1.0], 1)
+    cache.put(key, PROBS)
+    now[0] += 6.0
+    assert cache.get(key) is None
+    assert cache.stats()["expired"] == 1 and cache.stats()["entries"] == 0
+
+
+def test_new_model_version_never_serves_old_entries():
+    cache = PredictionCache()
+    x = [0.5, 0.5]
+    cache.put(cache.key(x, 1), PROBS)
+    assert cache.get(cache.key(x, 2)) is None
+    cache.clear(version=2)  # the model swap
+    assert cache.get(cache.key(x, 1)) is None
+    new = np.array([0.8, 0.2], dtype=np.float32)
+    assert cache.get_or_compute(x, 2, lambda _: new) is new
+    assert cache.get(cache.key(x, 2)) is new
+    assert cache.stats()["model_version"] == 2
+
+
+def test_late_puts_from_the_old_model_are_ignored():
+    cache = PredictionCache()
+    cache.put(cache.key([1.0], 1), PROBS)
+    cache.clear(version=2)
+    cache.put(cache.key([2.0], 2), PROBS)
+    cache.put(cache.key([3.0], 1), PROBS)  # a request that read version 1 before the swap
+    assert cache.get(cache.key([2.0], 2)) is PROBS  # not flushed
+    assert cache.get(cache.key([3.0], 1)) is None
+    assert cache.stats()["stale_puts"] == 1 and cache.stats()["model_version"] == 2
+
+
+def test_disabled_cache_stores_nothing():
+    cache = PredictionCache(max_entries=0)
+    cache.put(cache.key([1.0], 1), PROBS)
+    assert cache.get(cache.key([1.0], 1)) is None
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,57 @@
+# backend/tests/test_prediction_feed.py
+import time
+
+from utils.landmark_store import LandmarkStore
+from utils.prediction_feed import PredictionFeed
+
+
+def classify(landmarks):
+    if landmarks is None:
+        return {"predicted": None}
+    return {"predicted": "A" if landmarks[0] > 0 else "B"}
+
+
+def next_event(events, timeout=5.0):
+    """Next non-heartbeat event."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        event = next(events)
+        if event is not None:
+            return event
+    raise AssertionError("no event")
+
+
+def test_events_only_when_the_prediction_changes():
+    store = LandmarkStore(size=2)
+    feed = PredictionFeed(store, classify)
+    events = feed.subscribe(heartbeat_s=0.05)
+    try:
+        store.publish([1.0, 0.0])
+        assert next_event(events)["predicted"] == "A"
+
+        store.publish([2.0, 0.0])  # still A: classified, not sent
+        deadline = time.monotonic() + 5.0
+        while feed.classified < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        store.publish([-1.0, 0.0])
+        event = next_event(events)
+        assert event["predicted"] == "B" and event["seq"] == 3
+        assert feed.stats()["events_skipped_unchanged"] + feed.stats()["events_sent"] >= 2
+    finally:
+        events.close()
+    assert feed.stats()["subscribers"] == 0
+
+
+def test_sse_frames_events_and_heartbeats():
+    store = LandmarkStore(size=2)
+    stream = PredictionFeed(store, classify).sse(heartbeat_s=0.05)
+    try:
+        assert next(stream) == "retry: 2000\n\n"
+        store.publish([1.0, 0.0])
+        chunk = next(stream)
+        while chunk.startswith(":"):
+            chunk = next(stream)
+        assert chunk.startswith("id: 1\nevent: prediction\ndata: {")
+        assert next(stream) == ": keepalive\n\n"
+    finally:
+        stream.close()
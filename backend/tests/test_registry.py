@@ -0,0 +1,77 @@
+# backend/tests/test_registry.py
+import json
+import os
+
+import numpy as np
+import pytest
+
+from model import registry
+from model.numpy_engine import ArrayScaler, NumpyDenseModel
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    rng = np.random.default_rng(0)
+    model = NumpyDenseModel([(rng.random((6, 4)), np.zeros(4), "relu"), (rng.random((4, 2)), np.zeros(2), "softmax")])
+    model.save(str(src / "model.npz"))
+    np.save(str(src / "labels.npy"), np.array(["A", "B"], dtype=object), allow_pickle=True)  # legacy object array
+    ArrayScaler(np.ones(6), np.full(6, 2.0)).save(str(src / "scaler.npz"))
+    return src
+
+
+def publish(bundle, registry_dir, **kwargs):
+    return registry.publish(str(bundle / "model.npz"), str(bundle / "labels.npy"),
+                            scaler_path=str(bundle / "scaler.npz"), registry_dir=str(registry_dir), **kwargs)
+
+
+def test_published_version_loads_without_pickle(bundle, tmp_path):
+    reg = tmp_path / "registry"
+    version = publish(bundle, reg)
+    version_dir = registry.version_dir(version, str(reg))
+    manifest = registry.verify(version_dir)
+    files = {role: os.path.join(version_dir, name) for role, name in manifest["files"].items()}
+    assert list(np.load(files["labels"], allow_pickle=False)) == ["A", "B"]
+    scaler = ArrayScaler.load(files["scaler"])
+    assert np.allclose(scaler.transform(np.full((1, 6), 3.0)), 1.0)
+    assert NumpyDenseModel.load(files["model"]).input_size == 6
+
+
+def test_only_published_versions_can_be_activated(bundle, tmp_path):
+    reg = tmp_path / "registry"
+    version = publish(bundle, reg)
+    registry.set_active(version, str(reg))
+    assert registry.active_version(str(reg)) == version
+    (tmp_path / "elsewhere").mkdir()
+    (tmp_path / "elsewhere" / registry.MANIFEST).write_text("{}")
+    for name in ("../elsewhere", "missing", f"{version}/..", ""):
+        with pytest.raises(FileNotFoundError):
+            registry.set_active(name, str(reg))
+    assert registry.active_version(str(reg)) == version
+
+
+def test_version_names_cannot_escape_the_registry(bundle, tmp_path):
+    with pytest.raises(ValueError):
+        publish(bundle, tmp_path / "registry", version="../evil")
+
+
+def test_verify_rejects_tampered_and_unlisted_files(bundle, tmp_path):
+    reg = tmp_path / "registry"
+    version_dir = registry.version_dir(publish(bundle, reg), str(reg))
+    manifest_path = os.path.join(version_dir, registry.MANIFEST)
+    manifest = json.loads(open(manifest_path).read())
+
+    escaped = dict(manifest, files=dict(manifest["files"], labels="../labels.npy"),
+                   sha256=dict(manifest["sha256"], **{"../labels.npy": "x"}))
+    with pytest.raises(ValueError):
+        registry.verify(version_dir, escaped)
+
+    unchecked = dict(manifest, sha256={k: v for k, v in manifest["sha256"].items() if k != registry.LABELS_FILE})
+    with pytest.raises(ValueError):
+        registry.verify(version_dir, unchecked)
+
+    with open(os.path.join(version_dir, registry.LABELS_FILE), "ab") as f:
+        f.write(b"\0")
+    with pytest.raises(ValueError):
+        registry.verify(version_dir)
@@ -0,0 +1,46 @@
+# backend/tests/test_sequence.py
+import numpy as np
+
+from model.sequence_engine import CausalConvModel
+from utils.sequence import SequenceTracker
+
+
+def random_model(rng, size=4):
+    convs = [(rng.normal(size=(3, size, 6)), rng.normal(size=6), 1, "relu"),
+             (rng.normal(size=(3, 6, 6)), rng.normal(size=6), 2, "relu")]
+    return CausalConvModel(convs, (rng.normal(size=(6, 3)), rng.normal(size=3), "softmax"))
+
+
+def test_stream_matches_the_model_on_every_frame():
+    rng = np.random.default_rng(0)
+    model = random_model(rng)
+    frames = rng.random((10, 4), dtype=np.float32)
+    tracker = SequenceTracker(size=4, capacity=16)
+    for x in frames:
+        idx, confidence, _ = tracker.update(x, model)
+    expected = model.predict(frames)[0]
+    assert idx == expected.argmax() and confidence == np.float32(expected.max())
+    assert tracker.latest[2]  # a whole receptive field seen
+
+
+def test_skipped_frames_are_interpolated_at_the_camera_rate():
+    rng = np.random.default_rng(1)
+    model = random_model(rng)
+    a, b = rng.random((2, 4), dtype=np.float32)
+    tracker = SequenceTracker(size=4, capacity=16)
+    tracker.update(a, model)
+    tracker.update(b, model, frames=3)  # b came 3 camera frames after a
+    assert tracker.ring.count == 4
+    np.testing.assert_allclose(tracker.ring.last(), [a, a + (b - a) / 3, a + 2 * (b - a) / 3, b], atol=1e-6)
+    np.testing.assert_allclose(tracker.probs, model.predict(tracker.ring.last())[0], atol=1e-5)
+
+
+def test_long_gap_resets_and_a_new_hand_is_not_interpolated():
+    rng = np.random.default_rng(2)
+    model = random_model(rng)
+    tracker = SequenceTracker(size=4, capacity=16, max_gap=3)
+    tracker.update(rng.random(4, dtype=np.float32), model)
+    tracker.update(None, model, frames=4)  # the hands left for 4 frames
+    assert tracker.ring.count == 0 and tracker.latest == (None, 0.0, False)
+    tracker.update(rng.random(4, dtype=np.float32), model, frames=2)
+    assert tracker.ring.count == 1
@@ -0,0 +1,62 @@
+# backend/tests/test_sequence_engine.py
+import numpy as np
+
+from model.sequence_engine import CausalConvModel
+
+
+def random_model(rng, size=6, classes=4):
+    convs = [(rng.normal(size=(3, size, 8)), rng.normal(size=8), 1, "relu"),
+             (rng.normal(size=(3, 8, 8)), rng.normal(size=8), 2, "relu")]
+    head = (rng.normal(size=(8, classes)), rng.normal(size=classes), "softmax")
+    return CausalConvModel(convs, head, labels=np.array(list("ABCD")), features={"size": size})
+
+
+def test_streaming_matches_batch_for_every_frame():
+    rng = np.random.default_rng(0)
+    model = random_model(rng)
+    frames = rng.random((12, 6), dtype=np.float32)
+    stream = model.stream()
+    for t in range(len(frames)):
+        np.testing.assert_allclose(stream.step(frames[t]), model.predict(frames[None, :t + 1])[0], atol=1e-5)
+    assert model.receptive_field == 7 and stream.ready
+
+
+def test_output_only_depends_on_the_receptive_field():
+    rng = np.random.default_rng(1)
+    model = random_model(rng)
+    frames = rng.random((20, 6), dtype=np.float32)
+    changed = frames.copy()
+    changed[:-model.receptive_field] = 0.0
+    np.testing.assert_allclose(model.predict(changed), model.predict(frames), atol=1e-6)
+
+
+def test_reset_starts_a_new_sequence():
+    rng = np.random.default_rng(2)
+    model = random_model(rng)
+    frames = rng.random((5, 6), dtype=np.float32)
+    stream = model.stream()
+    for x in rng.random((9, 6), dtype=np.float32):
+        stream.step(x)
+    stream.reset()
+    assert not stream.ready
+    for t in range(len(frames)):
+        out = stream.step(frames[t])
+    np.testing.assert_allclose(out, model.predict(frames)[0], atol=1e-5)
+
+
+def test_save_load_and_widen(tmp_path):
+    rng = np.random.default_rng(3)
+    model = random_model(rng)
+    path = str(tmp_path / "sequence.npz")
+    model.save(path)
+    loaded = CausalConvModel.load(path)
+    windows = rng.random((3, 10, 6), dtype=np.float32)
+    np.testing.assert_array_equal(loaded.predict(windows), model.predict(windows))
+    assert loaded.features == {"size": 6} and loaded.labels.tolist() == list("ABCD")
+
+    cols = np.array([0, 2, 4, 6, 8, 10])
+    wide = model.widened(cols, 12)
+    padded = np.zeros((3, 10, 12), dtype=np.float32)
+    padded[..., cols] = windows
+    np.testing.assert_allclose(wide.predict(padded), model.predict(windows), atol=1e-6)
+    assert wide.features["size"] == 12
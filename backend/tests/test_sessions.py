@@ -0,0 +1,113 @@
+# backend/tests/test_sessions.py
+import threading
+import time
+
+from utils.sequence import SequenceSessions, SequenceTracker
+from utils.sessions import KeyedSessions
+from utils.temporal import SessionSmoothers, TemporalSmoother
+
+
+class Counter:
+    def __init__(self):
+        self.calls = []
+        self.last_update = time.monotonic()
+
+    def update(self, *args, now=None):
+        self.calls.append(args)
+        self.last_update = time.monotonic() if now is None else now
+        return len(self.calls)
+
+
+def test_one_state_per_session():
+    sessions = KeyedSessions(Counter)
+    assert sessions.update("a", 1) == 1
+    assert sessions.update("a", 2) == 2
+    assert sessions.update("b", 3) == 1
+    assert sessions.get("a").calls == [(1,), (2,)]
+    assert len(sessions) == 2
+    sessions.clear()
+    assert len(sessions) == 0
+
+
+def test_full_registry_drops_least_recently_updated():
+    sessions = KeyedSessions(Counter, max_sessions=2)
+    now = time.monotonic()
+    sessions.update("old", 1, now=now - 10)
+    sessions.update("new", 1, now=now)
+    sessions.get("third")
+    assert sorted(sessions._sessions) == ["new", "third"]
+
+
+def test_idle_sessions_expire_on_sweep():
+    sessions = KeyedSessions(Counter, ttl_s=60.0)
+    sessions.update("idle", 1, now=time.monotonic() - 120)
+    sessions.update("busy", 1)
+    sessions._next_sweep = 0  # sweep on the next new session
+    sessions.get("fresh")
+    assert sorted(sessions._sessions) == ["busy", "fresh"]
+
+
+class Blocking(Counter):
+    """update("hold") blocks until released; tracks overlapping updates."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.entered = threading.Event()
+        self.active = 0
+        self.max_active = 0
+
+    def update(self, *args, now=None):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        if args == ("hold",):
+            self.entered.set()
+            self.release.wait(5.0)
+        result = super().update(*args, now=now)
+        self.active -= 1
+        return result
+
+
+def test_slow_session_does_not_block_others():
+    sessions = KeyedSessions(Blocking)
+    slow = sessions.get("slow")
+    thread = threading.Thread(target=sessions.update, args=("slow", "hold"))
+    thread.start()
+    assert slow.entered.wait(5.0)
+    done = threading.Event()
+
+    def others():
+        # other sessions update and new ones are created while "slow" is mid-update
+        sessions.update("other", 1)
+        sessions.update("new", 1)
+        done.set()
+
+    try:
+        threading.Thread(target=others, daemon=True).start()
+        assert done.wait(2.0)
+    finally:
+        slow.release.set()
+        thread.join()
+
+
+def test_one_session_is_updated_by_one_request_at_a_time():
+    sessions = KeyedSessions(Blocking)
+    state = sessions.get("a")
+    holder = threading.Thread(target=sessions.update, args=("a", "hold"))
+    holder.start()
+    assert state.entered.wait(5.0)
+    second = threading.Thread(target=sessions.update, args=("a", 2))
+    second.start()
+    time.sleep(0.05)
+    assert len(state.calls) == 0  # the second update waits for the first
+    state.release.set()
+    holder.join()
+    second.join()
+    assert state.calls == [("hold",), (2,)] and state.max_active == 1
+
+
+def test_registries_build_their_state_type():
+    assert isinstance(SessionSmoothers(mode="vote").get("s"), TemporalSmoother)
+    assert SessionSmoothers(mode="vote").get("s").mode == "vote"
+    tracker = SequenceSessions(size=6, capacity=4).get("s")
+    assert isinstance(tracker, SequenceTracker) and tracker.ring.frames.shape == (4, 6)
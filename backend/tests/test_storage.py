@@ -0,0 +1,71 @@
+# backend/tests/test_storage.py
+import json
+
+import pytest
+
+from utils.storage import ScoreStore, SQLiteStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteStore(str(tmp_path / "isl.db"))
+
+
+def attempt(uid, date="2026-10-18", score=5, time=42.0):
+    return {"uid": uid, "email": f"{uid}@example.com", "score": score, "time": time, "date": date}
+
+
+def test_incomplete_backend_fails_at_construction():
+    class Partial(ScoreStore):
+        def has_attempt(self, uid, date):
+            return False
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_attempt_round_trip(store):
+    assert not store.has_attempt("u1", "2026-10-18")
+    assert store.create_attempt(attempt("u1"))
+    assert store.has_attempt("u1", "2026-10-18")
+    assert not store.has_attempt("u1", "2026-10-19")
+
+    rows = list(store.scores_since("2026-10-18"))
+    assert len(rows) == 1
+    row = rows[0]
+    assert {k: row[k] for k in ("uid", "email", "score", "time", "date")} == attempt("u1")
+    assert row["timestamp"] > 0
+
+
+def test_one_attempt_per_uid_and_date(store):
+    assert store.write_batch([attempt("u1"), attempt("u2"), attempt("u1", score=9)]) == [True, True, False]
+    assert not store.create_attempt(attempt("u2", score=9))
+    assert store.create_attempt(attempt("u1", date="2026-10-19"))
+    scores = {(r["uid"], r["date"]): r["score"] for r in store.scores_since("2026-10-18")}
+    assert scores == {("u1", "2026-10-18"): 5, ("u2", "2026-10-18"): 5, ("u1", "2026-10-19"): 5}
+
+
+def test_scores_since_filters_by_date(store):
+    store.write_batch([attempt("u1", date="2026-10-17"), attempt("u2", date="2026-10-18")])
+    assert [r["uid"] for r in store.scores_since("2026-10-18")] == ["u2"]
+
+
+def test_daily_letters_first_writer_wins(store):
+    assert store.get_daily_letters("2026-10-18") is None
+    assert store.set_daily_letters_if_absent("2026-10-18", ["A", "B", "C"]) == ["A", "B", "C"]
+    assert store.set_daily_letters_if_absent("2026-10-18", ["X", "Y", "Z"]) == ["A", "B", "C"]
+    assert store.get_daily_letters("2026-10-18") == ["A", "B", "C"]
+
+
+def test_data_survives_reopen(tmp_path):
+    path = str(tmp_path / "isl.db")
+    SQLiteStore(path).create_attempt(attempt("u1"))
+    assert SQLiteStore(path).has_attempt("u1", "2026-10-18")
+
+
+def test_import_legacy_json(tmp_path, store):
+    (tmp_path / "daily_letters.json").write_text(json.dumps({"2026-10-18": ["D", "E", "F"], "date": "x"}))
+    (tmp_path / "scores.json").write_text(json.dumps([attempt("u1"), {"uid": "", "date": "2026-10-18"}]))
+    store.import_legacy_json(str(tmp_path))
+    assert store.get_daily_letters("2026-10-18") == ["D", "E", "F"]
+    assert [r["uid"] for r in store.scores_since("2026-10-18")] == ["u1"]
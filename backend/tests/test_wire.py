@@ -0,0 +1,79 @@
+# backend/tests/test_wire.py
+import io
+
+import numpy as np
+import pytest
+
+from utils.wire import (DEFAULT_INT16_SCALE, HEADER, HEADER_MAGIC, OCTET_STREAM, decode_landmarks, encode_landmarks,
+                        iter_landmark_chunks)
+
+ROWS = np.random.default_rng(0).uniform(-1.0, 1.0, size=(5, 126)).astype(np.float32)
+
+
+@pytest.mark.parametrize("mimetype, atol", [
+    ("application/x-landmarks-f32", 0.0),
+    ("application/octet-stream", 0.0),
+    ("application/x-landmarks-f16", 1e-3),
+    ("application/x-landmarks-i16", DEFAULT_INT16_SCALE),
+])
+def test_round_trip(mimetype, atol):
+    decoded = decode_landmarks(encode_landmarks(ROWS, mimetype), mimetype, 126)
+    assert decoded.shape == (5, 126) and decoded.dtype == np.float32
+    np.testing.assert_allclose(decoded, ROWS, atol=atol)
+
+
+def test_int16_uses_the_given_scale():
+    body = encode_landmarks(ROWS * 10, "application/x-landmarks-i16", scale=1e-3)
+    np.testing.assert_allclose(decode_landmarks(body, "application/x-landmarks-i16", 126, scale=1e-3),
+                               ROWS * 10, atol=1e-3)
+
+
+def test_float32_decode_is_zero_copy():
+    body = encode_landmarks(ROWS, "application/x-landmarks-f32")
+    decoded = decode_landmarks(body, "application/x-landmarks-f32", 126)
+    assert not decoded.flags.writeable and not decoded.flags.owndata
+
+
+@pytest.mark.parametrize("body", [b"", b"\0" * 3, b"\0" * (4 * 126 + 4)])
+def test_partial_rows_are_rejected(body):
+    with pytest.raises(ValueError):
+        decode_landmarks(body, "application/x-landmarks-f32", 126)
+
+
+def test_chunks_cover_the_body():
+    body = encode_landmarks(ROWS, "application/x-landmarks-f16")
+    chunks = list(iter_landmark_chunks(io.BytesIO(body), "application/x-landmarks-f16", 126, chunk_rows=2,
+                                       content_length=len(body)))
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    np.testing.assert_allclose(np.concatenate(chunks), ROWS, atol=1e-3)
+
+
+def test_chunks_reject_partial_rows():
+    with pytest.raises(ValueError):
+        list(iter_landmark_chunks(io.BytesIO(b"\0" * 10), "application/x-landmarks-f32", 126, chunk_rows=2,
+                                  content_length=10))
+    with pytest.raises(ValueError):  # no Content-Length: caught at the trailing partial row
+        list(iter_landmark_chunks(io.BytesIO(b"\0" * (4 * 126 + 2)), "application/x-landmarks-f32", 126,
+                                  chunk_rows=4))
+
+
+@pytest.mark.parametrize("payload", ["application/x-landmarks-f16", "application/x-landmarks-i16"])
+def test_octet_stream_header_names_the_payload(payload):
+    body = encode_landmarks(ROWS, OCTET_STREAM, payload=payload)
+    assert body[:4] == HEADER_MAGIC
+    np.testing.assert_allclose(decode_landmarks(body, OCTET_STREAM, 126), ROWS, atol=1e-3)
+    chunks = list(iter_landmark_chunks(io.BytesIO(body), OCTET_STREAM, 126, chunk_rows=4, content_length=len(body)))
+    np.testing.assert_allclose(np.concatenate(chunks), ROWS, atol=1e-3)
+
+
+@pytest.mark.parametrize("body", [
+    b"\xff\xd8\xff\xe0" + b"\0" * 600,  # a JPEG someone posted
+    HEADER.pack(HEADER_MAGIC, b"f8", 126) + b"\0" * 8 * 126,
+    HEADER.pack(HEADER_MAGIC, b"f4", 63) + b"\0" * 4 * 126,
+    HEADER_MAGIC,
+])
+def test_octet_stream_without_a_landmark_header_is_rejected(body):
+    with pytest.raises(ValueError):
+        decode_landmarks(body, OCTET_STREAM, 126)
+    with pytest.raises(ValueError):
+        list(iter_landmark_chunks(io.BytesIO(body), OCTET_STREAM, 126, chunk_rows=4))
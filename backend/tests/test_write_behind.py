@@ -0,0 +1,113 @@
+# backend/tests/test_write_behind.py
+import fcntl
+import json
+import os
+import time
+
+import pytest
+
+from utils.storage import PartialWriteError, SQLiteStore
+from utils.write_behind import WriteBehindQueue, spill_file
+
+DATE = "2026-10-18"
+
+
+def record(uid):
+    return {"uid": uid, "email": None, "score": 5, "time": 10.0, "date": DATE, "timestamp": time.time()}
+
+
+def write_spill(path, records):
+    with open(path, "w") as f:
+        for r in records:
+            f.write(json.dumps(r) + "\n")
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def spill_path(tmp_path):
+    return str(tmp_path / "pending_scores.jsonl")
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteStore(str(tmp_path / "isl.db"))
+
+
+def test_each_process_spills_to_its_own_file(spill_path, store):
+    queue = WriteBehindQueue(lambda: store, spill_path, flush_interval_s=0.01).open()
+    assert queue.spill_path == spill_file(spill_path, os.getpid())
+    assert queue.submit(record("u1"))
+    assert wait_for(lambda: queue.status("u1", DATE) == "written")
+    assert store.has_attempt("u1", DATE)
+    assert not os.path.exists(spill_path)
+
+
+def test_dead_workers_spill_is_claimed_once(spill_path, store):
+    dead = spill_file(spill_path, 999999)
+    write_spill(dead, [record("u1"), record("u2")])
+    write_spill(spill_path, [record("u3")])  # the pre-per-process shared file
+
+    queue = WriteBehindQueue(lambda: store, spill_path, flush_interval_s=0.01).open()
+    assert wait_for(lambda: all(queue.status(u, DATE) == "written" for u in ("u1", "u2", "u3")))
+    assert queue.stats()["claimed_from_dead_workers"] == 3
+    assert not os.path.exists(dead) and not os.path.exists(dead + ".lock")
+    assert not os.path.exists(spill_path)
+
+
+def test_live_workers_spill_is_left_alone(spill_path, store):
+    live = spill_file(spill_path, 999998)
+    write_spill(live, [record("u1")])
+    with open(live + ".lock", "a") as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)  # its owner is still running
+        queue = WriteBehindQueue(lambda: store, spill_path, flush_interval_s=0.01).open()
+        assert queue.stats()["claimed_from_dead_workers"] == 0
+        assert os.path.exists(live)
+        assert queue.status("u1", DATE) is None
+
+
+class FlakyStore:
+    """Fails once after settling the first record of a batch; writes everything afterwards."""
+
+    def __init__(self):
+        self.rows = set()
+        self.failed = False
+
+    def write_batch(self, records):
+        created = []
+        for i, r in enumerate(records):
+            if i == 1 and not self.failed:
+                self.failed = True
+                raise PartialWriteError(created, RuntimeError("deadline exceeded"))
+            key = (r["uid"], r["date"])
+            created.append(key not in self.rows)
+            self.rows.add(key)
+        return created
+
+
+def test_partial_flush_retries_only_the_unsettled_records(spill_path):
+    store = FlakyStore()
+    written = []
+    queue = WriteBehindQueue(lambda: store, spill_path, batch_size=3, flush_interval_s=0.05,
+                             backoff_base_s=0.01, on_written=written.append)
+    for uid in ("u1", "u2", "u3"):
+        queue.submit(record(uid))
+    assert wait_for(lambda: queue.stats()["queue_depth"] == 0)
+    assert [queue.status(u, DATE) for u in ("u1", "u2", "u3")] == ["written"] * 3
+    assert sorted(r["uid"] for r in written) == ["u1", "u2", "u3"]
+    stats = queue.stats()
+    assert (stats["written"], stats["rejected_by_store"], stats["failures"]) == (3, 0, 1)
+
+
+def test_nothing_touches_the_disk_before_open(tmp_path, spill_path):
+    dead = spill_file(spill_path, 999999)
+    write_spill(dead, [record("u1")])
+    WriteBehindQueue(lambda: None, spill_path)
+    assert sorted(os.listdir(tmp_path)) == [os.path.basename(dead)]
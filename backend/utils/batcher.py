@@ -0,0 +1,176 @@
+# backend/utils/batcher.py
+import logging
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# batch sizes are bucketed so the stats stay small no matter how long we run
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class BatchFuture:
+    """Result slot handed back to a caller of MicroBatcher.submit()."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._result = None
+        self._error = None
+
+    def set_result(self, result):
+        self._result = result
+        self._event.set()
+
+    def set_error(self, error):
+        self._error = error
+        self._event.set()
+
+    def result(self, timeout=None):
+        if not self._event.wait(timeout):
+            raise TimeoutError("Timed out waiting for batched prediction")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-row predictions into one batched call.
+
+    Callers submit one feature vector each. A background thread waits until
+    either `max_batch_size` vectors are queued or the oldest one has waited
+    `max_wait_ms`, then runs `predict_fn` once on the stacked (N, D) array and
+    hands every caller its own row of the output.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=32, max_wait_ms=3.0, name="predict"):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.name = name
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+
+        # metrics
+        self._batches = 0
+        self._items = 0
+        self._errors = 0
+        self._size_hist = {b: 0 for b in BATCH_SIZE_BUCKETS}
+        self._max_batch_seen = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._recent_waits = deque(maxlen=1024)
+        self._predict_total = 0.0
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name=f"batcher-{self.name}", daemon=True)
+        self._thread.start()
+        logger.info(f"[batcher] {self.name} started (max_batch_size={self.max_batch_size}, "
+                    f"max_wait_ms={self.max_wait * 1000:.1f})")
+
+    def submit(self, x):
+        """Queue one 1-D feature vector and return a BatchFuture for its output row."""
+        future = BatchFuture()
+        with self._cond:
+            self._ensure_started()
+            self._queue.append((np.asarray(x, dtype=np.float32).ravel(), time.perf_counter(), future))
+            self._cond.notify()
+        return future
+
+    def predict(self, x, timeout=5.0):
+        """Blocking helper: submit `x` and wait for its output row."""
+        return self.submit(x).result(timeout)
+
+    def _take_batch(self):
+        with self._cond:
+            while not self._queue:
+                self._cond.wait()
+
+            # hold the batch open until it is full or the oldest item has waited long enough
+            deadline = self._queue[0][1] + self.max_wait
+            while len(self._queue) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            count = min(len(self._queue), self.max_batch_size)
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            started = time.perf_counter()
+            futures = [item[2] for item in batch]
+
+            try:
+                x = np.stack([item[0] for item in batch])
+                preds = np.asarray(self.predict_fn(x))
+                for i, future in enumerate(futures):
+                    future.set_result(preds[i])
+            except Exception as e:
+                logger.exception(f"[batcher] {self.name} batch of {len(batch)} failed")
+                self._errors += 1
+                for future in futures:
+                    future.set_error(e)
+
+            self._record(batch, started, time.perf_counter())
+
+    def _record(self, batch, started, finished):
+        size = len(batch)
+        with self._cond:
+            self._batches += 1
+            self._items += size
+            self._max_batch_seen = max(self._max_batch_seen, size)
+            for bucket in BATCH_SIZE_BUCKETS:
+                if size <= bucket:
+                    self._size_hist[bucket] += 1
+                    break
+            else:
+                self._size_hist[BATCH_SIZE_BUCKETS[-1]] += 1
+
+            for _, enqueued, _ in batch:
+                wait = started - enqueued
+                self._wait_total += wait
+                self._wait_max = max(self._wait_max, wait)
+                self._recent_waits.append(wait)
+            self._predict_total += finished - started
+
+    def stats(self):
+        """Batch-size and queue-wait metrics as a JSON-friendly dict."""
+        with self._cond:
+            recent = sorted(self._recent_waits)
+            batches = self._batches or 1
+            items = self._items or 1
+
+            def pct(p):
+                if not recent:
+                    return 0.0
+                return recent[min(len(recent) - 1, int(p * len(recent)))] * 1000.0
+
+            return {
+                "name": self.name,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "queue_depth": len(self._queue),
+                "batches": self._batches,
+                "items": self._items,
+                "errors": self._errors,
+                "avg_batch_size": self._items / batches,
+                "max_batch_size_seen": self._max_batch_seen,
+                "batch_size_histogram": {f"<={b}": n for b, n in self._size_hist.items()},
+                "queue_wait_ms": {
+                    "avg": self._wait_total / items * 1000.0,
+                    "max": self._wait_max * 1000.0,
+                    "p50": pct(0.50),
+                    "p99": pct(0.99),
+                },
+                "avg_predict_ms": self._predict_total / batches * 1000.0,
+            }
@@ -0,0 +1,165 @@
+# backend/utils/capture.py
+import logging
+import threading
+import time
+from collections import deque, namedtuple
+
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# jpeg: encoded bytes ready to stream; landmarks reach readers through the
+# LandmarkStore, not through frames
+Frame = namedtuple("Frame", ["seq", "timestamp", "jpeg"])
+
+
+class FrameBroadcaster:
+    """
+    Single-producer capture thread that publishes processed frames to a ring buffer.
+
+    The thread reads the camera once per frame and calls `process(img)`, which
+    returns the encoded JPEG bytes (or None to drop the frame). Every /video_feed
+    connection subscribes to the buffer instead of reading the camera itself,
+    so adding viewers does not add capture, MediaPipe or JPEG work.
+
+    Subscribers always jump to the newest frame: a slow client skips the frames
+    it could not keep up with (counted as dropped) rather than queueing them,
+    and frames older than `max_frame_age_s` are never sent.
+    """
+
+    def __init__(self, open_source, process, ring_size=4, max_frame_age_s=1.0,
+                 idle_timeout_s=10.0, max_read_failures=30):
+        self.open_source = open_source
+        self.process = process
+        self.max_frame_age_s = max_frame_age_s
+        self.idle_timeout_s = idle_timeout_s
+        self.max_read_failures = max_read_failures
+
+        self._ring = deque(maxlen=max(1, ring_size))
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._subscribers = 0
+        self._last_demand = 0.0
+        self._seq = 0  # never reset, so a restarted producer can't reuse a number a subscriber has seen
+
+        # metrics
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.read_failures = 0
+        self._fps_window = deque(maxlen=60)
+
+    # ---- producer ----
+    def touch(self):
+        """Signal demand for frames (e.g. a landmark poll) and make sure the thread runs."""
+        with self._cond:
+            self._last_demand = time.monotonic()
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="frame-broadcaster", daemon=True)
+            self._thread.start()
+
+    def _idle(self):
+        return self._subscribers == 0 and time.monotonic() - self._last_demand > self.idle_timeout_s
+
+    def _run(self):
+        logger.info("[capture] producer thread started")
+        failures = 0
+        try:
+            source = self.open_source()
+            if source is None:
+                logger.error("[capture] no frame source available")
+                return
+
+            while True:
+                with self._cond:
+                    if self._idle():
+                        logger.info("[capture] no subscribers, stopping producer thread")
+                        return
+
+                with metrics.stage("capture_read"):
+                    success, img = source.read()
+                if not success:
+                    failures += 1
+                    self.read_failures += 1
+                    if failures >= self.max_read_failures:
+                        logger.warning("Failed to read frame from camera")
+                        return
+                    time.sleep(0.01 * failures)
+                    continue
+                failures = 0
+
+                try:
+                    jpeg = self.process(img)
+                except Exception:
+                    logger.exception("[capture] frame processing failed")
+                    continue
+                if jpeg is None:
+                    continue
+
+                now = time.monotonic()
+                with self._cond:
+                    self._seq += 1
+                    self._ring.append(Frame(self._seq, now, jpeg))
+                    self.frames_captured += 1
+                    self._fps_window.append(now)
+                    self._cond.notify_all()
+        finally:
+            with self._cond:
+                self._running = False
+                self._ring.clear()  # frames from a stopped session are never served to the next one
+                self._cond.notify_all()
+
+    # ---- consumers ----
+    def latest(self):
+        """Newest frame in the ring buffer, or None."""
+        with self._cond:
+            return self._ring[-1] if self._ring else None
+
+    def subscribe(self, max_fps=None):
+        """Generator yielding the newest frame each time one is published."""
+        min_interval = 1.0 / max_fps if max_fps else 0.0
+        last_seq = 0
+        last_sent = 0.0
+        with self._cond:
+            self._subscribers += 1
+        self.touch()
+        try:
+            while True:
+                with self._cond:
+                    while self._running and (not self._ring or self._ring[-1].seq <= last_seq):
+                        self._cond.wait(1.0)
+                    if not self._ring or self._ring[-1].seq <= last_seq:
+                        return  # producer stopped with nothing new
+                    frame = self._ring[-1]
+                    if last_seq:
+                        self.frames_dropped += frame.seq - last_seq - 1
+                last_seq = frame.seq
+                if time.monotonic() - frame.timestamp > self.max_frame_age_s:
+                    continue  # stale; wait for a fresh one
+
+                if min_interval:
+                    delay = last_sent + min_interval - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                last_sent = time.monotonic()
+                yield frame
+        finally:
+            with self._cond:
+                self._subscribers -= 1
+                self._last_demand = time.monotonic()
+
+    def stats(self):
+        with self._cond:
+            window = list(self._fps_window)
+            fps = (len(window) - 1) / (window[-1] - window[0]) if len(window) > 1 and window[-1] > window[0] else 0.0
+            return {
+                "running": self._running,
+                "subscribers": self._subscribers,
+                "frames_captured": self.frames_captured,
+                "frames_dropped_by_subscribers": self.frames_dropped,
+                "read_failures": self.read_failures,
+                "capture_fps": round(fps, 2),
+                "latest_seq": self._seq,
+            }
@@ -1,16 +1,26 @@
 import cv2
 import mediapipe as mp
-import csv
+import datetime
 import os
+import sys
 import time
 
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from utils.dataset_store import DEFAULT_STORE, DatasetWriter  # noqa: E402
+from utils.landmark_features import COLLECT_HAND_ORDER, LandmarkFeatures  # noqa: E402
+
 # ===============================
 # CONFIG
 # ===============================
-DATASET_PATH = "backend/model/dataset/data.csv"
-NUM_LANDMARKS = 21
-COORDS_PER_POINT = 2  # x, y
-TOTAL_VALUES = NUM_LANDMARKS * COORDS_PER_POINT * 2  # for 2 hands
+DATASET_PATH = os.environ.get("DATASET_STORE", DEFAULT_STORE)
+TOTAL_VALUES = 126  # 2 hands × 21 landmarks × (x, y, z), the layout app.py serves
+FLUSH_EVERY = 25  # samples per shard write, so a crash loses at most this many
+
+# raw coordinates, hands in handedness order; normalisation is a training
+# option (train_model.py) so collected data never needs recollecting
+features = LandmarkFeatures(TOTAL_VALUES, hand_order=COLLECT_HAND_ORDER, normalize=False)
 
 # Initialize Mediapipe
 mp_hands = mp.solutions.hands
@@ -21,14 +31,16 @@ mp_draw = mp.solutions.drawing_utils
 # Ask for label
 # ===============================
 label = input("Enter the label for this data collection (e.g., A, B, C): ").strip().upper()
+signer = input("Signer name (optional): ").strip()
+session = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
 
-# Create dataset file if it doesn't exist
-if not os.path.exists(DATASET_PATH):
-    print("Creating new dataset file...")
-    os.makedirs(os.path.dirname(DATASET_PATH), exist_ok=True)
-    with open(DATASET_PATH, mode='w', newline='') as f:
-        header = ['label'] + [f'p{i}' for i in range(TOTAL_VALUES)]
-        csv.writer(f).writerow(header)
+# Appends new shards. A store imported from the legacy data.csv (84 x,y values,
+# detection order) can't take these rows; collect into a new one instead.
+try:
+    writer = DatasetWriter(DATASET_PATH, feature_size=TOTAL_VALUES, shard_rows=FLUSH_EVERY,
+                           hand_order=COLLECT_HAND_ORDER)
+except ValueError as e:
+    sys.exit(f"❌ {DATASET_PATH}: {e}. Set DATASET_STORE to a new directory to collect into.")
 
 # ===============================
 # Start video capture
@@ -47,15 +59,8 @@ while True:
     frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
     results = hands.process(frame_rgb)
 
-    row = [label]
-    if results.multi_hand_landmarks:
-        for hand_landmarks in results.multi_hand_landmarks:
-            for lm in hand_landmarks.landmark:
-                row.extend([lm.x, lm.y])
-        # Fill with zeros if second hand not present
-        while len(row) < 1 + TOTAL_VALUES:
-            row.append(0.0)
-
+    vector = features.extract(results)
+    if vector is not None:
         # Draw landmarks on screen
         for hand_landmarks in results.multi_hand_landmarks:
             mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
@@ -69,14 +74,14 @@ while True:
     cv2.imshow("Collecting Data", frame)
 
     key = cv2.waitKey(1) & 0xFF
-    if key == ord('s') and len(row) == 1 + TOTAL_VALUES:
-        with open(DATASET_PATH, mode='a', newline='') as f:
-            csv.writer(f).writerow(row)
+    if key == ord('s') and vector is not None:
+        writer.append(vector, label, signer=signer, session=session, source="collect_data")
         count += 1
         print(f"✅ Sample {count} saved.")
     elif key == ord('q'):
         print(f"\n✅ Saved {count} samples for label '{label}' successfully!")
         break
 
+writer.close()
 cap.release()
 cv2.destroyAllWindows()
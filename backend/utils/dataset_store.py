@@ -0,0 +1,380 @@
+# backend/utils/dataset_store.py
+"""
+Sharded float32 training dataset.
+
+    model/dataset/store/
+        meta.json                        feature size, hand order, label list, shard list + per-label counts
+        shard-00000.features.npy         (rows, feature_size) float32, memory-mapped on read
+        shard-00000.labels.npy           (rows,) int16 index into meta["labels"]
+        shard-00000.info.npz             per-row signer, session, timestamp, source, clip, frame
+
+Shards are written once and never modified; adding data adds shards and
+swaps meta.json atomically, so readers never see a half-written shard. The
+reader memory-maps shards and streams shuffled batches, so training never
+holds the whole dataset in RAM. There is one writer at a time.
+
+Rows from a recorded clip carry its id and their frame index in it; other
+rows (single samples, CSV imports) have clip "" and frame -1. Only clip rows
+are cut into sequence windows.
+
+Usage (from backend/):
+    python utils/dataset_store.py convert [--csv model/dataset/data.csv] [--store model/dataset/store]
+    python utils/dataset_store.py info [--store ...]
+"""
+import argparse
+import csv
+import datetime
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_DIR = os.path.join(BASE_DIR, "model", "dataset")
+DEFAULT_STORE = os.path.join(DATASET_DIR, "store")
+DEFAULT_CSV = os.path.join(DATASET_DIR, "data.csv")
+
+META = "meta.json"
+STORE_FORMAT = 1
+INFO_FIELDS = ("signer", "session", "timestamp", "source", "clip", "frame")
+# value of a field missing from a shard written before the field existed
+INFO_DEFAULTS = {"clip": "", "frame": -1}
+# stores written before meta.json recorded a hand order came from data.csv
+LEGACY_HAND_ORDER = "detection"
+
+
+def _read_meta(store_dir):
+    with open(os.path.join(store_dir, META)) as f:
+        return json.load(f)
+
+
+def _write_meta(store_dir, meta):
+    meta["updated"] = datetime.datetime.now().isoformat(timespec="seconds")
+    path = os.path.join(store_dir, META)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "w") as f:
+        json.dump(meta, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class DatasetWriter:
+    """
+    Buffers rows in memory and writes them out as a new shard on flush()
+    (automatically every `shard_rows`). Labels not seen before are appended
+    to the store's label list, so existing label indices never change.
+    """
+
+    def __init__(self, store_dir=DEFAULT_STORE, feature_size=None, shard_rows=50000, hand_order=None):
+        self.store_dir = store_dir
+        self.shard_rows = shard_rows
+        os.makedirs(store_dir, exist_ok=True)
+        if os.path.exists(os.path.join(store_dir, META)):
+            self.meta = _read_meta(store_dir)
+            self.meta.setdefault("hand_order", LEGACY_HAND_ORDER)
+            if feature_size is not None and feature_size != self.meta["feature_size"]:
+                raise ValueError(f"Store holds {self.meta['feature_size']} features, got {feature_size}")
+            if hand_order is not None and hand_order != self.meta["hand_order"]:
+                raise ValueError(f"Store holds {self.meta['hand_order']}-ordered hands, got {hand_order}")
+        else:
+            if feature_size is None or hand_order is None:
+                raise ValueError("feature_size and hand_order are required for a new store")
+            self.meta = {"format": STORE_FORMAT, "feature_size": feature_size, "hand_order": hand_order,
+                         "labels": [], "shards": [],
+                         "created": datetime.datetime.now().isoformat(timespec="seconds")}
+        self.feature_size = self.meta["feature_size"]
+        self.hand_order = self.meta["hand_order"]
+        self._label_index = {label: i for i, label in enumerate(self.meta["labels"])}
+        self._reset_buffer()
+
+    def _reset_buffer(self):
+        self._features = []
+        self._labels = []
+        self._info = {field: [] for field in INFO_FIELDS}
+
+    def __len__(self):
+        return len(self._labels)
+
+    def append(self, features, label, signer="", session="", timestamp=None, source="", clip="", frame=-1):
+        features = np.asarray(features, dtype=np.float32).ravel()
+        if features.size != self.feature_size:
+            raise ValueError(f"Expected {self.feature_size} features, got {features.size}")
+        label = str(label)
+        if label not in self._label_index:
+            self._label_index[label] = len(self.meta["labels"])
+            self.meta["labels"].append(label)
+        self._features.append(features.copy())  # callers may reuse their buffer
+        self._labels.append(self._label_index[label])
+        self._info["signer"].append(signer or "")
+        self._info["session"].append(session or "")
+        self._info["timestamp"].append(time.time() if timestamp is None else timestamp)
+        self._info["source"].append(source or "")
+        self._info["clip"].append(clip or "")
+        self._info["frame"].append(int(frame) if clip else -1)
+        if len(self._labels) >= self.shard_rows:
+            self.flush()
+
+    def extend(self, features, labels, **info):
+        """Append a block of rows; info values are scalars or per-row sequences."""
+        for i, (row, label) in enumerate(zip(features, labels)):
+            self.append(row, label, **{k: (v[i] if isinstance(v, (list, tuple, np.ndarray)) else v)
+                                       for k, v in info.items()})
+
+    def flush(self):
+        """Write buffered rows as a new shard; returns its name (None if nothing was buffered)."""
+        if not self._labels:
+            return None
+        name = f"shard-{len(self.meta['shards']):05d}"
+        while os.path.exists(os.path.join(self.store_dir, f"{name}.features.npy")):
+            name += "b"  # a shard from a crashed writer that never made it into meta.json
+        labels = np.asarray(self._labels, dtype=np.int16)
+        base = os.path.join(self.store_dir, name)
+        np.save(f"{base}.features.npy", np.stack(self._features))
+        np.save(f"{base}.labels.npy", labels)
+        np.savez(f"{base}.info.npz",
+                 signer=np.asarray(self._info["signer"]),
+                 session=np.asarray(self._info["session"]),
+                 timestamp=np.asarray(self._info["timestamp"], dtype=np.float64),
+                 source=np.asarray(self._info["source"]),
+                 clip=np.asarray(self._info["clip"]),
+                 frame=np.asarray(self._info["frame"], dtype=np.int64))
+        counts = np.bincount(labels, minlength=len(self.meta["labels"]))
+        self.meta["shards"].append({
+            "name": name,
+            "rows": int(len(labels)),
+            "label_counts": {self.meta["labels"][i]: int(n) for i, n in enumerate(counts) if n},
+        })
+        _write_meta(self.store_dir, self.meta)  # the shard becomes visible here
+        self._reset_buffer()
+        return name
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class DatasetStore:
+    """Read side: memory-mapped shards, a stratified split and a streaming batch loader."""
+
+    def __init__(self, store_dir=DEFAULT_STORE):
+        self.store_dir = store_dir
+        self.meta = _read_meta(store_dir)
+        self.labels = list(self.meta["labels"])
+        self.feature_size = self.meta["feature_size"]
+        self.hand_order = self.meta.get("hand_order", LEGACY_HAND_ORDER)
+        self.shards = [s["name"] for s in self.meta["shards"]]
+        sizes = [s["rows"] for s in self.meta["shards"]]
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        self._features = {}
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    def label_counts(self):
+        totals = {}
+        for shard in self.meta["shards"]:
+            for label, n in shard["label_counts"].items():
+                totals[label] = totals.get(label, 0) + n
+        return totals
+
+    def _path(self, shard, kind):
+        return os.path.join(self.store_dir, f"{shard}.{kind}")
+
+    def features(self, i):
+        """Shard i's feature matrix, memory-mapped (pages load on access)."""
+        mm = self._features.get(i)
+        if mm is None:
+            mm = self._features[i] = np.load(self._path(self.shards[i], "features.npy"), mmap_mode="r")
+        return mm
+
+    def all_labels(self):
+        """Label index of every row (int16; small enough to hold in RAM)."""
+        if not self.shards:
+            return np.zeros(0, dtype=np.int16)
+        return np.concatenate([np.load(self._path(s, "labels.npy")) for s in self.shards])
+
+    def info(self, i):
+        rows = int(self.offsets[i + 1] - self.offsets[i])
+        with np.load(self._path(self.shards[i], "info.npz")) as data:
+            return {field: data[field] if field in data.files else np.full(rows, INFO_DEFAULTS[field])
+                    for field in INFO_FIELDS}
+
+    def info_column(self, field):
+        """One info field for every row, in row order."""
+        if not self.shards:
+            return np.full(0, INFO_DEFAULTS.get(field, ""))
+        return np.concatenate([self.info(i)[field] for i in range(len(self.shards))])
+
+    def has_rows(self, **match):
+        """True if some row's info matches every field=value given (e.g. source=, session=)."""
+        for i in range(len(self.shards)):
+            info = self.info(i)
+            hit = np.ones(len(info["source"]), dtype=bool)
+            for field, value in match.items():
+                hit &= info[field] == value
+            if hit.any():
+                return True
+        return False
+
+    def label_rows(self, label):
+        """Global row ids for one label."""
+        return np.flatnonzero(self.all_labels() == self.labels.index(label))
+
+    def split(self, test_size=0.2, seed=42, ids=None):
+        """Stratified (train_ids, test_ids) over global row ids (all rows, or just `ids`)."""
+        rng = np.random.default_rng(seed)
+        labels = self.all_labels()
+        pool = np.arange(len(labels)) if ids is None else np.asarray(ids, dtype=np.int64)
+        train, test = [], []
+        for k in range(len(self.labels)):
+            ids = pool[labels[pool] == k]
+            rng.shuffle(ids)
+            n_test = int(round(len(ids) * test_size))
+            test.append(ids[:n_test])
+            train.append(ids[n_test:])
+        return np.sort(np.concatenate(train)), np.sort(np.concatenate(test))
+
+    def take(self, ids, labels=None):
+        """(x, y) for the given global row ids, in their order, gathered shard by shard."""
+        ids = np.asarray(ids, dtype=np.int64)
+        labels = self.all_labels() if labels is None else labels
+        x = np.empty((len(ids), self.feature_size), dtype=np.float32)
+        shard_of = np.searchsorted(self.offsets, ids, side="right") - 1
+        for i in np.unique(shard_of):
+            mask = shard_of == i
+            x[mask] = self.features(i)[ids[mask] - self.offsets[i]]
+        return x, labels[ids]
+
+    def sequence_windows(self, window, stride=1):
+        """
+        Fixed-length frame windows for sequence training. A run is a stretch
+        of consecutive rows of one clip with consecutive frame indices, so a
+        frame without hands (not stored) ends the run, like a stream that
+        lost the hands. Rows outside clips are never used. Every run yields
+        windows ending every `stride` frames, and always one ending on its
+        last frame. Runs shorter than `window` are front-padded with -1 (zero
+        frames, like a stream that just started).
+        Returns (windows (n, window) of row ids, labels (n,), clip ids (n,));
+        runs cut from one clip share its clip id.
+        """
+        labels = self.all_labels()
+        clips = self.info_column("clip")
+        frames = self.info_column("frame")
+        clip_ids = np.unique(clips, return_inverse=True)[1].ravel()
+        in_clip = clips != ""
+        joined = (in_clip[1:] & (clips[1:] == clips[:-1]) & (labels[1:] == labels[:-1])
+                  & (frames[1:] == frames[:-1] + 1))
+        breaks = np.flatnonzero(~joined) + 1
+        starts = np.concatenate([[0], breaks]).astype(np.int64)
+        ends = np.concatenate([breaks, [len(labels)]]).astype(np.int64)
+        windows, window_labels, runs = [], [], []
+        offsets = np.arange(-window + 1, 1)
+        for start, end in zip(starts, ends):
+            if end <= start or not in_clip[start]:
+                continue
+            last = np.arange(min(start + window, end) - 1, end, stride)
+            if last[-1] != end - 1:
+                last = np.append(last, end - 1)
+            ids = last[:, None] + offsets
+            ids[ids < start] = -1
+            windows.append(ids)
+            window_labels.append(np.full(len(ids), labels[start]))
+            runs.append(np.full(len(ids), clip_ids[start], dtype=np.int64))
+        if not windows:
+            return np.zeros((0, window), np.int64), np.zeros(0, np.int16), np.zeros(0, np.int64)
+        return np.concatenate(windows), np.concatenate(window_labels), np.concatenate(runs)
+
+    def take_windows(self, windows):
+        """(n, window, feature_size) frames for sequence_windows() ids; -1 gives a zero frame."""
+        windows = np.asarray(windows, dtype=np.int64)
+        x = np.zeros(windows.shape + (self.feature_size,), dtype=np.float32)
+        present = windows >= 0
+        x[present] = self.take(windows[present])[0]
+        return x
+
+    def iter_batches(self, ids, batch_size=32, shuffle=True, seed=None, epochs=1, transform=None):
+        """
+        Yield (x, y) batches over `ids`. Shuffling draws a new permutation of
+        all of `ids` every epoch, so a batch mixes rows from across the store
+        even when each shard holds one label (collect_data.py sessions). Each
+        batch's ids are sorted before the read, so it touches every mmap in
+        file order; only one batch is materialised at once. epochs=None
+        repeats forever.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        labels = self.all_labels()
+        rng = np.random.default_rng(seed)
+        epoch = 0
+        while epochs is None or epoch < epochs:
+            order = rng.permutation(ids) if shuffle else ids
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
+                x, y = self.take(np.sort(batch) if shuffle else batch, labels)
+                yield (transform(x) if transform else x), y
+            epoch += 1
+
+def convert_csv(csv_path=DEFAULT_CSV, store_dir=DEFAULT_STORE, signer="", session="csv-import",
+                shard_rows=50000):
+    """
+    One-shot import of a label,p0..pN CSV (detection-ordered hands, like the
+    legacy data.csv); streams the file, never loads it whole. Returns the row
+    count, or None when the store already has rows from this file and session.
+    """
+    source = os.path.basename(csv_path)
+    if os.path.exists(os.path.join(store_dir, META)) and \
+            DatasetStore(store_dir).has_rows(source=source, session=session):
+        return None
+    mtime = os.path.getmtime(csv_path)
+    rows = 0
+    with open(csv_path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        writer = DatasetWriter(store_dir, feature_size=len(header) - 1, shard_rows=shard_rows,
+                               hand_order=LEGACY_HAND_ORDER)
+        for row in reader:
+            if not row:
+                continue
+            writer.append(np.asarray(row[1:], dtype=np.float32), row[0], signer=signer,
+                          session=session, timestamp=mtime, source=source)
+            rows += 1
+        writer.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded training dataset tools")
+    parser.add_argument("--store", default=DEFAULT_STORE)
+    sub = parser.add_subparsers(dest="command", required=True)
+    conv = sub.add_parser("convert", help="import a data.csv-style file")
+    conv.add_argument("--csv", default=DEFAULT_CSV)
+    conv.add_argument("--signer", default="")
+    conv.add_argument("--session", default="csv-import")
+    conv.add_argument("--shard-rows", type=int, default=50000)
+    sub.add_parser("info")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        rows = convert_csv(args.csv, args.store, args.signer, args.session, args.shard_rows)
+        if rows is None:
+            print(f"{args.csv} is already in {args.store} as session {args.session!r}; "
+                  f"pass a new --session to import it again")
+        else:
+            print(f"✅ Imported {rows} rows from {args.csv} into {args.store}")
+    store = DatasetStore(args.store)
+    print(f"{len(store)} rows, {store.feature_size} features ({store.hand_order} hand order), "
+          f"{len(store.shards)} shards")
+    for label, n in sorted(store.label_counts().items()):
+        print(f"  {label}: {n}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
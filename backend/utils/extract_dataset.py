@@ -0,0 +1,277 @@
+# backend/utils/extract_dataset.py
+"""
+Headless bulk landmark extraction into the training dataset store.
+
+    clips/
+        A/  signer1_take1.mp4  signer2.mov  photos/img001.jpg img002.jpg ...
+        B/  ...
+
+The first directory level is the label. Every video file, and every
+directory of still images, is one unit of work. Units are spread over a
+spawn process pool, and each worker builds one MediaPipe Hands at start-up
+and reuses it for every unit it gets. Rows go straight into
+utils/dataset_store.py shards.
+
+Progress is checkpointed per unit in <store>/extract_progress.jsonl, and a
+unit is only recorded once its rows are in a committed shard. An
+interrupted run therefore resumes where it stopped without losing rows.
+Units whose size or mtime changed are extracted again.
+
+Usage (from backend/):
+    python utils/extract_dataset.py clips/ [--store model/dataset/store] [--workers 8]
+                                    [--every 2] [--max-side 640] [--mirror] [--signer NAME]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from utils.dataset_store import DEFAULT_STORE, META, DatasetStore, DatasetWriter  # noqa: E402
+from utils.landmark_features import COLLECT_HAND_ORDER, LandmarkFeatures  # noqa: E402
+
+VIDEO_EXTS = {".mp4", ".avi", ".mov", ".mkv", ".webm", ".m4v"}
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+CHECKPOINT = "extract_progress.jsonl"
+DEFAULT_FEATURE_SIZE = 126  # same layout as collect_data.py
+
+
+# ---- discovery / checkpoints ----
+def find_units(root):
+    """[(label, relative path, absolute path, kind)] for every video and image directory."""
+    units = []
+    for label in sorted(os.listdir(root)):
+        label_dir = os.path.join(root, label)
+        if not os.path.isdir(label_dir):
+            continue
+        for dirpath, dirnames, filenames in os.walk(label_dir):
+            dirnames.sort()
+            images = False
+            for name in sorted(filenames):
+                ext = os.path.splitext(name)[1].lower()
+                path = os.path.join(dirpath, name)
+                if ext in VIDEO_EXTS:
+                    units.append((label, os.path.relpath(path, root), path, "video"))
+                elif ext in IMAGE_EXTS:
+                    images = True
+            if images:
+                units.append((label, os.path.relpath(dirpath, root), dirpath, "images"))
+    return units
+
+
+def fingerprint(path, kind):
+    """Cheap change detector: total size and newest mtime of the unit's files."""
+    if kind == "video":
+        st = os.stat(path)
+        return [st.st_size, int(st.st_mtime)]
+    size, mtime = 0, 0
+    for name in os.listdir(path):
+        if os.path.splitext(name)[1].lower() in IMAGE_EXTS:
+            st = os.stat(os.path.join(path, name))
+            size += st.st_size
+            mtime = max(mtime, int(st.st_mtime))
+    return [size, mtime]
+
+
+def load_checkpoint(store_dir):
+    done = {}
+    path = os.path.join(store_dir, CHECKPOINT)
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from a crash
+                done[entry["unit"]] = entry["fingerprint"]
+    return done
+
+
+def append_checkpoint(store_dir, entries):
+    with open(os.path.join(store_dir, CHECKPOINT), "a") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+# ---- worker side ----
+_hands = None
+_features = None
+
+
+def _init_worker(min_detection_confidence, feature_config):
+    global _hands, _features
+    import mediapipe as mp
+    _features = LandmarkFeatures(**feature_config)
+    # per-frame detection: units are independent clips, so no tracking state may
+    # leak from one unit into the next on the same worker
+    _hands = mp.solutions.hands.Hands(
+        static_image_mode=True,
+        max_num_hands=_features.max_hands,
+        min_detection_confidence=min_detection_confidence,
+    )
+
+
+def _frames(path, kind, every):
+    import cv2
+    if kind == "images":
+        names = sorted(n for n in os.listdir(path) if os.path.splitext(n)[1].lower() in IMAGE_EXTS)
+        for name in names[::every]:
+            img = cv2.imread(os.path.join(path, name))
+            if img is not None:
+                yield img
+        return
+    cap = cv2.VideoCapture(path)
+    try:
+        index = 0
+        while True:
+            if index % every:
+                if not cap.grab():  # skip without decoding
+                    break
+            else:
+                ok, img = cap.read()
+                if not ok:
+                    break
+                yield img
+            index += 1
+    finally:
+        cap.release()
+
+
+def _extract_unit(path, kind, every, max_side, mirror):
+    """
+    Landmark rows (n, size) float32 for one unit, the index of each row's
+    frame among the frames read (frames without hands get no row), and counts.
+    """
+    import cv2
+    started = time.perf_counter()
+    rows, indices = [], []
+    frames = 0
+    for index, img in enumerate(_frames(path, kind, every)):
+        frames += 1
+        h, w = img.shape[:2]
+        if max_side and max(h, w) > max_side:
+            # landmarks are in normalised image coordinates, so scale doesn't change them
+            scale = max_side / max(h, w)
+            img = cv2.resize(img, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+        if mirror:
+            img = cv2.flip(img, 1)
+        vector = _features.extract(_hands.process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB)))
+        if vector is not None:
+            rows.append(vector.copy())
+            indices.append(index)
+    data = np.stack(rows) if rows else np.zeros((0, _features.size), dtype=np.float32)
+    return data, np.asarray(indices, dtype=np.int64), frames, time.perf_counter() - started
+
+
+# ---- driver ----
+def run(root, store_dir=DEFAULT_STORE, workers=None, every=1, max_side=640, mirror=False,
+        signer="", min_detection_confidence=0.5, feature_size=None, shard_rows=20000):
+    hand_order = COLLECT_HAND_ORDER
+    if os.path.exists(os.path.join(store_dir, META)):
+        existing = DatasetStore(store_dir)
+        feature_size, hand_order = existing.feature_size, existing.hand_order
+    feature_size = feature_size or DEFAULT_FEATURE_SIZE
+    # raw coordinates like collect_data.py; normalisation is a training option
+    feature_config = LandmarkFeatures(feature_size, hand_order=hand_order, normalize=False).config()
+
+    units = find_units(root)
+    done = load_checkpoint(store_dir)
+    todo = [u for u in units if done.get(u[1]) != fingerprint(u[2], u[3])]
+    print(f"[extract] {len(units)} units under {root}, {len(units) - len(todo)} already done, {len(todo)} to go")
+    if not todo:
+        return 0
+
+    writer = DatasetWriter(store_dir, feature_size=feature_size, shard_rows=sys.maxsize,  # we flush
+                           hand_order=hand_order)
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(min_detection_confidence, feature_config),
+    )
+    pending_checkpoints = []
+    totals = {"units": 0, "frames": 0, "rows": 0, "failed": 0}
+    started = time.perf_counter()
+
+    def commit():
+        # shard first, then checkpoint: a crash in between re-extracts those units
+        # (duplicating their rows) rather than losing them
+        writer.flush()
+        if pending_checkpoints:
+            append_checkpoint(store_dir, pending_checkpoints)
+            pending_checkpoints.clear()
+
+    queue = list(reversed(todo))
+    in_flight = {}
+    try:
+        while queue or in_flight:
+            while queue and len(in_flight) < workers * 2:  # bounded, so results don't pile up
+                unit = queue.pop()
+                label, rel, path, kind = unit
+                future = pool.submit(_extract_unit, path, kind, every, max_side, mirror)
+                in_flight[future] = unit
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                label, rel, path, kind = in_flight.pop(future)
+                try:
+                    rows, indices, frames, elapsed = future.result()
+                except Exception as e:
+                    totals["failed"] += 1
+                    print(f"❌ {rel}: {e}")
+                    continue
+                # a video is a clip (sequence training windows it by frame
+                # index); a directory of stills is just samples
+                clip = rel if kind == "video" else ""
+                writer.extend(rows, [label] * len(rows), signer=signer, session=rel,
+                              timestamp=time.time(), source=rel, clip=clip, frame=indices)
+                pending_checkpoints.append({"unit": rel, "fingerprint": fingerprint(path, kind),
+                                            "label": label, "frames": frames, "rows": len(rows)})
+                totals["units"] += 1
+                totals["frames"] += frames
+                totals["rows"] += len(rows)
+                print(f"[{totals['units'] + totals['failed']}/{len(todo)}] {rel}: "
+                      f"{len(rows)}/{frames} frames with hands ({frames / max(elapsed, 1e-9):.0f} fps)")
+                if len(writer) >= shard_rows:
+                    commit()
+        commit()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        commit()
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✅ {totals['units']} units, {totals['rows']} rows from {totals['frames']} frames "
+          f"in {elapsed:.1f}s ({totals['frames'] / max(elapsed, 1e-9):.0f} frames/s); {totals['failed']} failed")
+    return totals["failed"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract hand landmarks from labelled videos/images")
+    parser.add_argument("root", help="directory with one sub-directory per label")
+    parser.add_argument("--store", default=DEFAULT_STORE)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--every", type=int, default=1, help="use every Nth video frame / image")
+    parser.add_argument("--max-side", type=int, default=640, help="downscale larger frames (0 = off)")
+    parser.add_argument("--mirror", action="store_true", help="flip frames like the live camera view")
+    parser.add_argument("--signer", default="")
+    parser.add_argument("--min-confidence", type=float, default=0.5)
+    parser.add_argument("--size", type=int, choices=(126, 84, 63, 42),
+                        help=f"feature layout for a new store (default {DEFAULT_FEATURE_SIZE})")
+    args = parser.parse_args()
+
+    failed = run(args.root, args.store, args.workers, max(1, args.every), args.max_side, args.mirror,
+                 args.signer, args.min_confidence, args.size)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
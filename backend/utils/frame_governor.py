@@ -0,0 +1,162 @@
+# backend/utils/frame_governor.py
+"""
+Decides how much MediaPipe work each camera frame gets.
+
+    results, fresh = governor.landmark(img, hands.process)
+
+Three savings, each optional:
+  downscale   landmark a copy no wider than `landmark_width`. Landmarks are in
+              normalised coordinates, and palm detection resizes to 192 px
+              anyway, so the full-resolution convert and copy buy nothing.
+  motion      compare a 32x24 grey thumbnail with the one from the last
+              landmarked frame. If little has changed, reuse the last result,
+              for at most `max_skip` frames in a row (`idle_max_skip` when no
+              hand is visible).
+  budget      with `target_fps`, keep an EMA of the cost of one landmark
+              pass. Landmark at most every `stride` frames, where the stride
+              keeps that cost within `cpu_budget` of the frame interval.
+
+process() is a tracking graph (static_image_mode=False), which already
+landmarks a crop around the previous frame's hands and only runs palm
+detection when it loses them. It therefore gets every landmarked frame
+whole, at one size, and at most once; the governor only decides which
+frames to skip.
+
+Reused results are the previous MediaPipe result object, returned with
+fresh=False; they describe an earlier frame. After a fresh result, `covers`
+is the number of camera frames it stands for: itself plus the frames reused
+since the last pass. The sequence model was trained on every camera frame,
+so its tracker uses this to step at the camera's rate whatever the governor
+skipped. enabled=False gives the plain
+full-rate pipeline (the baseline that bench/bench_serving.py compares
+against).
+"""
+import math
+import threading
+import time
+
+import numpy as np
+
+THUMB_SIZE = (32, 24)
+
+
+class FrameGovernor:
+    def __init__(self, enabled=True, landmark_width=320, motion_threshold=1.5, max_skip=2,
+                 idle_max_skip=5, target_fps=0.0, cpu_budget=0.5, max_stride=6):
+        self.enabled = enabled
+        self.landmark_width = landmark_width
+        self.motion_threshold = motion_threshold
+        self.max_skip = max_skip
+        self.idle_max_skip = idle_max_skip
+        self.target_fps = target_fps
+        self.cpu_budget = cpu_budget
+        self.max_stride = max(1, max_stride)
+
+        self._lock = threading.Lock()
+        self.reset()
+
+    def config(self):
+        """Constructor kwargs, e.g. to build an identical governor for a benchmark run."""
+        return {
+            "enabled": self.enabled, "landmark_width": self.landmark_width,
+            "motion_threshold": self.motion_threshold, "max_skip": self.max_skip,
+            "idle_max_skip": self.idle_max_skip, "target_fps": self.target_fps, "cpu_budget": self.cpu_budget, "max_stride": self.max_stride,
+        }
+
+    def reset(self):
+        self._last = None  # last MediaPipe result
+        self._last_hands = 0
+        self._thumb = None
+        self._since = 0  # frames reused since the last pass
+        self.covers = 1  # camera frames the last fresh result stands for
+        self._cost_ema = None
+        self.stride = 1
+        self.frames = 0
+        self.passes = 0
+        self.skipped_motion = 0
+        self.skipped_budget = 0
+        self._cost_total = 0.0
+
+    # ---- decisions ----
+    def _should_landmark(self, motion):
+        if self._last is None:
+            return True, None
+        if self._since + 1 < self.stride:
+            return False, "budget"
+        limit = self.max_skip if self._last_hands else self.idle_max_skip
+        if motion is not None and motion < self.motion_threshold and self._since < limit:
+            return False, "motion"
+        return True, None
+
+    def _update_stride(self, cost_s):
+        self._cost_ema = cost_s if self._cost_ema is None else 0.8 * self._cost_ema + 0.2 * cost_s
+        if self.target_fps > 0:
+            allowed = self.cpu_budget / self.target_fps  # landmark seconds per frame we can afford
+            self.stride = min(self.max_stride, max(1, math.ceil(self._cost_ema / allowed)))
+
+    # ---- per frame ----
+    def _prepare(self, img):
+        import cv2
+        h, w = img.shape[:2]
+        if self.enabled and self.landmark_width and w > self.landmark_width:
+            scale = self.landmark_width / w
+            img = cv2.resize(img, (self.landmark_width, max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+        return img
+
+    def _motion(self, small):
+        import cv2
+        grey = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        thumb = cv2.resize(grey, THUMB_SIZE, interpolation=cv2.INTER_AREA).astype(np.int16)
+        motion = None if self._thumb is None else float(np.abs(thumb - self._thumb).mean())
+        return thumb, motion
+
+    def landmark(self, img, process):
+        """(MediaPipe result, fresh) for a BGR frame; process() is e.g. hands.process."""
+        import cv2
+        with self._lock:
+            self.frames += 1
+            if not self.enabled:
+                self.passes += 1
+                self.covers = 1
+                return process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB)), True
+
+            small = self._prepare(img)
+            thumb, motion = self._motion(small) if self.motion_threshold > 0 else (None, None)
+            go, reason = self._should_landmark(motion)
+            if not go:
+                self._since += 1
+                if reason == "budget":
+                    self.skipped_budget += 1
+                else:
+                    self.skipped_motion += 1
+                return self._last, False
+
+            started = time.perf_counter()
+            results = process(cv2.cvtColor(small, cv2.COLOR_BGR2RGB))
+            cost = time.perf_counter() - started
+
+            self.passes += 1
+            self._cost_total += cost
+            self._update_stride(cost)
+            self._last = results
+            self._last_hands = len(results.multi_hand_landmarks or [])
+            self._thumb = thumb
+            self.covers = self._since + 1
+            self._since = 0
+            return results, True
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "frames": self.frames,
+                "landmark_passes": self.passes,
+                "pass_ratio": round(self.passes / self.frames, 3) if self.frames else 0.0,
+                "skipped_motion": self.skipped_motion,
+                "skipped_budget": self.skipped_budget,
+                "stride": self.stride,
+                "pass_ms": {
+                    "avg": round(self._cost_total / self.passes * 1000.0, 2) if self.passes else 0.0,
+                    "ema": round(self._cost_ema * 1000.0, 2) if self._cost_ema is not None else 0.0,
+                },
+            }
@@ -0,0 +1,171 @@
+# backend/utils/landmark_features.py
+"""
+One place that turns MediaPipe hand landmarks into model features.
+
+Layouts are picked by vector size:
+  126  two hands × 21 × (x, y, z)   app.py / the served model
+   84  two hands × 21 × (x, y)      collect_data.py / data.csv
+   63  one hand  × 21 × (x, y, z)
+   42  one hand  × 21 × (x, y)      predict_sign.py
+
+Two hand orders: "handedness" (Left before Right) is stable, whereas
+detection order flips from frame to frame when both hands are up. A single
+hand always goes in the first slot. Data is collected in handedness order,
+but the legacy data.csv and the model trained on it used detection order,
+so that stays the default for models without a saved config. Optional
+wrist-relative normalisation moves every hand's wrist to the origin and
+scales it to unit size. The settings a model was trained with are saved
+next to it in feature_config.json, so serving builds the same features.
+"""
+import json
+import os
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+LAYOUTS = {
+    126: (2, 3),
+    84: (2, 2),
+    63: (1, 3),
+    42: (1, 2),
+}
+
+HAND_ORDERS = ("handedness", "detection")
+
+CONFIG_FILE = "feature_config.json"
+
+# defaults for code that has no saved config to go by: what the shipped,
+# config-less model was trained on
+DEFAULT_HAND_ORDER = os.environ.get("FEATURE_HAND_ORDER", "detection")
+# what collect_data.py / extract_dataset.py record new data in
+COLLECT_HAND_ORDER = "handedness"
+DEFAULT_NORMALIZE = os.environ.get("FEATURE_NORMALIZE", "0") == "1"
+
+
+def layout(size):
+    """(hands, coords per landmark) for a feature vector of `size` floats."""
+    if size not in LAYOUTS:
+        raise ValueError(f"Unsupported feature size {size}; expected one of {sorted(LAYOUTS)}")
+    return LAYOUTS[size]
+
+
+def model_input_size(model):
+    """Declared input width of a Keras model or NumpyDenseModel."""
+    if hasattr(model, "input_size"):  # NumpyDenseModel
+        return int(model.input_size)
+    return int(model.input_shape[-1])
+
+
+def widen_index(size, serve_size):
+    """
+    Column in the `serve_size` layout of each column of the `size` layout,
+    e.g. the x,y of 84 inside the x,y,z of 126. Used to export models trained
+    on x,y data with zero weights for z.
+    """
+    hands, coords = layout(size)
+    serve_hands, serve_coords = layout(serve_size)
+    if hands != serve_hands or coords > serve_coords:
+        raise ValueError(f"Can't serve {size}-value features as {serve_size}")
+    grid = np.arange(serve_size).reshape(serve_hands, NUM_LANDMARKS, serve_coords)
+    return grid[:, :, :coords].ravel()
+
+
+def normalize_hands(hands):
+    """
+    Wrist-relative, unit-size normalisation of a (..., 21, coords) array, in
+    place. All-zero (absent) hands stay zero, and normalising twice is a no-op.
+    """
+    hands -= hands[..., :1, :]
+    extent = np.abs(hands[..., :2]).max(axis=(-2, -1), keepdims=True)
+    np.divide(hands, extent, out=hands, where=extent > 0)
+    return hands
+
+
+def normalize_rows(x):
+    """normalize_hands() over flat (N, size) or (size,) feature rows, in place."""
+    x = np.asarray(x, dtype=np.float32)
+    n_hands, coords = layout(x.shape[-1])
+    normalize_hands(x.reshape(x.shape[:-1] + (n_hands, NUM_LANDMARKS, coords)))
+    return x
+
+
+class LandmarkFeatures:
+    """
+    Writes hand landmarks from a MediaPipe result straight into a preallocated
+    float32 buffer, so no per-frame lists or arrays are built.
+
+    extract() returns the shared buffer (or `out`); callers that keep the
+    vector past the next frame must copy it. Not thread-safe: give each
+    thread or worker process its own instance.
+    """
+
+    def __init__(self, size=126, hand_order=None, normalize=None):
+        self.size = size
+        self.max_hands, self.coords = layout(size)
+        self.hand_order = hand_order or DEFAULT_HAND_ORDER
+        if self.hand_order not in HAND_ORDERS:
+            raise ValueError(f"Unknown hand order {self.hand_order!r}; expected one of {HAND_ORDERS}")
+        self.normalize = DEFAULT_NORMALIZE if normalize is None else bool(normalize)
+        self.buffer = np.zeros(size, dtype=np.float32)
+        self.hands = 0  # hands written by the last extract()
+
+    @classmethod
+    def for_model(cls, model, model_dir=None, **overrides):
+        """Features sized to `model`'s input, using the config saved in `model_dir` if any."""
+        config = load_config(model_dir) if model_dir else {}
+        config.update(overrides)
+        return cls(model_input_size(model),
+                   hand_order=config.get("hand_order"),
+                   normalize=config.get("normalize"))
+
+    def config(self):
+        return {"size": self.size, "hand_order": self.hand_order, "normalize": self.normalize}
+
+    def _ordered(self, results):
+        hands = results.multi_hand_landmarks or []
+        if self.hand_order == "detection" or len(hands) < 2 or not results.multi_handedness:
+            return hands[:self.max_hands]
+        labels = [h.classification[0].label for h in results.multi_handedness]
+        # stable sort: Left first, then Right, detection order within a side
+        order = sorted(range(len(hands)), key=lambda i: labels[i] != "Left")
+        return [hands[i] for i in order[:self.max_hands]]
+
+    def extract(self, results, out=None):
+        """Fill `out` (default: the internal buffer) from a Hands result; None if no hands."""
+        hands = self._ordered(results)
+        self.hands = len(hands)
+        if not hands:
+            return None
+        buf = self.buffer if out is None else out
+        buf[:] = 0.0
+        grid = buf.reshape(self.max_hands, NUM_LANDMARKS, self.coords)
+        xyz = self.coords == 3
+        for slot, hand in enumerate(hands):
+            points = grid[slot]
+            for j, lm in enumerate(hand.landmark):
+                row = points[j]
+                row[0] = lm.x
+                row[1] = lm.y
+                if xyz:
+                    row[2] = lm.z
+        if self.normalize:
+            normalize_hands(grid[:len(hands)])
+        return buf
+
+    def columns(self):
+        """CSV header for this layout: label, p0..p{size-1} (matches data.csv)."""
+        return ["label"] + [f"p{i}" for i in range(self.size)]
+
+
+def load_config(model_dir):
+    path = os.path.join(model_dir, CONFIG_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_config(model_dir, features):
+    with open(os.path.join(model_dir, CONFIG_FILE), "w") as f:
+        json.dump(features.config(), f, indent=2)
@@ -0,0 +1,131 @@
+# backend/utils/landmark_pool.py
+"""
+Hand-landmark extraction for uploaded frames, spread over a process pool.
+
+A MediaPipe Hands graph can't be shared between threads, so one instance
+in the web process serialises every request on it. Each pool worker builds
+and warms its own Hands at start-up instead, and frames are fanned out
+across the workers.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.landmark_features import LandmarkFeatures
+
+logger = logging.getLogger(__name__)
+
+
+# ---- worker side ----
+_hands = None
+_features = None
+
+
+def _init_worker(min_detection_confidence, feature_config):
+    global _hands, _features
+    import mediapipe as mp
+    import numpy as np
+    _features = LandmarkFeatures(**feature_config)
+    _hands = mp.solutions.hands.Hands(
+        static_image_mode=True,  # uploaded frames aren't a continuous stream
+        max_num_hands=_features.max_hands,
+        min_detection_confidence=min_detection_confidence,
+    )
+    # first process() call builds the graph; pay for it before any request does
+    _hands.process(np.zeros((64, 64, 3), dtype=np.uint8))
+
+
+def _extract(data, mirror):
+    import cv2
+    import numpy as np
+    started = time.perf_counter()
+    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        return {"error": "Could not decode image"}
+    if mirror:
+        img = cv2.flip(img, 1)  # match the capture pipeline, which mirrors before landmarking
+    results = _hands.process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+    features = _features.extract(results)
+    return {
+        "landmarks": features.tolist() if features is not None else None,
+        "hands": len(results.multi_hand_landmarks or []),
+        "worker_ms": round((time.perf_counter() - started) * 1000.0, 2),
+    }
+
+
+def _ping(_):
+    return os.getpid()
+
+
+# ---- web-process side ----
+class LandmarkPool:
+    """Process pool whose workers each own a warmed MediaPipe Hands instance."""
+
+    def __init__(self, workers=None, min_detection_confidence=0.7, feature_config=None):
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        # spawn, not fork: the web process has threads (and maybe TensorFlow) running
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(min_detection_confidence, feature_config or {}),
+        )
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.frames = 0
+        self.hands_found = 0
+        self.errors = 0
+        self.in_flight = 0
+        self._total_ms = 0.0
+        self.max_ms = 0.0
+
+    def warm(self):
+        """Start every worker (and so build every Hands graph) now."""
+        try:
+            pids = set(self._pool.map(_ping, range(self.workers * 2)))
+        except Exception:
+            self.shutdown()  # e.g. mediapipe missing in the workers: don't leave a broken pool behind
+            raise
+        logger.info(f"[landmark-pool] {len(pids)} workers warm")
+        return self
+
+    def extract(self, frames, mirror=True):
+        """Landmark a burst of encoded JPEG/PNG frames; one result dict per frame, in order."""
+        with self._lock:
+            self.in_flight += len(frames)
+        started = time.perf_counter()
+        try:
+            results = list(self._pool.map(_extract, frames, [mirror] * len(frames)))
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            with self._lock:
+                self.in_flight -= len(frames)
+        with self._lock:
+            self.requests += 1
+            self.frames += len(frames)
+            self.hands_found += sum(1 for r in results if r.get("landmarks") is not None)
+            self.errors += sum(1 for r in results if "error" in r)
+            self._total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+        return results
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "requests": self.requests,
+                "frames": self.frames,
+                "frames_with_hands": self.hands_found,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+                "request_ms": {
+                    "avg": round(self._total_ms / self.requests, 2) if self.requests else 0.0,
+                    "max": round(self.max_ms, 2),
+                },
+            }
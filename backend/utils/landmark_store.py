@@ -0,0 +1,74 @@
+# backend/utils/landmark_store.py
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# landmarks is a float32 copy, or None when no hand was in the frame
+Snapshot = namedtuple("Snapshot", ["version", "timestamp", "landmarks"])
+
+
+class LandmarkStore:
+    """
+    Versioned, thread-safe holder for the latest landmark vector.
+
+    The capture thread publishes into a preallocated float32 buffer; every
+    change bumps `version` and records a capture timestamp. Readers either
+    take a snapshot or block in wait_newer() until something newer than the
+    version they already have arrives. Repeated "no hand" frames do not bump
+    the version, so pollers are not woken for data they have already seen.
+    """
+
+    def __init__(self, size=126):
+        self.size = size
+        self._buf = np.zeros(size, dtype=np.float32)
+        self._present = False
+        self._version = 0
+        self._timestamp = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def version(self):
+        return self._version
+
+    def publish(self, landmarks, timestamp=None):
+        """Store a new vector (or None for "no hands"); returns the resulting version."""
+        with self._cond:
+            if landmarks is None:
+                if not self._present:
+                    return self._version
+                self._present = False
+            else:
+                values = np.asarray(landmarks, dtype=np.float32).ravel()
+                if values.size != self.size:
+                    raise ValueError(f"Expected {self.size} values, got {values.size}")
+                self._buf[:] = values
+                self._present = True
+            self._version += 1
+            self._timestamp = time.time() if timestamp is None else timestamp
+            self._cond.notify_all()
+            return self._version
+
+    def _snapshot_locked(self):
+        landmarks = self._buf.copy() if self._present else None
+        return Snapshot(self._version, self._timestamp, landmarks)
+
+    def snapshot(self):
+        with self._cond:
+            return self._snapshot_locked()
+
+    def wait_newer(self, version, timeout):
+        """
+        Return the first snapshot newer than `version`, waiting up to `timeout`
+        seconds. On timeout the current snapshot is returned unchanged, so the
+        caller can compare versions to tell the two apart.
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        with self._cond:
+            while self._version <= version:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return self._snapshot_locked()
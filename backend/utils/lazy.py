@@ -0,0 +1,128 @@
+# backend/utils/lazy.py
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class LazyResource:
+    """
+    A subsystem (model, hand tracker, camera, Firestore client...) that is
+    created on first use, or warmed in a background thread.
+
+    get() blocks until the factory has run once and returns its value, or
+    None if it raised. A failed factory is tried again on the first get()
+    after `retry_s`, doubling per consecutive failure up to `max_retry_s`,
+    so a camera plugged in late or a model fixed on disk comes back without
+    a restart. status() never triggers a load, so /health can report
+    readiness without paying for it.
+    """
+
+    PENDING = "pending"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
+    def __init__(self, name, factory, retry_s=5.0, max_retry_s=300.0):
+        self.name = name
+        self.factory = factory
+        self.retry_s = retry_s
+        self.max_retry_s = max_retry_s
+        self.state = self.PENDING
+        self.error = None
+        self.load_ms = None
+        self.failures = 0  # consecutive
+        self._retry_at = 0.0
+        self._value = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self.state == self.READY
+
+    def peek(self):
+        """Return the value if it is already loaded, without loading it."""
+        return self._value if self.state == self.READY else None
+
+    def _settled(self):
+        if self.state == self.READY:
+            return True
+        return self.state == self.FAILED and time.monotonic() < self._retry_at
+
+    def get(self):
+        if self._settled():
+            return self._value
+        with self._lock:
+            if self._settled():
+                return self._value
+            self.state = self.LOADING
+            started = time.perf_counter()
+            try:
+                self._value = self.factory()
+                self.state = self.READY
+                self.error = None
+                self.failures = 0
+            except Exception as e:
+                self.error = str(e)
+                self.state = self.FAILED
+                self.failures += 1
+                backoff = min(self.max_retry_s, self.retry_s * 2 ** (self.failures - 1))
+                self._retry_at = time.monotonic() + backoff
+                logger.error(f"[boot] Failed to load {self.name} (retry in {backoff:.0f} s): {e}")
+            self.load_ms = (time.perf_counter() - started) * 1000.0
+            if self.state == self.READY:
+                logger.info(f"[boot] {self.name} ready in {self.load_ms:.0f} ms")
+        return self._value
+
+    def replace(self, value):
+        """Swap in a new value (e.g. a reloaded model); readers see old or new, never neither."""
+        with self._lock:
+            self._value = value
+            self.state = self.READY
+            self.error = None
+            self.failures = 0
+        return value
+
+    def warm_async(self):
+        """Start loading in a daemon thread; returns immediately."""
+        if self.state != self.PENDING:
+            return
+        threading.Thread(target=self.get, name=f"warm-{self.name}", daemon=True).start()
+
+    def status(self):
+        return {
+            "state": self.state,
+            "ready": self.ready,
+            "load_ms": None if self.load_ms is None else round(self.load_ms, 1),
+            "error": self.error,
+            "failures": self.failures,
+        }
+
+
+class BootTimer:
+    """Records how long each boot stage took and logs the breakdown."""
+
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self._last = self.started
+        self.stages = []
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.stages.append((stage, (now - self._last) * 1000.0))
+        self._last = now
+
+    def total_ms(self):
+        return (self._last - self.started) * 1000.0
+
+    def summary(self):
+        return {
+            "total_ms": round(self.total_ms(), 1),
+            "stages_ms": {stage: round(ms, 1) for stage, ms in self.stages},
+        }
+
+    def log(self, resources=()):
+        parts = [f"{stage}={ms:.0f}ms" for stage, ms in self.stages]
+        parts += [f"{r.name}={r.load_ms:.0f}ms" for r in resources if r.load_ms is not None]
+        logger.info(f"[boot] import finished in {self.total_ms():.0f} ms ({', '.join(parts)})")
@@ -0,0 +1,123 @@
+# backend/utils/leaderboard_index.py
+import bisect
+import hashlib
+import json
+import math
+import threading
+import time
+
+
+def _num(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class DailyLeaderboard:
+    """Top-N entries for one date, kept sorted by score desc, then time asc, then submission order."""
+
+    def __init__(self, top_n):
+        self.top_n = top_n
+        self.keys = []      # sort keys, parallel to entries
+        self.entries = []
+        self.uids = set()
+        self._seq = 0
+        self._digest = None
+
+    def add(self, record):
+        uid = record.get("uid")
+        if uid in self.uids:
+            return False  # one attempt per uid per day
+        score = _num(record.get("score"))
+        time_taken = record.get("time")
+        time_taken = _num(time_taken) if time_taken is not None else math.inf
+        self._seq += 1
+        key = (-score, time_taken, self._seq)
+
+        pos = bisect.bisect_left(self.keys, key)
+        if pos >= self.top_n:
+            return False  # didn't make the cut
+        self.keys.insert(pos, key)
+        self.entries.insert(pos, {
+            "uid": uid,
+            "email": record.get("email"),
+            "score": record.get("score"),
+            "time": record.get("time"),
+        })
+        self.uids.add(uid)
+        if len(self.keys) > self.top_n:
+            self.keys.pop()
+            dropped = self.entries.pop()
+            self.uids.discard(dropped["uid"])
+        self._digest = None
+        return True
+
+    def digest(self):
+        """Hash of the ranked entries: equal rankings give equal digests, in any worker and across rebuilds."""
+        if self._digest is None:
+            body = json.dumps(self.entries, sort_keys=True, default=str).encode()
+            self._digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+        return self._digest
+
+
+class LeaderboardIndex:
+    """
+    In-memory per-day top-N leaderboards, rebuilt from storage and updated
+    incrementally on every accepted score.
+
+    Pages are list slices. ETags hash a day's ranking, so they change only
+    when the ranking does: a periodic rebuild that finds nothing new keeps
+    them, and every worker hands out the same tag for the same ranking.
+    """
+
+    def __init__(self, top_n=100, keep_days=7):
+        self.top_n = top_n
+        self.keep_days = keep_days
+        self._days = {}
+        self._lock = threading.Lock()
+        self.rebuilt_at = None
+
+    def add(self, record):
+        date = record.get("date")
+        if not date:
+            return False
+        with self._lock:
+            day = self._days.get(date)
+            if day is None:
+                day = self._days[date] = DailyLeaderboard(self.top_n)
+                self._trim()
+            return day.add(record)
+
+    def _trim(self):
+        # ISO dates sort chronologically, so the oldest days come first
+        for date in sorted(self._days)[:-self.keep_days]:
+            del self._days[date]
+
+    def rebuild(self, records):
+        days = {}
+        for record in records:
+            date = record.get("date")
+            if not date:
+                continue
+            days.setdefault(date, DailyLeaderboard(self.top_n)).add(record)
+        with self._lock:
+            self._days = days
+            self._trim()
+            self.rebuilt_at = time.time()
+
+    def etag(self, date):
+        with self._lock:
+            day = self._days.get(date)
+            return f"{date}-{day.digest() if day else 'empty'}"
+
+    def page(self, date, limit, cursor=0):
+        """Return (entries, next_cursor or None, total) for `date` starting at rank `cursor`."""
+        with self._lock:
+            day = self._days.get(date)
+            if day is None:
+                return [], None, 0
+            end = cursor + limit
+            entries = [dict(e, rank=cursor + i + 1) for i, e in enumerate(day.entries[cursor:end])]
+            next_cursor = end if end < len(day.entries) else None
+            return entries, next_cursor, len(day.entries)
@@ -0,0 +1,248 @@
+# backend/utils/metrics.py
+"""
+Stage timers, histograms and a Prometheus text exporter.
+
+    with metrics.stage("hands_process"):
+        results = hands.process(img_rgb)
+
+Only a METRICS_SAMPLE_RATE fraction of stage calls is timed. An unsampled
+call costs one random() and returns a shared no-op context manager, which
+keeps the overhead well below 1% of a frame. Histogram counts are therefore
+sampled counts; isl_metrics_sample_rate is exported so a dashboard can
+scale them back up. Existing stats() dicts are exported as gauges through
+collectors, so /metrics also covers the batcher, caches and capture.
+"""
+import logging
+import os
+import random
+import re
+import threading
+import time
+from bisect import bisect_left
+
+logger = logging.getLogger(__name__)
+
+METRICS_SAMPLE_RATE = float(os.environ.get("METRICS_SAMPLE_RATE", 0.1))
+
+# seconds; covers a cached prediction (~50us) up to a slow Firestore call
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus semantics)."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+    def quantile(self, q):
+        """Bucket upper bound at quantile q (coarse, but free)."""
+        counts, _, count = self.snapshot()
+        if not count:
+            return 0.0
+        target = q * count
+        running = 0
+        for bound, n in zip(self.buckets + (float("inf"),), counts):
+            running += n
+            if running >= target:
+                return bound
+        return float("inf")
+
+
+class _NoopTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopTimer()
+
+
+class _StageTimer:
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started)
+        return False
+
+
+def _metric_name(*parts):
+    name = "_".join(str(p) for p in parts if p != "")
+    name = name.replace("<=", "le_")
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name).strip("_")
+
+
+class Metrics:
+    """Registry of per-stage and per-endpoint histograms plus stats() collectors."""
+
+    def __init__(self, sample_rate=METRICS_SAMPLE_RATE, namespace="isl"):
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.namespace = namespace
+        self._histograms = {}  # (family, label value) -> Histogram
+        self._collectors = []  # (prefix, stats_fn)
+        self._lock = threading.Lock()
+
+    def histogram(self, family, label):
+        key = (family, label)
+        hist = self._histograms.get(key)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(key, Histogram())
+        return hist
+
+    def sampled(self):
+        return self.sample_rate >= 1.0 or (self.sample_rate > 0.0 and random.random() < self.sample_rate)
+
+    def stage(self, name):
+        """Context manager timing one pipeline stage, if this call is sampled."""
+        if not self.sampled():
+            return _NOOP
+        return _StageTimer(self.histogram("stage", name))
+
+    def observe(self, family, label, seconds):
+        self.histogram(family, label).observe(seconds)
+
+    def add_collector(self, prefix, stats_fn):
+        """Export every numeric value in stats_fn()'s (nested) dict as a gauge."""
+        self._collectors.append((prefix, stats_fn))
+
+    def summary(self):
+        """Per-stage count/avg/p50/p99 (ms) as a JSON-friendly dict."""
+        out = {}
+        for (family, label), hist in sorted(self._histograms.items()):
+            _, total, count = hist.snapshot()
+            out.setdefault(family, {})[label] = {
+                "count": count,
+                "avg_ms": round(total / count * 1000.0, 3) if count else 0.0,
+                "p50_ms": hist.quantile(0.50) * 1000.0,
+                "p99_ms": hist.quantile(0.99) * 1000.0,
+            }
+        return {"sample_rate": self.sample_rate, "histograms": out}
+
+    # ---- Prometheus text format ----
+    def render(self):
+        ns = self.namespace
+        lines = [
+            f"# HELP {ns}_metrics_sample_rate Fraction of stage calls that are timed",
+            f"# TYPE {ns}_metrics_sample_rate gauge",
+            f"{ns}_metrics_sample_rate {self.sample_rate}",
+        ]
+
+        families = {}
+        for (family, label), hist in sorted(self._histograms.items()):
+            families.setdefault(family, []).append((label, hist))
+        for family, entries in families.items():
+            name = f"{ns}_{family}_seconds"
+            label_key = "stage" if family == "stage" else "endpoint"
+            lines.append(f"# HELP {name} Sampled {family} latency")
+            lines.append(f"# TYPE {name} histogram")
+            for label, hist in entries:
+                counts, total, count = hist.snapshot()
+                running = 0
+                for bound, n in zip(hist.buckets, counts):
+                    running += n
+                    lines.append(f'{name}_bucket{{{label_key}="{label}",le="{bound}"}} {running}')
+                lines.append(f'{name}_bucket{{{label_key}="{label}",le="+Inf"}} {count}')
+                lines.append(f'{name}_sum{{{label_key}="{label}"}} {total}')
+                lines.append(f'{name}_count{{{label_key}="{label}"}} {count}')
+
+        for prefix, stats_fn in self._collectors:
+            try:
+                stats = stats_fn()
+            except Exception as e:
+                logger.warning(f"[metrics] collector {prefix} failed: {e}")
+                continue
+            for key, value in _flatten(stats):
+                name = _metric_name(ns, prefix, key)
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _flatten(stats, path=""):
+    if not isinstance(stats, dict):
+        return
+    for key, value in stats.items():
+        key_path = f"{path}_{key}" if path else str(key)
+        if isinstance(value, dict):
+            yield from _flatten(value, key_path)
+        elif isinstance(value, bool):
+            yield key_path, int(value)
+        elif isinstance(value, (int, float)):
+            yield key_path, value
+
+
+class TimedProxy:
+    """Wraps an object so each method call is recorded as stage `prefix.method`."""
+
+    def __init__(self, target, prefix, metrics):
+        self._target = target
+        self._prefix = prefix
+        self._metrics = metrics
+
+    def __getattr__(self, attr):
+        value = getattr(self._target, attr)
+        if not callable(value):
+            return value
+        stage = f"{self._prefix}.{attr}"
+
+        def call(*args, **kwargs):
+            if not self._metrics.sampled():
+                return value(*args, **kwargs)
+            histogram = self._metrics.histogram("stage", stage)
+            started = time.perf_counter()
+            try:
+                result = value(*args, **kwargs)
+            except BaseException:
+                histogram.observe(time.perf_counter() - started)
+                raise
+            elapsed = time.perf_counter() - started
+            if hasattr(result, "__next__"):
+                # a streamed read: keep it streamed, and count the time spent producing rows
+                return _timed_iter(result, histogram, elapsed)
+            histogram.observe(elapsed)
+            return result
+        return call
+
+
+def _timed_iter(iterator, histogram, elapsed):
+    """Yield from `iterator`, observing the time spent inside next() once it ends or is closed."""
+    try:
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - started
+            yield item
+    finally:
+        histogram.observe(elapsed)
+
+
+metrics = Metrics()
@@ -0,0 +1,57 @@
+# backend/utils/played_cache.py
+import datetime
+import threading
+
+
+def attempt_id(uid, date):
+    """Deterministic leaderboard document id: one attempt per (uid, date)."""
+    return f"{uid}_{date}"
+
+
+class PlayedTodayCache:
+    """
+    In-process set of uids known to have played today.
+
+    Only positive answers are cached: a "not played" answer can go stale as
+    soon as another worker accepts a submission, while "played" can't change
+    until the day rolls over, at which point the whole set is dropped.
+    """
+
+    def __init__(self, max_entries=100000, today=None):
+        self.max_entries = max_entries
+        self._today = today or (lambda: datetime.date.today().isoformat())
+        self._date = None
+        self._uids = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _roll(self):
+        today = self._today()
+        if today != self._date:
+            self._date = today
+            self._uids = set()
+        return today
+
+    def has_played(self, uid):
+        """True if cached as played today; False means "unknown", not "hasn't played"."""
+        with self._lock:
+            self._roll()
+            if uid in self._uids:
+                self.hits += 1
+                return True
+            self.misses += 1
+            return False
+
+    def mark_played(self, uid, date=None):
+        with self._lock:
+            today = self._roll()
+            if date is not None and date != today:
+                return
+            if len(self._uids) >= self.max_entries:
+                self._uids.clear()  # crude bound; entries are cheap to re-learn
+            self._uids.add(uid)
+
+    def stats(self):
+        with self._lock:
+            return {"date": self._date, "entries": len(self._uids), "hits": self.hits, "misses": self.misses}
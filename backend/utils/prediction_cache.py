@@ -0,0 +1,112 @@
+# backend/utils/prediction_cache.py
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class PredictionCache:
+    """
+    Bounded LRU + TTL cache of softmax rows keyed on a quantised landmark vector.
+
+    A held hand pose produces near-identical vectors frame after frame; rounding
+    to `precision` decimals maps them onto the same key. The model version is
+    part of every key, so a model/label/scaler swap can never serve an old
+    entry. clear(version) on a swap drops the old entries and makes `version`
+    the only one stored from then on; a put from a request still finishing
+    on the old model is ignored instead of flushing the new model's entries.
+    """
+
+    def __init__(self, max_entries=4096, ttl_s=5.0, precision=3):
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_s = ttl_s
+        self.scale = np.float32(10 ** precision)
+        self.precision = precision
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+
+        # metrics
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.stale_puts = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def key(self, x, version):
+        q = np.rint(np.asarray(x, dtype=np.float32).ravel() * self.scale).astype(np.int32)
+        return version, q.tobytes()
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            probs, stored = entry
+            if now - stored > self.ttl_s:
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return probs
+
+    def put(self, key, probs):
+        if not self.enabled:
+            return
+        with self._lock:
+            version = key[0]
+            if self._version is None:
+                self._version = version
+            elif version != self._version:
+                self.stale_puts += 1
+                return
+            self._entries[key] = (probs, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, x, version, compute):
+        key = self.key(x, version)
+        probs = self.get(key)
+        if probs is None:
+            probs = compute(x)
+            self.put(key, probs)
+        return probs
+
+    def clear(self, version=None):
+        """Drop every entry; with `version`, only that model's results are stored from now on."""
+        with self._lock:
+            self._entries.clear()
+            if version is not None:
+                self._version = version
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl_s,
+                "precision": self.precision,
+                "model_version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "stale_puts": self.stale_puts,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
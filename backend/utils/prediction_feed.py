@@ -0,0 +1,137 @@
+# backend/utils/prediction_feed.py
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionFeed:
+    """
+    Classifies each new landmark snapshot once and fans the result out to
+    every streaming subscriber.
+
+    A single worker thread waits on the LandmarkStore, runs `classify(landmarks)`
+    (landmarks may be None) and stores the result dict tagged with the
+    snapshot version as `seq`. Subscribers only receive an event when the
+    predicted letter, confirmed flag or dynamic-sign prediction differs from
+    the last one they got.
+    """
+
+    def __init__(self, store, classify, keepalive=None, idle_timeout_s=5.0):
+        self.store = store
+        self.classify = classify
+        self.keepalive = keepalive
+        self.idle_timeout_s = idle_timeout_s
+
+        self._cond = threading.Condition()
+        self._latest = None
+        self._running = False
+        self._subscribers = 0
+        self._last_subscriber = 0.0
+
+        # metrics
+        self.classified = 0
+        self.events_sent = 0
+        self.events_skipped = 0
+
+    def _ensure_running(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            threading.Thread(target=self._run, name="prediction-feed", daemon=True).start()
+
+    def _run(self):
+        logger.info("[stream] prediction feed started")
+        version = -1
+        try:
+            while True:
+                with self._cond:
+                    if self._subscribers == 0 and time.monotonic() - self._last_subscriber > self.idle_timeout_s:
+                        logger.info("[stream] no subscribers, stopping prediction feed")
+                        return
+                if self.keepalive is not None:
+                    self.keepalive()
+
+                snap = self.store.wait_newer(version, 1.0)
+                if snap.version == version:
+                    continue
+                version = snap.version
+
+                try:
+                    result = dict(self.classify(snap.landmarks))
+                except Exception:
+                    logger.exception("[stream] classification failed")
+                    continue
+                result["seq"] = snap.version
+                result["timestamp"] = snap.timestamp
+
+                with self._cond:
+                    self._latest = result
+                    self.classified += 1
+                    self._cond.notify_all()
+        finally:
+            with self._cond:
+                self._running = False
+                self._cond.notify_all()
+
+    def subscribe(self, heartbeat_s=15.0):
+        """Generator of result dicts; yields None as a heartbeat when nothing changed for a while."""
+        with self._cond:
+            self._subscribers += 1
+        self._ensure_running()
+        last_seq = -1
+        last_key = None
+        try:
+            while True:
+                with self._cond:
+                    deadline = time.monotonic() + heartbeat_s
+                    while (self._latest is None or self._latest["seq"] == last_seq):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0 or not self._running:
+                            break
+                        self._cond.wait(remaining)
+                    latest = self._latest
+                    running = self._running
+
+                if latest is None or latest["seq"] == last_seq:
+                    if not running:
+                        self._ensure_running()
+                    yield None
+                    continue
+                last_seq = latest["seq"]
+
+                key = (latest.get("predicted"), latest.get("confirmed"),
+                       (latest.get("sequence") or {}).get("predicted"))
+                if key == last_key:
+                    self.events_skipped += 1
+                    continue
+                last_key = key
+                self.events_sent += 1
+                yield latest
+        finally:
+            with self._cond:
+                self._subscribers -= 1
+                self._last_subscriber = time.monotonic()
+
+    def sse(self, heartbeat_s=15.0):
+        """Server-Sent Events framing around subscribe()."""
+        yield "retry: 2000\n\n"
+        for result in self.subscribe(heartbeat_s=heartbeat_s):
+            if result is None:
+                yield ": keepalive\n\n"
+                continue
+            yield f"id: {result['seq']}\nevent: prediction\ndata: {json.dumps(result)}\n\n"
+
+    def stats(self):
+        with self._cond:
+            return {
+                "running": self._running,
+                "subscribers": self._subscribers,
+                "classified": self.classified,
+                "events_sent": self.events_sent,
+                "events_skipped_unchanged": self.events_skipped,
+                "latest_seq": self._latest["seq"] if self._latest else None,
+            }
@@ -0,0 +1,110 @@
+# backend/utils/sequence.py
+import time
+
+import numpy as np
+
+from utils.sessions import KeyedSessions
+
+
+class FrameRing:
+    """The last `capacity` landmark frames, in a preallocated float32 ring."""
+
+    def __init__(self, capacity, size):
+        self.frames = np.zeros((max(1, capacity), size), dtype=np.float32)
+        self.count = 0  # frames pushed since the last clear
+
+    def push(self, x):
+        self.frames[self.count % len(self.frames)] = x
+        self.count += 1
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, len(self.frames))
+
+    def last(self, n=None):
+        """Copy of the newest n frames (default: all held), oldest first."""
+        n = len(self) if n is None else min(n, len(self))
+        idx = np.arange(self.count - n, self.count) % len(self.frames)
+        return self.frames[idx]
+
+
+class SequenceTracker:
+    """
+    Feeds one session's landmark frames to a streaming sequence model.
+
+    Each frame is an O(1) CausalConvStream.step(). The ring keeps the last
+    receptive field of frames, so when the model is swapped the new stream
+    is primed by replaying them once rather than starting cold. A missing
+    hand for up to `max_gap` frames is skipped (detection flickers); a
+    longer gap ends the sign and resets the stream. The model was trained
+    on every camera frame; a sample that stands for several (the frame
+    governor skipped some) is reached by interpolating from the previous
+    one, so the stream keeps the camera's frame rate.
+    """
+
+    def __init__(self, size=126, capacity=64, max_gap=3):
+        # capacity must cover the model's receptive field for the replay to be exact
+        self.ring = FrameRing(capacity, size)
+        self.max_gap = max_gap
+        self.model = None
+        self.stream = None
+        self.gap = 0
+        self.probs = None
+        self.latest = (None, 0.0, False)  # last update() result
+        self.last_update = time.monotonic()
+
+    def reset(self):
+        self.ring.clear()
+        if self.stream is not None:
+            self.stream.reset()
+        self.gap = 0
+        self.probs = None
+
+    def _attach(self, model):
+        self.model = model
+        self.stream = model.stream()
+        self.probs = None
+        for frame in self.ring.last(model.receptive_field):
+            self.probs = self.stream.step(frame)
+
+    def _push(self, x):
+        self.ring.push(x)
+        self.probs = self.stream.step(x)
+
+    def update(self, landmarks, model, now=None, frames=1):
+        """
+        Push one frame (None when no hand is visible) and return
+        (class_index or None, confidence, ready). `frames` > 1: the sample
+        is the newest of that many camera frames, the others unseen.
+        """
+        self.last_update = time.monotonic() if now is None else now
+        if model is not self.model:
+            self._attach(model)
+        if landmarks is None:
+            self.gap += frames
+            if self.gap > self.max_gap:
+                self.reset()
+        else:
+            landmarks = np.asarray(landmarks, dtype=np.float32)
+            if frames > 1 and self.gap == 0 and len(self.ring):
+                previous = self.ring.last(1)[0]
+                for j in range(1, frames):
+                    self._push(previous + (landmarks - previous) * np.float32(j / frames))
+            self.gap = 0
+            self._push(landmarks)
+        if self.probs is None:
+            self.latest = (None, 0.0, False)
+        else:
+            idx = int(np.argmax(self.probs))
+            self.latest = (idx, float(self.probs[idx]), self.stream.ready)
+        return self.latest
+
+
+class SequenceSessions(KeyedSessions):
+    """Per-session SequenceTracker registry with idle eviction; update(session_id, landmarks, model)."""
+
+    def __init__(self, ttl_s=300.0, max_sessions=10000, **tracker_kwargs):
+        self.tracker_kwargs = tracker_kwargs
+        super().__init__(lambda: SequenceTracker(**tracker_kwargs), ttl_s=ttl_s, max_sessions=max_sessions)
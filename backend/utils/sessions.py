@@ -0,0 +1,67 @@
+# backend/utils/sessions.py
+import threading
+import time
+
+
+class KeyedSessions:
+    """
+    Per-session state objects with idle eviction, for per-client stream
+    state such as a TemporalSmoother or a SequenceTracker.
+
+    `factory()` builds the state for a new session id. Each object must keep
+    a `last_update` timestamp (time.monotonic()) and have an update() method.
+    The registry lock only covers lookup, insert and eviction. update() runs
+    under a lock of the session's own, so one session is never updated from
+    two requests at once while other sessions carry on. Sessions idle for longer than `ttl_s` are
+    dropped on a periodic sweep, and the least recently updated one when
+    `max_sessions` is reached.
+    """
+
+    def __init__(self, factory, ttl_s=300.0, max_sessions=10000):
+        self.factory = factory
+        self.ttl_s = ttl_s
+        self.max_sessions = max_sessions
+        self._sessions = {}
+        self._locks = {}  # session id -> lock held while that session updates
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + ttl_s
+
+    def _entry(self, session_id):
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None:
+                now = time.monotonic()
+                if len(self._sessions) >= self.max_sessions or now >= self._next_sweep:
+                    self._evict(now)
+                    self._next_sweep = now + self.ttl_s
+                state = self._sessions[session_id] = self.factory()
+                self._locks[session_id] = threading.Lock()
+            return state, self._locks[session_id]
+
+    def get(self, session_id):
+        return self._entry(session_id)[0]
+
+    def update(self, session_id, *args, **kwargs):
+        state, lock = self._entry(session_id)
+        with lock:
+            return state.update(*args, **kwargs)
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+            self._locks.clear()
+
+    def _drop(self, session_id):
+        del self._sessions[session_id]
+        del self._locks[session_id]
+
+    def _evict(self, now):
+        expired = [sid for sid, s in self._sessions.items() if now - s.last_update > self.ttl_s]
+        for sid in expired:
+            self._drop(sid)
+        if self._sessions and len(self._sessions) >= self.max_sessions:
+            # still full: drop the least recently updated session
+            self._drop(min(self._sessions, key=lambda sid: self._sessions[sid].last_update))
+
+    def __len__(self):
+        return len(self._sessions)
@@ -0,0 +1,271 @@
+# backend/utils/storage.py
+"""
+Storage for leaderboard attempts and daily letters.
+
+Two interchangeable backends:
+  FirestoreStore  the hosted leaderboard collection (one document per uid+date)
+  SQLiteStore     an embedded WAL-mode database for self-hosting and offline runs
+
+Select with STORAGE_BACKEND=firestore|sqlite (see open_store_from_env).
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from utils.played_cache import attempt_id
+
+logger = logging.getLogger(__name__)
+
+ATTEMPT_FIELDS = ("uid", "email", "score", "time", "date")
+
+
+class PartialWriteError(Exception):
+    """
+    write_batch failed part-way. `created` holds the flags for the records
+    that were settled (a prefix of the batch); `error` is what stopped it.
+    """
+
+    def __init__(self, created, error):
+        super().__init__(f"{len(created)} records settled before: {error}")
+        self.created = created
+        self.error = error
+
+
+class ScoreStore(ABC):
+    """Interface shared by the storage backends."""
+
+    name = "base"
+
+    @abstractmethod
+    def has_attempt(self, uid, date):
+        """True if (uid, date) already has an attempt."""
+
+    def create_attempt(self, record):
+        """Insert one attempt; False if (uid, date) already exists."""
+        return self.write_batch([record])[0]
+
+    @abstractmethod
+    def write_batch(self, records):
+        """
+        Insert many attempts at once; returns one created-flag per record.
+        Raises PartialWriteError if it fails after settling some of them.
+        """
+
+    @abstractmethod
+    def scores_since(self, date):
+        """Attempt dicts with record["date"] >= date."""
+
+    @abstractmethod
+    def get_daily_letters(self, date):
+        """Letters stored for `date`, or None."""
+
+    @abstractmethod
+    def set_daily_letters_if_absent(self, date, letters):
+        """Store letters for `date` unless already set; returns whichever letters won."""
+
+
+class FirestoreStore(ScoreStore):
+    name = "firestore"
+
+    def __init__(self, client):
+        self.db = client
+
+    def _attempts(self):
+        return self.db.collection("leaderboard")
+
+    def has_attempt(self, uid, date):
+        return self._attempts().document(attempt_id(uid, date)).get().exists
+
+    def write_batch(self, records):
+        from firebase_admin import firestore
+        from google.api_core.exceptions import AlreadyExists
+
+        def doc(record):
+            data = {field: record.get(field) for field in ATTEMPT_FIELDS}
+            data["timestamp"] = firestore.SERVER_TIMESTAMP
+            return self._attempts().document(attempt_id(record["uid"], record["date"])), data
+
+        if len(records) > 1:
+            # one round trip when nothing collides; a batch fails as a whole
+            # on AlreadyExists, so fall back to per-document creates then
+            batch = self.db.batch()
+            for record in records:
+                batch.create(*doc(record))
+            try:
+                batch.commit()
+                return [True] * len(records)
+            except AlreadyExists:
+                pass
+
+        created = []
+        for record in records:
+            ref, data = doc(record)
+            try:
+                try:
+                    ref.create(data)
+                    created.append(True)
+                except AlreadyExists:
+                    # ours if an earlier try of this flush got through before failing
+                    created.append(self._same_attempt(ref, data))
+            except Exception as e:
+                raise PartialWriteError(created, e) from e
+        return created
+
+    @staticmethod
+    def _same_attempt(ref, data):
+        existing = ref.get().to_dict() or {}
+        return all(existing.get(field) == data[field] for field in ATTEMPT_FIELDS)
+
+    def scores_since(self, date):
+        for snap in self._attempts().where("date", ">=", date).stream():
+            yield snap.to_dict()
+
+    def get_daily_letters(self, date):
+        snap = self.db.collection("daily_letters").document(date).get()
+        return snap.to_dict().get("letters") if snap.exists else None
+
+    def set_daily_letters_if_absent(self, date, letters):
+        from google.api_core.exceptions import AlreadyExists
+        try:
+            self.db.collection("daily_letters").document(date).create({"letters": list(letters)})
+            return list(letters)
+        except AlreadyExists:
+            return self.get_daily_letters(date)
+
+
+class SQLiteStore(ScoreStore):
+    """
+    Embedded store: WAL journal so readers never block the writer, a
+    (uid, date) primary key for the once-a-day rule and a (date, score)
+    index for rankings. One connection per thread.
+    """
+
+    name = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS attempts (
+            uid       TEXT NOT NULL,
+            date      TEXT NOT NULL,
+            email     TEXT,
+            score     REAL,
+            time      REAL,
+            timestamp REAL NOT NULL,
+            PRIMARY KEY (uid, date)
+        );
+        CREATE INDEX IF NOT EXISTS attempts_date_score ON attempts (date, score DESC);
+        CREATE TABLE IF NOT EXISTS daily_letters (
+            date    TEXT PRIMARY KEY,
+            letters TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.executescript(self.SCHEMA)
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def has_attempt(self, uid, date):
+        row = self._conn().execute(
+            "SELECT 1 FROM attempts WHERE uid = ? AND date = ?", (uid, date)).fetchone()
+        return row is not None
+
+    def write_batch(self, records):
+        conn = self._conn()
+        now = time.time()
+        created = []
+        with conn:  # one transaction for the whole batch
+            for record in records:
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO attempts (uid, date, email, score, time, timestamp) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (record["uid"], record["date"], record.get("email"), record.get("score"),
+                     record.get("time"), record.get("timestamp") or now))
+                created.append(cur.rowcount == 1)
+        return created
+
+    def scores_since(self, date):
+        rows = self._conn().execute(
+            "SELECT uid, email, score, time, date, timestamp FROM attempts "
+            "WHERE date >= ? ORDER BY date, timestamp", (date,))
+        for row in rows:
+            yield dict(row)
+
+    def get_daily_letters(self, date):
+        row = self._conn().execute("SELECT letters FROM daily_letters WHERE date = ?", (date,)).fetchone()
+        return json.loads(row["letters"]) if row else None
+
+    def set_daily_letters_if_absent(self, date, letters):
+        conn = self._conn()
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO daily_letters (date, letters) VALUES (?, ?)",
+                         (date, json.dumps(list(letters))))
+        return self.get_daily_letters(date)
+
+    def import_legacy_json(self, data_dir):
+        """One-off import of data/daily_letters.json and data/scores.json."""
+        letters_path = os.path.join(data_dir, "daily_letters.json")
+        if os.path.exists(letters_path):
+            with open(letters_path) as f:
+                legacy = json.load(f)
+            for date, letters in legacy.items():
+                if isinstance(letters, list) and len(date) == 10:  # skip the old {"date":..., "letters":...} pair
+                    self.set_daily_letters_if_absent(date, letters)
+
+        scores_path = os.path.join(data_dir, "scores.json")
+        if os.path.exists(scores_path):
+            with open(scores_path) as f:
+                legacy = json.load(f)
+            rows = [r for r in legacy if isinstance(r, dict) and r.get("uid") and r.get("date")]
+            if rows:
+                self.write_batch(rows)
+
+
+def connect_firestore(base_dir):
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+    # Initialize Firebase Admin (serviceAccountKey.json must be in backend/)
+    if not firebase_admin._apps:
+        cred = credentials.Certificate(os.path.join(base_dir, "serviceAccountKey.json"))
+        firebase_admin.initialize_app(cred)
+    return firestore.client()
+
+
+def open_store_from_env(base_dir, firestore_client=None):
+    """
+    Build the configured store. `firestore_client` is a callable returning
+    the Firestore client (defaults to connect_firestore); SQLite lives at
+    SQLITE_PATH (default data/isl.db) and imports the legacy JSON files the
+    first time the database is created.
+    """
+    backend = os.environ.get("STORAGE_BACKEND", "firestore").lower()
+    if backend == "sqlite":
+        path = os.environ.get("SQLITE_PATH", os.path.join(base_dir, "data", "isl.db"))
+        fresh = not os.path.exists(path)
+        store = SQLiteStore(path)
+        if fresh:
+            store.import_legacy_json(os.path.join(base_dir, "data"))
+        logger.info(f"[storage] Using SQLite store at {path}")
+        return store
+    if backend == "firestore":
+        client = firestore_client() if firestore_client is not None else connect_firestore(base_dir)
+        if client is None:
+            raise RuntimeError("Firestore client unavailable")
+        return FirestoreStore(client)
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
@@ -0,0 +1,87 @@
+# backend/utils/temporal.py
+import time
+from collections import Counter, deque
+
+import numpy as np
+
+from utils.sessions import KeyedSessions
+
+
+class TemporalSmoother:
+    """
+    Smooths a stream of probability vectors for one session and debounces
+    the confirmed letter.
+
+    mode="ema" keeps an exponential moving average of the probabilities;
+    mode="vote" takes the majority argmax over the last `window` frames.
+    A letter is only confirmed once the smoothed top class has stayed the
+    same, above `threshold`, for `hold_s` seconds.
+    """
+
+    def __init__(self, mode="ema", window=8, alpha=0.4, threshold=0.3, hold_s=1.0):
+        if mode not in ("ema", "vote"):
+            raise ValueError(f"Unknown smoothing mode: {mode}")
+        self.mode = mode
+        self.alpha = alpha
+        self.threshold = threshold
+        self.hold_s = hold_s
+
+        self._window = deque(maxlen=max(1, window))
+        self._ema = None
+        self._candidate = None
+        self._candidate_since = None
+        self.last_update = time.monotonic()
+
+    def reset(self):
+        self._window.clear()
+        self._ema = None
+        self._candidate = None
+        self._candidate_since = None
+
+    def update(self, probs, now=None):
+        """
+        Feed one softmax row (or None when no hand is visible) and return
+        (class_index or None, smoothed confidence, stable_for_s, confirmed).
+        """
+        now = time.monotonic() if now is None else now
+        self.last_update = now
+        if probs is None:
+            self.reset()
+            return None, 0.0, 0.0, False
+
+        probs = np.asarray(probs, dtype=np.float32).ravel()
+        self._window.append(probs)
+
+        if self.mode == "ema":
+            if self._ema is None or self._ema.shape != probs.shape:
+                self._ema = probs.copy()
+            else:
+                self._ema *= 1.0 - self.alpha
+                self._ema += self.alpha * probs
+            idx = int(np.argmax(self._ema))
+            confidence = float(self._ema[idx])
+        else:
+            votes = Counter(int(np.argmax(p)) for p in self._window)
+            idx, count = votes.most_common(1)[0]
+            confidence = float(np.mean([p[idx] for p in self._window]))
+            if count * 2 <= len(self._window):
+                confidence = min(confidence, self.threshold - 1e-6)  # no majority yet
+
+        if confidence < self.threshold:
+            self._candidate = None
+            self._candidate_since = None
+            return None, confidence, 0.0, False
+
+        if idx != self._candidate:
+            self._candidate = idx
+            self._candidate_since = now
+        stable_for = now - self._candidate_since
+        return idx, confidence, stable_for, stable_for >= self.hold_s
+
+
+class SessionSmoothers(KeyedSessions):
+    """Per-session TemporalSmoother registry with idle eviction."""
+
+    def __init__(self, ttl_s=300.0, max_sessions=10000, **smoother_kwargs):
+        self.smoother_kwargs = smoother_kwargs
+        super().__init__(lambda: TemporalSmoother(**smoother_kwargs), ttl_s=ttl_s, max_sessions=max_sessions)
@@ -0,0 +1,129 @@
+# backend/utils/wire.py
+"""
+Compact binary landmark bodies, negotiated by Content-Type:
+
+    application/x-landmarks-f32   raw little-endian float32
+    application/x-landmarks-f16   little-endian float16
+    application/x-landmarks-i16   little-endian int16, value = q * scale
+                                  (scale from the X-Landmark-Scale header, default 1/16384)
+    application/octet-stream      8-byte header, then one of the above
+
+Generic clients send application/octet-stream for any binary upload, so it
+only counts as landmarks behind the header: b"LMK1", a dtype tag (b"f4",
+b"f2", b"i2") and the row size as a little-endian uint16.
+
+A body may hold any number of rows; callers reshape to (-1, row_size).
+"""
+import struct
+
+import numpy as np
+
+DEFAULT_INT16_SCALE = 1.0 / 16384  # covers roughly ±2.0, enough for normalised x/y/z
+
+WIRE_DTYPES = {
+    "application/x-landmarks-f32": np.dtype("<f4"),
+    "application/x-landmarks-f16": np.dtype("<f2"),
+    "application/x-landmarks-i16": np.dtype("<i2"),
+}
+
+OCTET_STREAM = "application/octet-stream"
+HEADER = struct.Struct("<4s2sH")
+HEADER_MAGIC = b"LMK1"
+HEADER_TAGS = {
+    b"f4": "application/x-landmarks-f32",
+    b"f2": "application/x-landmarks-f16",
+    b"i2": "application/x-landmarks-i16",
+}
+
+
+def is_binary_landmarks(mimetype):
+    return mimetype in WIRE_DTYPES or mimetype == OCTET_STREAM
+
+
+def parse_header(header, row_size):
+    """Payload mimetype named by an octet-stream header; ValueError if it isn't a landmark header."""
+    if len(header) < HEADER.size:
+        raise ValueError(f"{OCTET_STREAM} body is too short for a landmark header")
+    magic, tag, size = HEADER.unpack(header[:HEADER.size])
+    if magic != HEADER_MAGIC:
+        raise ValueError(f"{OCTET_STREAM} body is not a landmark array (bad magic {magic!r})")
+    if tag not in HEADER_TAGS:
+        raise ValueError(f"Unknown landmark dtype tag {tag!r}")
+    if size != row_size:
+        raise ValueError(f"Header declares {size}-value rows, expected {row_size}")
+    return HEADER_TAGS[tag]
+
+
+def encode_header(mimetype, row_size):
+    """Header announcing a `mimetype` payload of `row_size`-value rows."""
+    tag = next(t for t, m in HEADER_TAGS.items() if m == mimetype)
+    return HEADER.pack(HEADER_MAGIC, tag, row_size)
+
+
+def decode_landmarks(body, mimetype, row_size, scale=None):
+    """
+    Decode a binary body into an (N, row_size) float32 array.
+
+    float32 bodies are returned as a zero-copy, read-only view of `body`;
+    float16 / int16 bodies need one conversion pass.
+    """
+    if mimetype == OCTET_STREAM:
+        mimetype = parse_header(body, row_size)
+        body = memoryview(body)[HEADER.size:]
+    dtype = WIRE_DTYPES[mimetype]
+    if len(body) == 0 or len(body) % (dtype.itemsize * row_size):
+        raise ValueError(f"Body of {len(body)} bytes is not a whole number of "
+                         f"{row_size}-value {dtype.name} rows")
+
+    values = np.frombuffer(body, dtype=dtype)
+    if dtype.kind == "i":
+        values = values.astype(np.float32) * np.float32(scale or DEFAULT_INT16_SCALE)
+    elif dtype != np.float32:
+        values = values.astype(np.float32)
+    return values.reshape(-1, row_size)
+
+
+def encode_landmarks(landmarks, mimetype, scale=None, payload="application/x-landmarks-f32"):
+    """
+    Inverse of decode_landmarks, for clients, tests and benchmarks. An
+    octet-stream body gets the header and a `payload`-encoded array.
+    """
+    values = np.asarray(landmarks, dtype=np.float32)
+    if mimetype == OCTET_STREAM:
+        return encode_header(payload, values.shape[-1]) + encode_landmarks(values, payload, scale=scale)
+    dtype = WIRE_DTYPES[mimetype]
+    if dtype.kind == "i":
+        values = np.clip(np.rint(values / (scale or DEFAULT_INT16_SCALE)), -32768, 32767)
+    return values.astype(dtype).tobytes()
+
+
+def iter_landmark_chunks(stream, mimetype, row_size, chunk_rows, content_length=None, scale=None):
+    """
+    Read a binary body from a file-like `stream` in chunks of at most
+    `chunk_rows` rows, so very large uploads never sit in memory at once.
+    Yields (N, row_size) float32 arrays. `content_length` is the length of
+    the whole body, header included.
+    """
+    if mimetype == OCTET_STREAM:
+        mimetype = parse_header(stream.read(HEADER.size), row_size)
+        if content_length is not None:
+            content_length -= HEADER.size
+    dtype = WIRE_DTYPES[mimetype]
+    row_bytes = dtype.itemsize * row_size
+    if content_length is not None and content_length % row_bytes:
+        raise ValueError(f"Body of {content_length} bytes is not a whole number of "
+                         f"{row_size}-value {dtype.name} rows")
+
+    pending = b""
+    while True:
+        block = stream.read(chunk_rows * row_bytes - len(pending))
+        if not block:
+            break
+        pending += block
+        if len(pending) < chunk_rows * row_bytes:
+            continue
+        yield decode_landmarks(pending, mimetype, row_size, scale=scale)
+        pending = b""
+
+    if pending:
+        yield decode_landmarks(pending, mimetype, row_size, scale=scale)
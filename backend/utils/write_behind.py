@@ -0,0 +1,329 @@
+# backend/utils/write_behind.py
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from utils.storage import PartialWriteError
+
+try:
+    import fcntl
+except ImportError:  # Windows: the dev server is one process, there are no other spills to guard
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def spill_file(spill_path, pid):
+    """data/pending_scores.jsonl -> data/pending_scores.<pid>.jsonl"""
+    root, ext = os.path.splitext(spill_path)
+    return f"{root}.{pid}{ext}"
+
+
+class WriteBehindQueue:
+    """
+    Acknowledge score submissions immediately and write them to the store
+    in batches from a background thread.
+
+    Every accepted record is appended to a local spill file (JSON lines)
+    before it is acknowledged, and replayed on the next start if the process
+    dies before flushing. Each process spills to its own file next to
+    `spill_path` (see spill_file) and holds an flock on "<file>.lock" for as
+    long as it lives. open() (called by the first submit() if nobody else
+    did) claims the files of processes whose lock is free (they died),
+    moves their records into its own spill and deletes them. So no worker
+    ever rewrites or replays a file another live worker is still appending
+    to, and nothing touches the disk before open(). Replays are safe because the store's
+    create-if-absent write ignores records that already made it. Failed
+    flushes are retried with exponential backoff; records stay queued (and
+    spilled) until a flush succeeds.
+    """
+
+    def __init__(self, get_store, spill_path, batch_size=50, flush_interval_s=0.25,
+                 backoff_base_s=0.5, backoff_max_s=30.0, on_written=None, compact_after=1000):
+        self.get_store = get_store
+        self.spill_base = spill_path
+        self.spill_path = spill_file(spill_path, os.getpid())
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.on_written = on_written
+        self.compact_after = compact_after
+
+        self._queue = deque()
+        self._keys = set()          # (uid, date) pending or written by this process today
+        self._keys_date = None
+        self._outcomes = {}         # (uid, date) -> "pending" | "written" | "rejected", same lifetime as _keys
+        self._cond = threading.Condition()
+        self._spill_lock = threading.Lock()
+        self._spill_lines = 0
+        self._lock_file = None
+        self._thread = None
+
+        # metrics
+        self.accepted = 0
+        self.duplicates = 0
+        self.written = 0
+        self.rejected_by_store = 0
+        self.flushes = 0
+        self.failures = 0
+        self.retries = 0
+        self.claimed = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._flush_total_ms = 0.0
+
+        self._opened = False
+        self._open_lock = threading.Lock()
+
+    def open(self):
+        """Lock this process's spill file and replay/claim unflushed records. Idempotent."""
+        if self._opened:
+            return self
+        with self._open_lock:
+            if not self._opened:
+                self.spill_path = spill_file(self.spill_base, os.getpid())  # the pid that will append to it
+                os.makedirs(os.path.dirname(os.path.abspath(self.spill_path)), exist_ok=True)
+                self._lock_own_spill()
+                self._replay_spill()
+                self._opened = True
+        return self
+
+    # ---- spill file ----
+    @staticmethod
+    def _read_spill(path):
+        records = []
+        if not os.path.exists(path):
+            return records
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    logger.warning(f"[write-behind] skipping corrupt spill line in {path}")
+        return records
+
+    @staticmethod
+    def _is_current(lock_path, lock_file):
+        """False once the lock file we hold was deleted (its spill was claimed)."""
+        try:
+            return os.stat(lock_path).st_ino == os.fstat(lock_file.fileno()).st_ino
+        except FileNotFoundError:
+            return False
+
+    def _lock_own_spill(self):
+        # a dead process with our (reused) pid may be being claimed right now:
+        # wait for the claimer, and retry if it deleted the lock file under us
+        lock_path = self.spill_path + ".lock"
+        while True:
+            lock_file = open(lock_path, "a")
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            if self._is_current(lock_path, lock_file):
+                self._lock_file = lock_file  # held (and the lock with it) until the process exits
+                return
+            lock_file.close()
+
+    def _orphans(self):
+        root, ext = os.path.splitext(self.spill_base)
+        pattern = glob.escape(root) + ".*" + ext
+        paths = set(glob.glob(pattern)) | {p[:-len(".lock")] for p in glob.glob(pattern + ".lock")}
+        if os.path.exists(self.spill_base):
+            paths.add(self.spill_base)  # the single shared file older versions wrote
+        paths.discard(self.spill_path)
+        return sorted(paths)
+
+    def _claim(self, path):
+        """Take over a dead process's spill file; returns its records (empty if its owner is alive)."""
+        lock_path = path + ".lock"
+        with open(lock_path, "a") as lock_file:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    return []  # owner still running
+            if not self._is_current(lock_path, lock_file):
+                return []  # another worker claimed it first
+            records = self._read_spill(path)
+            with self._spill_lock:
+                for record in records:
+                    self._spill(record)  # durable in our file before theirs is gone
+            if os.path.exists(path):
+                os.remove(path)
+            os.remove(lock_path)
+        if records:
+            logger.info(f"[write-behind] claimed {len(records)} unflushed submissions from {path}")
+        return records
+
+    def _replay_spill(self):
+        own = self._read_spill(self.spill_path)
+        self._spill_lines = len(own)
+        records = own + [r for path in self._orphans() for r in self._claim(path)]
+        self.claimed = len(records) - len(own)
+        replayed = 0
+        for record in records:
+            key = (record.get("uid"), record.get("date"))
+            if key in self._keys:
+                continue
+            self._keys.add(key)
+            self._outcomes[key] = "pending"
+            self._queue.append(record)
+            replayed += 1
+        if replayed:
+            logger.info(f"[write-behind] replaying {replayed} unflushed submissions")
+            self._ensure_started()
+
+    def _spill(self, record):
+        # caller holds _spill_lock
+        with open(self.spill_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._spill_lines += 1
+
+    def _compact_spill(self):
+        """Rewrite this process's spill file with only the still-pending records."""
+        with self._spill_lock:
+            with self._cond:
+                pending = list(self._queue)
+            if self._spill_lines <= len(pending) or (pending and self._spill_lines < self.compact_after):
+                return
+            tmp = self.spill_path + ".tmp"
+            with open(tmp, "w") as f:
+                for record in pending:
+                    f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.spill_path)
+            self._spill_lines = len(pending)
+
+    # ---- producers ----
+    def submit(self, record):
+        """Queue a validated record. Returns False if (uid, date) was already accepted."""
+        self.open()
+        key = (record["uid"], record["date"])
+        with self._cond:
+            if record["date"] != self._keys_date:
+                # keep the dedupe set to the current day (plus whatever is still pending)
+                self._keys = {(r["uid"], r["date"]) for r in self._queue}
+                self._outcomes = {k: v for k, v in self._outcomes.items() if k in self._keys}
+                self._keys_date = record["date"]
+            if key in self._keys:
+                self.duplicates += 1
+                return False
+            self._keys.add(key)
+            self._outcomes[key] = "pending"
+
+        # spill and enqueue under one lock so a compaction can't drop a
+        # record that is on disk but not yet in the queue
+        with self._spill_lock:
+            self._spill(record)
+            with self._cond:
+                self._queue.append(record)
+                self.accepted += 1
+                self._ensure_started()
+                if len(self._queue) >= self.batch_size:
+                    self._cond.notify()
+        return True
+
+    def status(self, uid, date):
+        """"pending", "written" or "rejected" for a record this process accepted today, else None."""
+        with self._cond:
+            return self._outcomes.get((uid, date))
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="score-write-behind", daemon=True)
+        self._thread.start()
+
+    # ---- worker ----
+    def _run(self):
+        attempt = 0
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                # give a burst a moment to fill the batch
+                if len(self._queue) < self.batch_size:
+                    self._cond.wait(self.flush_interval_s)
+                batch = [self._queue[i] for i in range(min(self.batch_size, len(self._queue)))]
+
+            started = time.perf_counter()
+            error = None
+            try:
+                store = self.get_store()
+                if store is None:
+                    raise RuntimeError("Storage unavailable")
+                created = store.write_batch(batch)
+            except PartialWriteError as e:
+                # the first len(e.created) records are settled; only the rest are retried
+                created, error = e.created, e.error
+            except Exception as e:
+                created, error = [], e
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            done = batch[:len(created)]
+
+            with self._cond:
+                for record, was_created in zip(done, created):
+                    self._queue.popleft()
+                    self._outcomes[(record["uid"], record["date"])] = "written" if was_created else "rejected"
+                self.written += sum(1 for c in created if c)
+                self.rejected_by_store += sum(1 for c in created if not c)
+                if error is None:
+                    self.flushes += 1
+                    self.last_flush_ms = elapsed_ms
+                    self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+                    self._flush_total_ms += elapsed_ms
+
+            for record, was_created in zip(done, created):
+                if not was_created:
+                    logger.info(f"[write-behind] {record['uid']} already had an attempt on {record['date']}")
+                elif self.on_written is not None:
+                    try:
+                        self.on_written(record)
+                    except Exception:
+                        logger.exception("[write-behind] on_written callback failed")
+
+            if error is not None:
+                attempt += 1
+                self.failures += 1
+                self.retries += 1
+                delay = min(self.backoff_max_s, self.backoff_base_s * (2 ** (attempt - 1)))
+                logger.warning(f"[write-behind] flush of {len(batch) - len(done)} failed ({error}); "
+                               f"retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            attempt = 0
+
+            self._compact_spill()
+
+    def stats(self):
+        with self._cond:
+            oldest = self._queue[0].get("timestamp") if self._queue else None
+            return {
+                "queue_depth": len(self._queue),
+                "oldest_pending_age_s": round(time.time() - oldest, 3) if oldest else 0.0,
+                "accepted": self.accepted,
+                "duplicates_rejected": self.duplicates,
+                "written": self.written,
+                "rejected_by_store": self.rejected_by_store,
+                "flushes": self.flushes,
+                "failures": self.failures,
+                "retries": self.retries,
+                "flush_latency_ms": {
+                    "last": round(self.last_flush_ms, 2),
+                    "max": round(self.max_flush_ms, 2),
+                    "avg": round(self._flush_total_ms / self.flushes, 2) if self.flushes else 0.0,
+                },
+                "spill_path": self.spill_path,
+                "spilled_lines": self._spill_lines,
+                "claimed_from_dead_workers": self.claimed,
+            }
@@ -11,59 +11,34 @@ export default function LearnMode() {
   const [currentLetterIndex, setCurrentLetterIndex] = useState(0);
   const [prediction, setPrediction] = useState("");
   const [feedback, setFeedback] = useState("");
-  const [latestLandmarks, setLatestLandmarks] = useState(null);
+  const [confirmed, setConfirmed] = useState(false);
 
   const targetLetter = letters[currentLetterIndex];
 
-  // Fetch latest landmarks from backend
+  // Server-pushed predictions: the backend classifies every captured frame
+  // and only sends an event when the predicted letter or its confirmation changes.
   useEffect(() => {
-    const fetchLandmarks = async () => {
-      try {
-        const res = await fetch(`${API_BASE_URL}/latest_landmarks`);
-        if (!res.ok) return;
-        const data = await res.json();
-        if (data?.landmarks && data.landmarks.length === 84) {
-          setLatestLandmarks(data.landmarks);
-        } else {
-          setLatestLandmarks(null);
-        }
-      } catch (e) {
-        console.error("Error fetching landmarks:", e);
-      }
-    };
-    const interval = setInterval(fetchLandmarks, 1000);
-    return () => clearInterval(interval);
+    const source = new EventSource(`${API_BASE_URL}/prediction_stream`);
+    source.addEventListener("prediction", (event) => {
+      const data = JSON.parse(event.data);
+      const letter = String(data.predicted).toUpperCase();
+      setPrediction(letter === "NONE" || letter === "UNKNOWN" ? "Detecting..." : letter);
+      setConfirmed(Boolean(data.confirmed));
+    });
+    source.onerror = (e) => console.error("Prediction stream error:", e);
+    return () => source.close();
   }, []);
 
-  // Make prediction when landmarks are available
   useEffect(() => {
-    const makePrediction = async () => {
-      if (!latestLandmarks || latestLandmarks.length !== 84) return;
-
-      try {
-        const res = await fetch(`${API_BASE_URL}/predict_frame`, {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ landmarks: latestLandmarks }),
-        });
-        const data = await res.json();
-        if (data?.predicted) {
-          const p = String(data.predicted).toUpperCase();
-          setPrediction(p);
-          setFeedback(p === targetLetter ? "✅ Correct!" : "❌ Try Again!");
-        } else {
-          setPrediction("Detecting...");
-          setFeedback("");
-        }
-      } catch (e) {
-        console.error("Prediction error:", e);
-        setPrediction("Error");
-        setFeedback("");
-      }
-    };
-
-    if (latestLandmarks) makePrediction();
-  }, [latestLandmarks, targetLetter]);
+    if (!prediction || prediction === "Detecting...") {
+      setFeedback("");
+    } else if (prediction !== targetLetter) {
+      setFeedback("❌ Try Again!");
+    } else {
+      // the server only confirms a letter once it has been held steadily
+      setFeedback(confirmed ? "✅ Correct!" : "⏳ Hold it...");
+    }
+  }, [prediction, confirmed, targetLetter]);
 
   const handleNext = () => {
     setCurrentLetterIndex((prev) => (prev + 1) % letters.length);
@@ -146,12 +121,7 @@ export default function LearnMode() {
             }}>Test Health</button>
 
             <button onClick={async () => {
-              if (!latestLandmarks) return alert("No landmarks");
-              const res = await fetch(`${API_BASE_URL}/predict_frame`, {
-                method: "POST",
-                headers: { "Content-Type": "application/json" },
-                body: JSON.stringify({ landmarks: latestLandmarks }),
-              });
+              const res = await fetch(`${API_BASE_URL}/predict_current`);
               const data = await res.json();
               alert(JSON.stringify(data));
             }}>Test Prediction</button>
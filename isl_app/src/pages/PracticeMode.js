@@ -7,14 +7,14 @@ import PageHeader from "../components/PageHeader";
 
 const letters = ["A", "B", "C"];
 const PICK_INTERVAL_MS = 5000;
-const POST_INTERVAL_MS = 1000; // Reduced frequency to avoid overwhelming the server
 
 export default function PracticeMode() {
   const imgRef = useRef(null);
   const [prediction, setPrediction] = useState("");
   const [targetLetter, setTargetLetter] = useState("A");
   const [feedback, setFeedback] = useState("");
-  const [latestLandmarks, setLatestLandmarks] = useState(null);
+  const [confirmed, setConfirmed] = useState(false);
+  const [lastEvent, setLastEvent] = useState(null);
   const navigate = useNavigate();
 
   // pick a new target letter every PICK_INTERVAL_MS
@@ -30,108 +30,33 @@ export default function PracticeMode() {
     return () => clearInterval(id);
   }, [targetLetter]);
 
-  // Fetch latest landmarks from backend
+  // Server-pushed predictions replace the poll-landmarks-then-POST loop:
+  // the backend classifies each captured frame and only sends an event when
+  // the predicted letter (or its confirmed flag) changes.
   useEffect(() => {
-    const fetchLandmarks = async () => {
-      try {
-        const res = await fetch(`${API_BASE_URL}/latest_landmarks`);
-        if (!res.ok) {
-          console.error("Failed to fetch landmarks:", res.status, res.statusText);
-          return;
-        }
-        const data = await res.json();
-        console.log("Landmarks response:", data); // Debug log
-        
-        if (data?.landmarks && data.landmarks.length === 126) {
-        console.log("Setting landmarks:", data.landmarks.length);
-        setLatestLandmarks(data.landmarks);
-        } else if (data?.landmarks && data.landmarks.length > 0) {
-        console.log("Received landmarks but wrong length:", data.landmarks.length, "expected 126");
-        }
-         else {
-          console.log("No landmarks in response");
-          setLatestLandmarks(null);
-        }
-      } catch (e) {
-        console.error("Error fetching landmarks:", e);
-      }
-    };
-
-    const landmarkInterval = setInterval(fetchLandmarks, POST_INTERVAL_MS);
-    return () => clearInterval(landmarkInterval);
+    const source = new EventSource(`${API_BASE_URL}/prediction_stream`);
+    source.addEventListener("prediction", (event) => {
+      const data = JSON.parse(event.data);
+      console.log("Prediction event:", data);
+      setLastEvent(data);
+      const letter = String(data.predicted).toUpperCase();
+      setPrediction(letter === "NONE" || letter === "UNKNOWN" ? "Detecting..." : letter);
+      setConfirmed(Boolean(data.confirmed));
+    });
+    source.onerror = (e) => console.error("Prediction stream error:", e);
+    return () => source.close();
   }, []);
 
-  // Make predictions when landmarks are available
   useEffect(() => {
-    const makePrediction = async () => {
-      if (!latestLandmarks || latestLandmarks.length !== 126) {
-      console.log("No landmarks available or wrong length:", latestLandmarks?.length, "expected: 126");
-      return;
-    }
-      console.log("Making prediction with landmarks length:", latestLandmarks.length);
-      console.log("First few landmarks:", latestLandmarks.slice(0, 6));
-      console.log("Request URL:", `${API_BASE_URL}/predict_frame`);
-      
-      try {
-        const requestBody = JSON.stringify({ landmarks: latestLandmarks });
-        console.log("Request body length:", requestBody.length);
-        
-        const res = await fetch(`${API_BASE_URL}/predict_frame`, {
-          method: "POST",
-          headers: { 
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-          },
-          body: requestBody,
-        });
-        
-        console.log("Response status:", res.status);
-        console.log("Response headers:", res.headers);
-        
-        if (!res.ok) {
-          const errorText = await res.text();
-          console.error("Prediction request failed:", res.status, res.statusText, errorText);
-          setPrediction("HTTP Error: " + res.status);
-          return;
-        }
-        
-        const responseText = await res.text();
-        console.log("Raw response:", responseText);
-        
-        let data;
-        try {
-          data = JSON.parse(responseText);
-        } catch (parseError) {
-          console.error("Failed to parse JSON response:", parseError, "Raw:", responseText);
-          setPrediction("JSON Parse Error");
-          return;
-        }
-        
-        console.log("Parsed prediction response:", data);
-        
-        if (data?.predicted) {
-          const p = String(data.predicted).toUpperCase();
-          console.log("Setting prediction:", p);
-          setPrediction(p);
-          setFeedback(p === targetLetter ? "✅ Correct!" : "❌ Try Again!");
-        } else if (data?.error) {
-          console.error("Prediction error:", data.error);
-          setPrediction("Error: " + data.error);
-        } else {
-          console.error("Unexpected response format:", data);
-          setPrediction("Unexpected response");
-        }
-      } catch (e) {
-        console.error("Network error during prediction:", e.name, e.message);
-        console.error("Full error:", e);
-        setPrediction("Network Error: " + e.message);
-      }
-    };
-
-    if (latestLandmarks) {
-      makePrediction();
+    if (!prediction || prediction === "Detecting...") {
+      setFeedback("");
+    } else if (prediction !== targetLetter) {
+      setFeedback("❌ Try Again!");
+    } else {
+      // the server only confirms a letter once it has been held steadily
+      setFeedback(confirmed ? "✅ Correct!" : "⏳ Hold it...");
     }
-  }, [latestLandmarks, targetLetter]);
+  }, [prediction, confirmed, targetLetter]);
 
   // Helper function to handle test button clicks
   const handleTestClick = async (testType, endpoint, body = null) => {
@@ -220,12 +145,14 @@ export default function PracticeMode() {
             
             <button 
               className="test-button"
-              onClick={() => {
-                if (!latestLandmarks) {
+              onClick={async () => {
+                const res = await fetch(`${API_BASE_URL}/latest_landmarks`);
+                const data = await res.json();
+                if (!data?.landmarks?.length) {
                   alert("No landmarks available");
                   return;
                 }
-                handleTestClick("Manual Prediction", "/predict_frame", { landmarks: latestLandmarks });
+                handleTestClick("Manual Prediction", "/predict_frame", { landmarks: data.landmarks });
               }}
             >
               Test Current Landmarks
@@ -235,14 +162,9 @@ export default function PracticeMode() {
           {/* Debug info */}
           <div className="debug-info">
             <div>API Base URL: {API_BASE_URL}</div>
-            <div>Landmarks detected: {latestLandmarks ? "Yes" : "No"}</div>
-            <div>Landmarks length: {latestLandmarks?.length || 0}</div>
+            <div>Stream seq: {lastEvent?.seq ?? "None"}</div>
             <div>
-              Sample landmarks: {
-                latestLandmarks 
-                  ? `${latestLandmarks.slice(0, 3).map(v => v.toFixed(3)).join(', ')}...` 
-                  : 'None'
-              }
+              Confidence: {lastEvent ? lastEvent.confidence.toFixed(3) : "None"}
             </div>
           </div>
         </div>